@@ -1,11 +1,18 @@
 from minimax.minimax import minimax
+from minimax.solution_table import load_solution_table
 
 class MinimaxPlayer:
     """
     Adapter para o algoritmo minimax.
     Responsabilidade única: escolher jogada com probabilidade de usar minimax.
+
+    Toda jogada é uma consulta à tabela de soluções (aberta na criação do
+    jogador).
     """
 
+    def __init__(self):
+        load_solution_table()
+
     def move(self, board: list[list[int]]) -> tuple[int, int]:
         """
         Retorna (linha, coluna). Com minimax, retorna o melhor lugar para jogar.
@@ -1,4 +1,6 @@
 from minimax.minimax import minimax
+from minimax.solution_table import load_solution_table
+from utils.board_codes import encode_many
 from typing import List, Tuple
 import numpy as np
 import random
@@ -11,13 +13,17 @@ class MinimaxTrainer:
       - 1.0 → sempre Minimax
       - 0.5 → 50 % Minimax, 50 % aleatório
     O jogador controlado aqui é sempre -1 (O).
+
+    • rng = fonte de aleatoriedade (`random.Random` ou o próprio módulo
+      `random`); permite partidas reprodutíveis por semente.
     """
 
-    def __init__(self, p_minimax: float = 1.0):
+    def __init__(self, p_minimax: float = 1.0, rng=None):
         if not 0.0 <= p_minimax <= 1.0:
             raise ValueError("p_minimax deve estar entre 0.0 e 1.0")
 
         self.p_minimax = p_minimax
+        self.rng = rng if rng is not None else random
 
     def move(self, board: List[List[int]]) -> Tuple[int, int]:
         """
@@ -30,12 +36,53 @@ class MinimaxTrainer:
             return -1, -1
 
         if len(free) == 9:
-            return random.choice(free)
+            return self.rng.choice(free)
 
-        use_minimax = random.random() <= self.p_minimax
+        use_minimax = self.rng.random() <= self.p_minimax
         if use_minimax:
             inv_board = (-board_arr).tolist()
             r, c = minimax(inv_board)
             return r, c
 
-        return random.choice(free)
+        return self.rng.choice(free)
+
+    def move_batch(self, boards: np.ndarray, p_minimax=None, rng=None,
+                   coins: np.ndarray | None = None,
+                   picks: np.ndarray | None = None) -> np.ndarray:
+        """
+        Versão em lote de `move`: boards shape (N, 9) → casas (N,), -1 onde
+        o tabuleiro está cheio. Mesma regra do lance único: tabuleiro vazio
+        → casa aleatória; senão moeda `coin <= p_minimax` decide entre a
+        jogada ótima (tabela de soluções, tabuleiro invertido) e uma casa
+        livre sorteada.
+
+        • p_minimax → escalar ou array (N,); None usa `self.p_minimax`
+        • rng       → `np.random.RandomState` para as moedas e sorteios
+        • coins/picks → sorteios prontos em [0, 1), shape (N,) (cenários
+          CRN); `pick` escolhe a casa livre de índice int(pick · n_livres)
+        """
+        boards = np.asarray(boards)
+        n = boards.shape[0]
+        if p_minimax is None:
+            p_minimax = self.p_minimax
+        if rng is None:
+            rng = np.random
+        if coins is None:
+            coins = rng.random_sample(n)
+        if picks is None:
+            picks = rng.random_sample(n)
+
+        free = boards == 0
+        n_free = free.sum(axis=1)
+
+        # k-ésima casa livre (ordem linha-a-linha, como em `move`)
+        k = (picks * n_free).astype(np.int64)
+        moves = np.argmax(np.cumsum(free, axis=1) > k[:, None], axis=1)
+
+        optimal = (coins <= p_minimax) & (n_free < 9) & (n_free > 0)
+        if optimal.any():
+            codes = encode_many(-boards[optimal])
+            moves[optimal] = load_solution_table()[codes]
+
+        moves[n_free == 0] = -1
+        return moves
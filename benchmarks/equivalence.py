@@ -0,0 +1,366 @@
+"""
+Equivalência entre os caminhos rápidos e as implementações de referência.
+
+Percorre todas as posições alcançáveis (partidas legais, com qualquer
+lado começando) e confere:
+
+  • minimax   → a jogada lida da tabela (`minimax`) é a da busca em
+                Python puro (`minimax_search`), e a tabela só marca fim
+                de jogo (-1) onde `utils.check_winner` vê um desfecho
+  • winner    → `utils.check_winner` (laço sobre WIN_LINES) contra
+                `services.tic_tac_toe_simulator.winners`, a checagem
+                vetorizada de `play_lockstep`, `play_match` e do hall da fama
+  • network   → para redes com pesos aleatórios (várias topologias,
+                dtypes e ativações), `predict`, `predict_batch` e
+                `MoveMemo` (lazy e upfront) escolhem uma casa de saída
+                máxima no forward neurônio a neurônio (`Neuron.forward`),
+                com e sem máscara
+  • evaluator → scores e desfechos de uma população com sementes fixas
+                são os de uma avaliação de referência em Python puro
+                (partidas como em `_play_one`, com `minimax_search` e o
+                forward neurônio a neurônio) e são idênticos entre
+                memórias (off/lazy/upfront), entre avaliar um a um e em
+                lockstep e, no modo `crn`, entre os motores scalar e batched
+
+Empates na saída da rede (saturação, arredondamento entre matmul e
+produto escalar) aceitam qualquer casa dentro da tolerância do dtype.
+
+Uso:
+    python benchmarks/equivalence.py [--sections minimax winner network evaluator]
+        [--nets 3] [--population 12] [--games 60] [--seed 0] [--json]
+
+Sai com código 1 se alguma checagem divergir.
+"""
+from pathlib import Path
+import argparse
+import itertools
+import json
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from entities.neural_network import NeuralNetwork  # noqa: E402
+from entities.topology import Topology  # noqa: E402
+from minimax.minimax import minimax, minimax_search  # noqa: E402
+from services.position_index import MoveMemo, net_position_boards  # noqa: E402
+from services.tic_tac_toe_simulator import DRAW, LOSE, WIN, WRONG_PLACE, winners  # noqa: E402
+from usecases.score_evaluator import ScoreEvaluator  # noqa: E402
+from utils.board_codes import encode  # noqa: E402
+from utils.utils import WIN_LINES, check_winner  # noqa: E402
+import numpy as np  # noqa: E402
+import random  # noqa: E402
+
+SECTIONS = ("minimax", "winner", "network", "evaluator")
+
+# (camadas, dtype, ativações) das redes aleatórias
+NETWORKS = (
+    ((9, 9, 9), "float64", "sigmoid"),
+    ((9, 9, 9), "float32", "sigmoid"),
+    ((9, 18, 9), "float64", ("tanh", "hard_sigmoid")),
+    ((9, 16, 12, 9), "float64", ("relu", "tanh", "identity")),
+)
+
+# tolerância relativa para empates na saída da rede, por dtype
+TOLERANCE = {"float32": 1e-4, "float64": 1e-9}
+
+MAX_EXAMPLES = 5  # divergências listadas por checagem
+
+_LINE_CELLS = tuple(tuple(r * 3 + c for r, c in line) for line in WIN_LINES)
+
+
+def reachable_boards() -> np.ndarray:
+    """Tabuleiros de partidas legais (X ou O começando), (N, 9) int8 em ordem de código."""
+    seen: dict[tuple[int, int], tuple] = {}  # (código, quem joga) → casas
+    stack = [((0,) * 9, 1), ((0,) * 9, -1)]
+    while stack:
+        cells, to_move = stack.pop()
+        code = encode(cells)
+        if (code, to_move) in seen:
+            continue
+        seen[(code, to_move)] = cells
+        if 0 not in cells or any(abs(sum(cells[i] for i in line)) == 3
+                                 for line in _LINE_CELLS):
+            continue
+        for i in range(9):
+            if cells[i] == 0:
+                stack.append((cells[:i] + (to_move,) + cells[i + 1:], -to_move))
+    boards = {code: cells for (code, _), cells in seen.items()}
+    return np.array([boards[c] for c in sorted(boards)], dtype=np.int8)
+
+
+class Check:
+    """Contagem de casos e primeiras divergências de uma checagem."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.cases = 0
+        self.failures = 0
+        self.examples: list[str] = []
+
+    def expect(self, ok: bool, detail) -> None:
+        self.cases += 1
+        if not ok:
+            self.failures += 1
+            if len(self.examples) < MAX_EXAMPLES:
+                self.examples.append(detail() if callable(detail) else str(detail))
+
+    def row(self) -> dict:
+        return {"check": self.name, "cases": self.cases, "failures": self.failures,
+                "examples": self.examples}
+
+
+# ---------------------------------------------------------------------- #
+def check_minimax(boards: np.ndarray) -> list[Check]:
+    moves, terminal = Check("minimax: tabela == minimax_search"), \
+        Check("minimax: tabela -1 <=> fim de jogo")
+    for b in boards:
+        grid = b.reshape(3, 3)
+        fast = minimax(grid)
+        ref = minimax_search(grid.tolist())
+        moves.expect(tuple(fast) == tuple(ref), lambda: f"{b.tolist()}: {fast} != {ref}")
+        over = check_winner(grid) is not None
+        terminal.expect((fast == (-1, -1)) == over,
+                        lambda: f"{b.tolist()}: jogada {fast}, check_winner={check_winner(grid)}")
+    return [moves, terminal]
+
+
+def check_winners(boards: np.ndarray) -> list[Check]:
+    check = Check("winner: check_winner == simulador.winners")
+    full = (boards != 0).all(axis=1)
+    for b, w, f in zip(boards, winners(boards).tolist(), full):
+        fast = w if w else 0 if f else None  # mesma convenção de check_winner
+        ref = check_winner(b.reshape(3, 3))
+        check.expect(fast == ref, lambda: f"{b.tolist()}: {fast} != {ref}")
+    return [check]
+
+
+# ---------------------------------------------------------------------- #
+def reference_scores(net: NeuralNetwork, board: np.ndarray) -> list[float]:
+    """Saída completa da rede, neurônio a neurônio (inclui a ativação final)."""
+    x = board.astype(float)
+    for layer in net.layers:
+        x = np.array([n.forward(x) for n in layer.neurons])
+    return x.tolist()
+
+
+def is_best(move: int, ref: list[float], board: np.ndarray,
+            mask: bool, tol: float) -> bool:
+    """`move` é uma casa de saída máxima (entre as livres, com máscara)?"""
+    cells = [i for i in range(9) if board[i] == 0] if mask else list(range(9))
+    if not cells:
+        return move == -1
+    if move not in cells:
+        return False
+    best = max(ref[i] for i in cells)
+    return ref[move] >= best - tol * max(1.0, abs(best))
+
+
+def check_network(boards: np.ndarray, n_nets: int, seed: int) -> list[Check]:
+    rng = np.random.RandomState(seed)
+    positions = net_position_boards()
+    checks = {k: Check(f"network: {k}") for k in
+              ("predict", "predict_batch", "MoveMemo lazy", "MoveMemo upfront")}
+    for sizes, dtype, acts in NETWORKS:
+        topology = Topology(sizes, dtype, acts)
+        tol = TOLERANCE[dtype]
+        for _ in range(n_nets):
+            w = topology.random_weights(rng, -2.0, 2.0)
+            net = NeuralNetwork.from_topology(topology, w)
+            refs = [reference_scores(net, b) for b in boards]
+            # uma memória por interface: cada uma repete exatamente o cálculo que embrulha
+            single_memo = MoveMemo(NeuralNetwork.from_topology(topology, w))
+            batch_memo = MoveMemo(NeuralNetwork.from_topology(topology, w))
+            upfront = MoveMemo(NeuralNetwork.from_topology(topology, w)).prefill()
+            for mask in (False, True):
+
+                def detail(name, got, b, ref):
+                    return (f"{topology} mask={mask} {b.tolist()}: {name}={got}, "
+                            f"saída={np.round(ref, 6).tolist()}")
+
+                batch = net.predict_batch(boards, mask)
+                memo_batch = batch_memo.predict_batch(boards, mask)
+                memo_again = batch_memo.predict_batch(boards[::-1], mask)[::-1]  # só acertos
+                for b, ref, fast, memo, again in zip(boards, refs, batch, memo_batch, memo_again):
+                    single = net.predict(b, mask)
+                    checks["predict"].expect(is_best(single, ref, b, mask, tol),
+                                             lambda: detail("predict", single, b, ref))
+                    checks["predict_batch"].expect(is_best(int(fast), ref, b, mask, tol),
+                                                   lambda: detail("predict_batch", int(fast), b, ref))
+                    got = (single_memo.predict(b, mask), single_memo.predict(b, mask))
+                    checks["MoveMemo lazy"].expect(
+                        got == (single, single) and memo == again == fast,
+                        lambda: detail("memo", (got, int(memo), int(again)), b, ref)
+                        + f", predict={single}, predict_batch={int(fast)}")
+                # upfront: a tabela preenchida de uma vez é a do predict_batch
+                memo_moves = upfront.predict_batch(positions, mask)
+                direct = net.predict_batch(positions, mask)
+                for b, got, want in zip(positions, memo_moves, direct):
+                    checks["MoveMemo upfront"].expect(
+                        got == want, lambda: f"{topology} mask={mask} {b.tolist()}: {got} != {want}")
+    return list(checks.values())
+
+
+# ---------------------------------------------------------------------- #
+def _one_by_one(fn, args):
+    return list(itertools.starmap(fn, args))
+
+
+def reference_move(net: NeuralNetwork, cells: list[int], mask: bool) -> int:
+    """`predict` pelo forward neurônio a neurônio, em Python puro."""
+    out = reference_scores(net, np.array(cells))
+    if mask:
+        out = [v if c == 0 else -np.inf for v, c in zip(out, cells)]
+        if all(v == -np.inf for v in out):
+            return -1
+    return max(range(9), key=lambda i: (out[i], -i))  # primeiro máximo, como o argmax
+
+
+def reference_game(ev: ScoreEvaluator, net: NeuralNetwork, g: int, rng) -> tuple[float, int]:
+    """
+    Uma partida com as regras de `ScoreEvaluator._play_one`, sem nenhum
+    caminho rápido: adversário como `MinimaxTrainer.move` sobre
+    `minimax_search`, rede por `reference_move`, término por `check_winner`.
+    """
+    p_minimax, mask = ev._game_setup(g)
+    grid = [[0] * 3 for _ in range(3)]
+    score, turn, opp_turn = 0.0, -1, 0
+    while True:
+        if turn == +1:
+            idx = reference_move(net, [v for row in grid for v in row], mask)
+            if idx == -1:
+                return score + ev.DRAW_POINTS, DRAW
+            r, c = divmod(idx, 3)
+            if grid[r][c] != 0:
+                return score - ev.WRONG_PLACE, WRONG_PLACE
+            grid[r][c] = +1
+            score += ev.RIGHT_PLACE
+        else:
+            if ev.mode == "crn":
+                rng = ev.scenarios[g][opp_turn]
+                opp_turn += 1
+            free = [(i, j) for i in range(3) for j in range(3) if grid[i][j] == 0]
+            if not free:
+                return score + ev.DRAW_POINTS, DRAW
+            if len(free) == 9 or rng.random() > p_minimax:
+                r, c = rng.choice(free)
+            else:
+                r, c = minimax_search([[-v for v in row] for row in grid])
+            grid[r][c] = -1
+        outcome = check_winner(np.array(grid))
+        if outcome is not None:
+            if outcome == +1:
+                return score + ev.WIN_POINTS, WIN
+            if outcome == 0:
+                return score + ev.DRAW_POINTS, DRAW
+            return score - ev.LOSE_POINTS, LOSE
+        turn *= -1
+
+
+def reference_evaluation(ev: ScoreEvaluator, vectors, seeds) -> tuple[np.ndarray, np.ndarray]:
+    """Scores médios e contagem de desfechos por indivíduo, partida a partida."""
+    scores = np.empty(len(vectors))
+    outcomes = np.zeros((len(vectors), 4), dtype=np.int64)
+    for i, (w, s) in enumerate(zip(vectors, seeds)):
+        net = NeuralNetwork.from_topology(ev.topology, w)
+        rng = random.Random(s)
+        games = [reference_game(ev, net, g, rng) for g in range(ev.n_games)]
+        scores[i] = np.mean([pts for pts, _ in games])
+        for _, res in games:
+            outcomes[i, res] += 1
+    return scores, outcomes
+
+
+def check_evaluator(population: int, n_games: int, seed: int) -> list[Check]:
+    topology = Topology()
+    rng = np.random.RandomState(seed)
+    vectors = [topology.random_weights(rng) for _ in range(population)]
+    seeds = rng.randint(0, 2 ** 31, size=population).tolist()
+    generation_seed = int(rng.randint(0, 2 ** 31))
+
+    def run(mode: str, engine: str, memo: str, lockstep: bool):
+        ev = ScoreEvaluator(topology, n_games, mode=mode, engine=engine, memo=memo)
+        ev.prepare_generation(generation_seed)
+        scores = ev.evaluate_population(vectors, seeds, None if lockstep else _one_by_one)
+        return np.asarray(scores), ev.last_outcomes.copy()
+
+    checks = []
+    for mode in ("standard", "crn"):
+        ev = ScoreEvaluator(topology, n_games, mode=mode)
+        ev.prepare_generation(generation_seed)
+        ref_scores, ref_out = reference_evaluation(ev, vectors, seeds)
+        scores, out = run(mode, "scalar", "off", lockstep=False)
+        check = Check(f"evaluator {mode}: scalar/off == Python puro")
+        for i in range(population):
+            check.expect(scores[i] == ref_scores[i] and np.array_equal(out[i], ref_out[i]),
+                         lambda: f"indivíduo {i} (semente {seeds[i]}): {scores[i]} != "
+                                 f"{ref_scores[i]}, desfechos {out[i].tolist()} != "
+                                 f"{ref_out[i].tolist()}")
+        checks.append(check)
+
+        # no standard os motores sorteiam sequências diferentes: cada um tem a sua referência
+        engines = ("scalar", "batched") if mode == "standard" else ("scalar",)
+        for ref_engine in engines:
+            ref_scores, ref_out = run(mode, ref_engine, "off", lockstep=False)
+            check = Check(f"evaluator {mode}: == {ref_engine}/off")
+            variants = [(e, m, ls) for e in ("scalar", "batched") for m in ("off", "lazy", "upfront")
+                        for ls in ((False, True) if e == "batched" else (False,))]
+            if mode == "standard":
+                variants = [v for v in variants if v[0] == ref_engine]
+            for engine, memo, lockstep in variants:
+                if (engine, memo, lockstep) == (ref_engine, "off", False):
+                    continue
+                scores, out = run(mode, engine, memo, lockstep)
+                name = f"{engine}/{memo}{'/lockstep' if lockstep else ''}"
+                check.expect(np.array_equal(scores, ref_scores) and np.array_equal(out, ref_out),
+                             lambda: f"{name}: scores {np.round(scores, 3).tolist()} != "
+                                     f"{np.round(ref_scores, 3).tolist()}")
+            checks.append(check)
+    return checks
+
+
+# ---------------------------------------------------------------------- #
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sections", nargs="*", default=list(SECTIONS), choices=SECTIONS)
+    ap.add_argument("--nets", type=int, default=3, help="redes aleatórias por topologia")
+    ap.add_argument("--population", type=int, default=12)
+    ap.add_argument("--games", type=int, default=60, help="partidas por avaliação")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    boards = reachable_boards()
+    runners = {
+        "minimax": lambda: check_minimax(boards),
+        "winner": lambda: check_winners(boards),
+        "network": lambda: check_network(boards, args.nets, args.seed),
+        "evaluator": lambda: check_evaluator(args.population, args.games, args.seed),
+    }
+
+    checks: list[Check] = []
+    seconds: dict[str, float] = {}
+    for section in args.sections:
+        t0 = time.perf_counter()
+        checks.extend(runners[section]())
+        seconds[section] = round(time.perf_counter() - t0, 3)
+
+    ok = all(c.failures == 0 for c in checks)
+    if args.json:
+        print(json.dumps({"positions": len(boards), "ok": ok, "seconds": seconds,
+                          "checks": [c.row() for c in checks]}))
+        return 0 if ok else 1
+
+    print(f"{len(boards)} posições alcançáveis; "
+          + ", ".join(f"{k} {v:.1f} s" for k, v in seconds.items()) + "\n")
+    print(f"{'checagem':<44} {'casos':>8} {'falhas':>7}")
+    for c in checks:
+        print(f"{c.name:<44} {c.cases:>8} {c.failures:>7}")
+        for ex in c.examples:
+            print(f"    {ex}")
+    print(f"\n{'OK' if ok else 'DIVERGÊNCIAS ENCONTRADAS'}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
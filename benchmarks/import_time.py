@@ -0,0 +1,75 @@
+"""
+Benchmark de tempo de inicialização dos pontos de entrada.
+
+Cada caminho é importado em um interpretador novo (melhor de N execuções),
+descontando o custo do próprio interpretador. Também lista quais módulos
+pesados (tkinter, matplotlib, numpy) foram carregados por cada caminho.
+
+Uso:
+    python benchmarks/import_time.py [--runs 7] [--budget-ms 100]
+"""
+from pathlib import Path
+import subprocess
+import argparse
+import json
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY = ("tkinter", "matplotlib", "numpy")
+
+# caminho → código executado depois de medir o interpretador vazio
+PATHS = {
+    "cli (menu + parser)": "import cli; cli.build_parser()",
+    "game_modes": "import utils.game_modes",
+    "gui": "import ui.gui",
+}
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+{code}
+dt = time.perf_counter() - t0
+print(json.dumps({{"ms": dt * 1000, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(code: str, runs: int) -> dict:
+    best = None
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(code=code, heavy=HEAVY)],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            return {"ms": None, "heavy": [], "error": out.stderr.strip().splitlines()[-1]}
+        res = json.loads(out.stdout)
+        if best is None or res["ms"] < best["ms"]:
+            best = res
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                        help="limite para o caminho do CLI (default: 100 ms)")
+    args = parser.parse_args()
+
+    results = {name: measure(code, args.runs) for name, code in PATHS.items()}
+
+    print(f"{'caminho':<22} {'import (ms)':>12}  módulos pesados")
+    for name, res in results.items():
+        if res["ms"] is None:
+            print(f"{name:<22} {'erro':>12}  {res['error']}")
+            continue
+        print(f"{name:<22} {res['ms']:>12.1f}  {', '.join(res['heavy']) or '-'}")
+
+    cli = results["cli (menu + parser)"]
+    ok = cli["ms"] is not None and cli["ms"] < args.budget_ms and not cli["heavy"]
+    print(f"\nCLI {'OK' if ok else 'ACIMA DO LIMITE'} (limite {args.budget_ms:.0f} ms)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Partidas até o fitness-alvo, por otimizador (ga, cmaes, es).
+
+Cada otimizador treina com as mesmas partidas por avaliação, população e
+sementes; a cada geração soma as partidas jogadas (`games_played`, que no
+racing já desconta as economizadas) e registra quando o melhor score
+alcança `--target`. Avaliar é o custo dominante, então partidas até o
+alvo medem a eficiência de amostragem de cada motor.
+
+Uso:
+    python benchmarks/optimizer_games.py [--target 60] [--population 40]
+        [--generations 60] [--games 20] [--seeds 0 1 2] [--json]
+"""
+from pathlib import Path
+import argparse
+import json
+import sys
+import tempfile
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from usecases.optimizer import OPTIMIZERS, make_optimizer  # noqa: E402
+import numpy as np  # noqa: E402
+
+
+def run(name: str, seed: int, args, out_dir: str) -> dict:
+    """Treina um motor e devolve partidas/gerações até o alvo (None se não chegou)."""
+    opt = make_optimizer(name, population_size=args.population,
+                         generations=args.generations, n_games=args.games,
+                         seed=seed, eval_mode=args.eval_mode, engine=args.engine,
+                         out_path=out_dir)
+    games = 0
+    hit: dict = {"games": None, "generation": None}
+
+    def on_generation(stats: dict) -> None:
+        nonlocal games
+        games += stats["games_played"]
+        if hit["games"] is None and stats["best"] >= args.target:
+            hit.update(games=games, generation=stats["generation"])
+
+    opt.evolve(on_generation=on_generation)
+    return {"optimizer": name, "seed": seed, **hit, "total_games": games}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--optimizers", nargs="*", default=list(OPTIMIZERS), choices=OPTIMIZERS)
+    ap.add_argument("--target", type=float, default=60.0, help="score-alvo do melhor da geração")
+    ap.add_argument("--population", type=int, default=40)
+    ap.add_argument("--generations", type=int, default=60)
+    ap.add_argument("--games", type=int, default=20)
+    ap.add_argument("--eval-mode", default="crn")
+    ap.add_argument("--engine", default="batched")
+    ap.add_argument("--seeds", type=int, nargs="*", default=[0, 1, 2])
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name in args.optimizers:
+            for seed in args.seeds:
+                rows.append(run(name, seed, args, out_dir))
+                if not args.json:
+                    r = rows[-1]
+                    print(f"{name:>6} seed {seed}: "
+                          + (f"alvo em {r['games']} partidas (geração {r['generation']})"
+                             if r["games"] is not None else
+                             f"não alcançou o alvo em {r['total_games']} partidas"),
+                          file=sys.stderr)
+
+    summary = {}
+    for name in args.optimizers:
+        hits = [r["games"] for r in rows if r["optimizer"] == name and r["games"] is not None]
+        summary[name] = {"reached": f"{len(hits)}/{len(args.seeds)}",
+                         "median_games": float(np.median(hits)) if hits else None}
+
+    if args.json:
+        print(json.dumps({"target": args.target, "runs": rows, "summary": summary}))
+    else:
+        print(f"\npartidas até score >= {args.target} (mediana entre as sementes que chegaram)")
+        for name, s in summary.items():
+            med = f"{s['median_games']:.0f}" if s["median_games"] is not None else "—"
+            print(f"  {name:>6}  {med:>10}  ({s['reached']} sementes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
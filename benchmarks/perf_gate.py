@@ -0,0 +1,205 @@
+"""
+Gate de desempenho: aceleração dos caminhos quentes sobre as referências.
+
+Cada caminho rápido é cronometrado junto com a implementação de
+referência que ele substitui, sobre a mesma carga (melhor de `--repeat`
+execuções, depois de uma de aquecimento):
+
+  caminho           rápido                       referência
+  minimax           tabela (`minimax`)           `minimax_search`, sem memo
+  check_winner      `simulador.winners`          `utils.check_winner`
+  predict           `NeuralNetwork.predict`      `Neuron.forward` por neurônio
+  predict_batch     `NeuralNetwork.predict_batch`  idem, tabuleiro a tabuleiro
+  memo_prefill      `MoveMemo.prefill`           idem, nas duas máscaras
+  move_batch        `MinimaxTrainer.move_batch`  `MinimaxTrainer.move`
+  evaluate_batched  motor batched (lockstep)     motor scalar (`_play_one`)
+  evaluate_scalar   motor scalar                 partidas em Python puro
+
+O que se compara é a razão tempo(referência) / tempo(rápido). Ela
+depende bem menos da máquina que o tempo absoluto, então a referência
+gravada em `--baselines` vale entre máquinas. O gate falha se alguma
+aceleração cair mais de `--max-regression` (fração, default 0.25)
+abaixo da gravada. Sem referência para um caminho o gate também falha,
+com código próprio; `--update` grava as acelerações medidas.
+
+Uso:
+    python benchmarks/perf_gate.py [--update] [--max-regression 0.25]
+        [--repeat 3] [--paths minimax predict_batch ...] [--json]
+
+Códigos de saída: 0 ok, 1 regressão além do limite, 2 sem referência.
+"""
+from pathlib import Path
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from adapters.minimax_trainer import MinimaxTrainer  # noqa: E402
+from benchmarks.equivalence import (  # noqa: E402
+    reachable_boards, reference_evaluation, reference_move)
+from entities.neural_network import NeuralNetwork  # noqa: E402
+from entities.topology import Topology  # noqa: E402
+from services.position_index import MoveMemo, net_position_boards  # noqa: E402
+from services.tic_tac_toe_simulator import winners  # noqa: E402
+from usecases.score_evaluator import ScoreEvaluator  # noqa: E402
+from utils.utils import check_winner  # noqa: E402
+import minimax.minimax as minimax_module  # noqa: E402
+import numpy as np  # noqa: E402
+
+DEFAULT_BASELINES = ROOT / "benchmarks" / "baselines.json"
+
+EXIT_OK, EXIT_REGRESSION, EXIT_NO_BASELINE = 0, 1, 2
+
+
+def hot_paths(seed: int = 0) -> dict:
+    """Nome → (carga rápida, carga de referência), funções sem argumentos."""
+    rng = np.random.RandomState(seed)
+    topology = Topology()
+    net = NeuralNetwork.from_topology(topology, topology.random_weights(rng))
+    boards = reachable_boards()
+    grids = [b.reshape(3, 3) for b in boards]
+    positions = net_position_boards()
+    opp_boards = positions[rng.randint(0, len(positions), 2048)] * -1  # O a jogar
+
+    # a busca completa é cara: posições em jogo com 4+ peças
+    pieces = (boards != 0).sum(axis=1)
+    open_ = (winners(boards) == 0) & (pieces >= 4) & (pieces < 9)
+    search = [g.tolist() for g in np.asarray(grids)[open_][
+        rng.choice(int(open_.sum()), 100, replace=False)]]
+
+    def fresh_search():
+        minimax_module._solutions = None  # sem memo: mede a busca, não o dicionário
+        return [minimax_module.minimax_search(g) for g in search]
+
+    def reference_moves(mask: bool):
+        return [reference_move(net, b.tolist(), mask) for b in positions]
+
+    def scalar_moves():
+        trainer = MinimaxTrainer(0.5, random.Random(seed))
+        return [trainer.move(b.reshape(3, 3).tolist()) for b in opp_boards]
+
+    population = [topology.random_weights(rng) for _ in range(8)]
+    seeds = list(range(len(population)))
+
+    def evaluate(engine: str, n_games: int):
+        ev = ScoreEvaluator(topology, n_games, mode="crn", engine=engine)
+        ev.prepare_generation(seed)
+        return ev, lambda: ev.evaluate_population(population, seeds)
+
+    _, batched = evaluate("batched", 100)
+    _, scalar = evaluate("scalar", 100)
+    small_ev, small_scalar = evaluate("scalar", 20)
+
+    return {
+        "minimax": (lambda: [minimax_module.minimax(g) for g in search], fresh_search),
+        "check_winner": (lambda: winners(boards), lambda: [check_winner(g) for g in grids]),
+        "predict": (lambda: [net.predict(b, True) for b in positions],
+                    lambda: reference_moves(True)),
+        "predict_batch": (lambda: net.predict_batch(positions, True),
+                          lambda: reference_moves(True)),
+        "memo_prefill": (lambda: MoveMemo(net).prefill(),
+                         lambda: (reference_moves(False), reference_moves(True))),
+        "move_batch": (lambda: MinimaxTrainer().move_batch(
+            opp_boards, 0.5, np.random.RandomState(seed)), scalar_moves),
+        "evaluate_batched": (batched, scalar),
+        "evaluate_scalar": (small_scalar,
+                            lambda: reference_evaluation(small_ev, population, seeds)),
+    }
+
+
+def measure(fn, repeat: int) -> float:
+    """Melhor tempo (s) de `repeat` execuções, após uma de aquecimento."""
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def machine() -> dict:
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "processor": platform.processor()}
+
+
+def load_baselines(path: Path) -> dict:
+    if not path.exists():
+        return {"machine": None, "speedup": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def main() -> int:
+    paths = hot_paths()
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--baselines", type=Path, default=DEFAULT_BASELINES)
+    ap.add_argument("--update", action="store_true",
+                    help="grava as acelerações medidas como nova referência")
+    ap.add_argument("--max-regression", type=float, default=0.25,
+                    help="queda tolerada da aceleração, em fração (default: 0.25)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--paths", nargs="*", default=list(paths), choices=list(paths))
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    if not args.update and not args.baselines.exists():
+        print(f"sem referência em {args.baselines}: grave uma com --update",
+              file=sys.stderr)
+        return EXIT_NO_BASELINE
+
+    baselines = load_baselines(args.baselines)
+    reference = baselines.get("speedup", {})
+
+    rows = []
+    for name in args.paths:
+        fast_fn, ref_fn = paths[name]
+        fast, ref = measure(fast_fn, args.repeat), measure(ref_fn, args.repeat)
+        speedup = ref / fast
+        base = reference.get(name)
+        floor = base / (1.0 + args.max_regression) if base else None
+        rows.append({"path": name, "fast_seconds": fast, "reference_seconds": ref,
+                     "speedup": speedup, "baseline": base,
+                     "ok": floor is not None and speedup >= floor})
+    if args.update:
+        status = EXIT_OK
+    elif any(r["baseline"] and not r["ok"] for r in rows):
+        status = EXIT_REGRESSION
+    elif any(not r["baseline"] for r in rows):
+        status = EXIT_NO_BASELINE
+    else:
+        status = EXIT_OK
+
+    if args.update:
+        reference.update({r["path"]: round(r["speedup"], 2) for r in rows})
+        args.baselines.write_text(json.dumps(
+            {"machine": machine(), "speedup": reference}, indent=2) + "\n", encoding="utf-8")
+
+    if args.json:
+        print(json.dumps({"max_regression": args.max_regression, "status": status,
+                          "updated": args.update, "paths": rows}))
+        return status
+
+    print(f"{'caminho':<17} {'rápido (ms)':>12} {'ref. (ms)':>10} {'acel.':>8} {'gravada':>8}")
+    for r in rows:
+        base = f"{r['baseline']:>8.1f}" if r["baseline"] else f"{'—':>8}"
+        flag = ("" if r["ok"] or args.update else
+                "  SEM REFERÊNCIA" if not r["baseline"] else "  REGRESSÃO")
+        print(f"{r['path']:<17} {r['fast_seconds'] * 1000:>12.2f} "
+              f"{r['reference_seconds'] * 1000:>10.2f} {r['speedup']:>7.1f}× {base}{flag}")
+    if args.update:
+        print(f"\nreferência gravada em {args.baselines}")
+    else:
+        verdict = {EXIT_OK: "OK", EXIT_REGRESSION: "REGRESSÃO",
+                   EXIT_NO_BASELINE: "SEM REFERÊNCIA (grave com --update)"}[status]
+        print(f"\n{verdict} (tolerância: aceleração até "
+              f"{1 / (1 + args.max_regression):.0%} da gravada)")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
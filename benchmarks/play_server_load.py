@@ -0,0 +1,104 @@
+"""
+Teste de carga do servidor de partidas (services/play_server.py).
+
+Sobe o servidor no próprio processo, em uma porta livre, e abre
+`--clients` conexões; cada uma joga `--games` partidas com lances
+aleatórios, todas ao mesmo tempo. No fim imprime as estatísticas do
+servidor (latência p50/p99 por jogada, tamanho médio dos lotes) e
+confere que nenhuma resposta foi de erro.
+
+Uso:
+    python benchmarks/play_server_load.py [--model rnn.npz] [--clients 64] [--games 20]
+
+Sem o arquivo do modelo, usa uma rede 9-9-9 com pesos aleatórios.
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from entities.neural_network import NeuralNetwork  # noqa: E402
+from entities.topology import Topology  # noqa: E402
+from services.play_server import PlayClient, PlayServer, serve_tcp  # noqa: E402
+from utils.model_io import find_model  # noqa: E402
+import numpy as np  # noqa: E402
+
+
+async def play(client: PlayClient, n_games: int, rng: random.Random) -> tuple[int, int]:
+    """Joga `n_games` partidas; devolve (jogadas, erros)."""
+    moves = errors = 0
+    for _ in range(n_games):
+        reply = await client.request("new", ai_first=rng.random() < 0.5)
+        sid, board = reply["session"], reply["board"]
+        while True:
+            cell = rng.choice([i for i, ch in enumerate(board) if ch == "."])
+            reply = await client.request("move", session=sid, cell=cell)
+            moves += 1
+            if not reply["ok"]:
+                errors += 1
+                break
+            board = reply["board"]
+            if reply["result"] is not None:
+                break
+        await client.request("close", session=sid)
+    return moves, errors
+
+
+async def run(args) -> dict:
+    if find_model(args.model):
+        server = PlayServer.from_model(args.model, max_wait=args.max_wait_ms / 1000)
+    else:
+        topology = Topology()
+        weights = topology.random_weights(np.random.RandomState(args.seed))
+        server = PlayServer(NeuralNetwork.from_topology(topology, weights),
+                            max_wait=args.max_wait_ms / 1000)
+
+    ready = asyncio.get_running_loop().create_future()
+    srv = asyncio.create_task(serve_tcp(server, "127.0.0.1", 0, ready))
+    port = await ready
+
+    clients = [await PlayClient().connect("127.0.0.1", port) for _ in range(args.clients)]
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(play(c, args.games, random.Random(args.seed + i))
+                                     for i, c in enumerate(clients)))
+    elapsed = time.perf_counter() - t0
+    stats = await clients[0].request("stats")
+    for c in clients:
+        await c.close()
+    srv.cancel()
+    try:
+        await srv
+    except asyncio.CancelledError:
+        pass
+
+    moves = sum(m for m, _ in results)
+    errors = sum(e for _, e in results)
+    return {"clients": args.clients, "games": args.clients * args.games,
+            "moves": moves, "errors": errors, "elapsed": round(elapsed, 3),
+            "moves_per_s": round(moves / elapsed, 1),
+            **{k: stats[k] for k in ("p50_ms", "p99_ms", "batches", "mean_batch")}}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="rnn.npz")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--games", type=int, default=20, help="partidas por cliente")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Smoke run do treino: combinações de opções em execuções curtas.
+
+Cada configuração treina poucas gerações, com população e partidas
+pequenas, em um diretório temporário, e só precisa terminar sem erro e
+devolver um vetor de pesos do tamanho da topologia. Serve para pegar
+combinações de opções que o CLI aceita mas que quebram em execução
+(ilhas + substituição de duplicatas, NSGA-II + dedup, ...).
+
+Uso:
+    python benchmarks/smoke_train.py [--only islands-replace ...]
+
+Sai com código 1 se alguma configuração falhar.
+"""
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+import traceback
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from entities.topology import Topology  # noqa: E402
+from usecases.island_model import IslandModel  # noqa: E402
+from usecases.optimizer import make_optimizer  # noqa: E402
+
+# nome → (construtor, kwargs); `out_path` e `seed` vêm do runner
+CONFIGS = {
+    "ga": ("ga", dict(population_size=12, generations=3, n_games=4)),
+    "ga-dedup-replace": ("ga", dict(population_size=12, generations=3, n_games=4,
+                                    dedup="behavior", replace_duplicates=True,
+                                    track_diversity=True, mut_rate=0.0)),
+    "ga-nsga2": ("ga", dict(population_size=12, generations=3, n_games=4,
+                            selection="nsga2", dedup="exact")),
+    "cmaes": ("cmaes", dict(population_size=8, generations=3, n_games=4)),
+    "es": ("es", dict(population_size=8, generations=3, n_games=4)),
+    "islands": ("islands", dict(n_islands=2, population_size=16, generations=4,
+                                n_games=4, migration_interval=2)),
+    "islands-replace": ("islands", dict(n_islands=2, population_size=16, generations=10,
+                                        n_games=4, migration_interval=3, dedup="behavior",
+                                        replace_duplicates=True, mut_rate=0.0)),
+}
+
+
+def run(name: str, seed: int, out_dir: str):
+    kind, kwargs = CONFIGS[name]
+    kwargs = {**kwargs, "seed": seed, "out_path": Path(out_dir) / name}
+    if kind == "islands":
+        return IslandModel(**kwargs).evolve()
+    return make_optimizer(kind, **kwargs).evolve()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--only", nargs="*", default=list(CONFIGS), choices=list(CONFIGS))
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    expected = Topology().vector_len
+    failed = 0
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name in args.only:
+            t0 = time.perf_counter()
+            try:
+                weights = run(name, args.seed, out_dir)
+                if len(weights) != expected:
+                    raise AssertionError(f"{len(weights)} pesos, esperado {expected}")
+                status = "ok"
+            except Exception:
+                failed += 1
+                status = "FALHOU"
+                traceback.print_exc()
+            print(f"{name:<20} {status:<7} {time.perf_counter() - t0:6.1f} s")
+
+    print(f"\n{'OK' if not failed else f'{failed} configuração(ões) falharam'}")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,9 @@
+import argparse
+import json
 import sys
 
-from utils.game_modes import (
-    start_game_against_minimax,
-    start_train_network,
-    start_game_against_network
-    )
+# `utils.game_modes` (e com ele numpy, AG e minimax) só é importado quando
+# o modo correspondente é escolhido: o menu e o parser abrem instantaneamente.
 
 class TicTacToeCLI:
     """
@@ -24,13 +23,448 @@ class TicTacToeCLI:
 3 - Jogar contra IA treinada\n0 - Sair""")
             cmd = input("Escolha: ").strip()
             if cmd == "1":
+                from utils.game_modes import start_game_against_minimax
                 start_game_against_minimax()
             elif cmd == "2":
+                from utils.game_modes import start_train_network
                 start_train_network()
             elif cmd == "3":
+                from utils.game_modes import start_game_against_network
                 start_game_against_network()
             elif cmd == "0":
                 print("Até logo!")
                 sys.exit(0)
             else:
-                print("Opção inválida. Tente novamente.")
\ No newline at end of file
+                print("Opção inválida. Tente novamente.")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Parser dos comandos não interativos (`python main.py <comando> ...`)."""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Jogo da velha com rede neural treinada por Algoritmo Genético.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    train = sub.add_parser("train", help="treinamento em lote, sem prompts")
+    opt = train.add_argument_group("otimizador")
+    opt.add_argument("--optimizer", default="ga", choices=("ga", "cmaes", "es"),
+                     help="motor de treino: algoritmo genético, CMA-ES ou ES com gradiente "
+                          "estimado (default: ga)")
+    opt.add_argument("--sigma", type=float, default=None,
+                     help="passo inicial do cmaes/es (default: 0.3 no cmaes, 0.1 no es)")
+    opt.add_argument("--lr", type=float, default=0.05, help="taxa do passo Adam do es (default: 0.05)")
+
+    ga = train.add_argument_group("algoritmo genético")
+    ga.add_argument("--population", type=int, default=20, help="tamanho da população (default: 20)")
+    ga.add_argument("--generations", type=int, default=10, help="número de gerações (default: 10)")
+    ga.add_argument("--games", type=int, default=10, help="partidas por indivíduo (default: 10)")
+    ga.add_argument("--layers", default="9,9,9",
+                    help="tamanhos das camadas, entrada→saída (default: 9,9,9)")
+    ga.add_argument("--dtype", default="float64", choices=("float32", "float64"),
+                    help="tipo dos pesos na população e na inferência (default: float64)")
+    ga.add_argument("--activations", default="sigmoid",
+                    help="ativação de todas as camadas ou uma por camada, ex.: tanh,sigmoid "
+                         "(sigmoid, tanh, relu, hard_sigmoid, identity; default: sigmoid)")
+    ga.add_argument("--mut-rate", type=float, default=0.20, help="prob. de mutação por gene (default: 0.20)")
+    ga.add_argument("--mutation-start", type=float, default=0.30,
+                    help="fração das gerações sem mutação (default: 0.30)")
+    ga.add_argument("--tournament-k", type=int, default=2, help="tamanho do torneio (default: 2)")
+    ga.add_argument("--selection", default="scalar", choices=("scalar", "nsga2"),
+                    help="torneio pelo score ou por frente de Pareto + aglomeração sobre as "
+                         "taxas de vitória/empate/derrota/jogada ilegal (default: scalar)")
+    ga.add_argument("--dedup", default="off", choices=("off", "exact", "near", "behavior"),
+                    help="avalia uma vez só indivíduos com os mesmos pesos (exact), pesos na "
+                         "mesma célula de --dedup-tol (near) ou as mesmas jogadas (behavior)")
+    ga.add_argument("--dedup-tol", type=float, default=1e-3,
+                    help="lado da grade do --dedup near (default: 0.001)")
+    ga.add_argument("--replace-duplicates", action="store_true",
+                    help="troca filhos repetidos por pesos aleatórios novos")
+    ga.add_argument("--diversity", action="store_true",
+                    help="registra a diversidade da população em cada geração")
+    ga.add_argument("--eval-mode", default="standard",
+                    help="modo de avaliação do ScoreEvaluator: standard, crn ou racing")
+    ga.add_argument("--engine", default="scalar", choices=("scalar", "batched"),
+                    help="partidas uma a uma ou em lote, em lockstep (default: scalar)")
+    ga.add_argument("--memo", default="auto", choices=("auto", "lazy", "upfront", "off"),
+                    help="memória de jogadas por rede: lazy calcula cada posição na primeira "
+                         "vez, upfront todas de uma vez; auto escolhe por --games (default: auto)")
+    ga.add_argument("--schedule", default="fixed", choices=("fixed", "adaptive"),
+                    help="currículo de adversários, máscara e mutação por geração "
+                         "(default: fixed = 80%% p=0.5, 10%% com máscara, mutação após "
+                         "--mutation-start)")
+    ga.add_argument("--coevolution", type=float, default=0.0,
+                    help="peso (0-1) do hall da fama no fitness; 0 desliga (default: 0)")
+    ga.add_argument("--hof-size", type=int, default=10,
+                    help="melhores de gerações passadas mantidos no hall da fama (default: 10)")
+    ga.add_argument("--racing-keep", type=float, default=0.5,
+                    help="fração da população que disputa todas as partidas no modo racing")
+    ga.add_argument("--racing-z", type=float, default=2.0,
+                    help="largura (em desvios-padrão) do intervalo de eliminação do racing")
+
+    isl = train.add_argument_group("modelo de ilhas")
+    isl.add_argument("--islands", type=int, default=1,
+                     help="sub-populações em processos separados (default: 1 = desligado)")
+    isl.add_argument("--migration-interval", type=int, default=5, help="gerações entre migrações")
+    isl.add_argument("--migrants", type=int, default=2, help="indivíduos migrados por ilha")
+    isl.add_argument("--topology", default="ring", choices=("ring", "random"),
+                     help="topologia de migração (default: ring)")
+
+    run = train.add_argument_group("execução")
+    run.add_argument("--workers", type=int, default=1, help="processos de avaliação (default: 1)")
+    run.add_argument("--eval-nodes", default=None,
+                     help="avalia nos workers host:porta,host:porta (ver eval-worker) "
+                          "em vez de processos locais")
+    run.add_argument("--seed", type=int, default=None, help="semente para reprodutibilidade")
+    run.add_argument("--output", default="rnn.npz",
+                     help="arquivo da melhor rede, pesos + topologia (default: rnn.npz)")
+    run.add_argument("--out-dir", default="populations", help="diretório dos CSVs por geração")
+    run.add_argument("--population-dir", default=None,
+                     help="mantém os pesos da população atual e da próxima em arquivos "
+                          "mapeados em memória neste diretório (populações grandes)")
+    run.add_argument("--checkpoint", default=None, help="arquivo .npz de checkpoint")
+    run.add_argument("--checkpoint-every", type=int, default=1, help="gerações entre checkpoints")
+    run.add_argument("--resume", action="store_true", help="continua a partir de --checkpoint")
+    run.add_argument("--progress", default="-",
+                     help="destino do progresso em JSON lines ('-' = stdout, '' = desliga)")
+    run.add_argument("--telemetry", default=None,
+                     help="grava métricas por geração (quartis do score, partidas/s, memória, "
+                          "tempo por fase, ...) neste arquivo")
+    run.add_argument("--telemetry-format", default="jsonl", choices=("jsonl", "prom"),
+                     help="jsonl com rotação ou texto do Prometheus (default: jsonl)")
+    run.add_argument("--telemetry-max-mb", type=float, default=50.0,
+                     help="tamanho do jsonl antes de girar o arquivo (default: 50)")
+    run.add_argument("--trace", default=None,
+                     help="grava lances e desfecho de cada partida de avaliação neste "
+                          "arquivo (acréscimo; analise com `main.py trace`)")
+
+    serve = sub.add_parser("serve", help="servidor de partidas contra a rede (JSON lines)")
+    serve.add_argument("--model", default="rnn.npz", help="rede treinada (default: rnn.npz)")
+    serve.add_argument("--host", default="127.0.0.1", help="endereço TCP (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="porta TCP (default: 8765)")
+    serve.add_argument("--stdio", action="store_true",
+                       help="atende um cliente pela entrada/saída padrão em vez de TCP")
+    serve.add_argument("--max-batch", type=int, default=256,
+                       help="máximo de jogadas por passada da rede (default: 256)")
+    serve.add_argument("--max-wait-ms", type=float, default=2.0,
+                       help="espera máxima para completar um lote (default: 2 ms)")
+
+    worker = sub.add_parser("eval-worker", help="worker de avaliação para train --eval-nodes")
+    worker.add_argument("--host", default="127.0.0.1",
+                        help="endereço TCP; só exponha em rede confiável (default: 127.0.0.1)")
+    worker.add_argument("--port", type=int, default=7000, help="porta TCP (default: 7000)")
+
+    tour = sub.add_parser("tournament", help="todos contra todos entre redes e variantes do Minimax")
+    tour.add_argument("models", nargs="*", help="arquivos de redes (.npz ou .npy legados)")
+    tour.add_argument("--minimax", action="store_true", help="inclui o Minimax perfeito")
+    tour.add_argument("--trainer-p", type=float, nargs="*", default=[],
+                      help="inclui MinimaxTrainer com estas probabilidades, ex.: 0.5 0.8")
+    tour.add_argument("--random", action="store_true", help="inclui o jogador aleatório")
+    tour.add_argument("--games", type=int, default=100, help="partidas por confronto e cor (default: 100)")
+    tour.add_argument("--workers", type=int, default=1, help="processos (default: 1)")
+    tour.add_argument("--seed", type=int, default=0, help="semente dos confrontos (default: 0)")
+    tour.add_argument("--cache", default="tournament_cache.json",
+                      help="cache de resultados por par de jogadores ('' desliga)")
+    tour.add_argument("--json", action="store_true", help="imprime o ranking em JSON")
+
+    trace = sub.add_parser("trace", help="analisa partidas gravadas com train --trace")
+    trace.add_argument("files", nargs="+", help="arquivos de registro")
+    trace.add_argument("--top", type=int, default=10,
+                       help="posições listadas por categoria (default: 10)")
+    trace.add_argument("--json", action="store_true", help="imprime o relatório em JSON")
+
+    return parser
+
+
+def run_trace(args: argparse.Namespace) -> int:
+    """Agrega os registros e imprime desfechos, posições frequentes e falhas."""
+    from services.game_trace import FAILURES, analyze, load_traces
+
+    report = None
+    try:
+        for path in args.files:
+            report = analyze(load_traces(path), report=report)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"registro inválido: {e}", file=sys.stderr)
+        return 2
+
+    data = {**report.summary(),
+            "positions": report.top_positions(args.top),
+            **{kind: report.top_failures(kind, args.top) for kind in FAILURES}}
+    if args.json:
+        print(json.dumps(data))
+        return 0
+
+    print(json.dumps(report.summary(), indent=2))
+    print("\nposições mais jogadas pela rede (X = rede, O = Minimax):")
+    for row in data["positions"]:
+        print(f"  {row['board']}  {row['count']}")
+    for kind in FAILURES:
+        print(f"\n{kind}: posição → casa escolhida pela rede")
+        for row in data[kind]:
+            print(f"  {row['board']}  casa {row['cell']}  {row['count']}")
+    return 0
+
+
+def run_tournament(args: argparse.Namespace) -> int:
+    """Monta os jogadores, joga os confrontos que faltam e imprime o ranking."""
+    from usecases.tournament import (MinimaxPolicyPlayer, NetworkPlayer, Tournament,
+                                     TrainerPlayer, format_table)
+
+    players = []
+    try:
+        players += [NetworkPlayer.from_file(path) for path in args.models]
+    except (FileNotFoundError, ValueError) as e:
+        print(f"modelo inválido: {e}", file=sys.stderr)
+        return 2
+    if args.minimax:
+        players.append(MinimaxPolicyPlayer())
+    players += [TrainerPlayer(p) for p in args.trainer_p]
+    if args.random:
+        players.append(TrainerPlayer(0.0))
+    if len(players) < 2:
+        print("são necessários ao menos 2 jogadores", file=sys.stderr)
+        return 2
+
+    try:
+        tournament = Tournament(players, n_games=args.games, workers=args.workers,
+                                seed=args.seed, cache=args.cache or None)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    table = tournament.run()
+    if args.json:
+        print(json.dumps({"games_played": tournament.games_played, "ranking": table}))
+    else:
+        print(format_table(table))
+        print(f"\n{tournament.games_played} partidas novas "
+              f"({len(tournament.results)} confrontos no total)")
+    return 0
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    """Carrega o modelo e atende partidas até Ctrl+C."""
+    from services.play_server import PlayServer, serve_stdio, serve_tcp
+    import asyncio
+
+    try:
+        server = PlayServer.from_model(args.model, max_batch=args.max_batch,
+                                       max_wait=args.max_wait_ms / 1000)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"--model inválido: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        if args.stdio:
+            asyncio.run(serve_stdio(server))
+        else:
+            print(f"servindo {args.model} em {args.host}:{args.port}", file=sys.stderr)
+            asyncio.run(serve_tcp(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps({"event": "stats", **server.stats()}), file=sys.stderr)
+    return 0
+
+
+def run_eval_worker(args: argparse.Namespace) -> int:
+    """Atende coordenadores de `train --eval-nodes` até Ctrl+C."""
+    from services.eval_cluster import serve_worker
+
+    print(f"worker de avaliação em {args.host}:{args.port}", file=sys.stderr)
+    try:
+        serve_worker(args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"não foi possível escutar em {args.host}:{args.port}: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def run_train(args: argparse.Namespace) -> int:
+    """Treina o AG com os parâmetros de `args`, emitindo progresso em JSON lines."""
+    from usecases.island_model import IslandModel
+    from usecases.optimizer import make_optimizer
+    from usecases.score_evaluator import ScoreEvaluator
+    from usecases.schedule import make_schedule
+    from entities.topology import Topology
+    from utils.model_io import save_model
+
+    if args.eval_mode not in ScoreEvaluator.MODES:
+        print(f"--eval-mode deve ser um de {ScoreEvaluator.MODES}", file=sys.stderr)
+        return 2
+    try:
+        topology = Topology.parse(args.layers, args.dtype, args.activations)
+    except ValueError as e:
+        print(f"--layers/--dtype/--activations inválidos: {e}", file=sys.stderr)
+        return 2
+    if args.islands > 1 and (args.checkpoint or args.resume):
+        print("--checkpoint/--resume não são suportados com --islands", file=sys.stderr)
+        return 2
+    if args.population_dir and args.islands > 1:
+        print("--population-dir não é suportado com --islands", file=sys.stderr)
+        return 2
+    if args.islands > 1 and args.workers > 1:
+        print("--workers não é suportado com --islands (cada ilha já é um processo)",
+              file=sys.stderr)
+        return 2
+    if args.optimizer != "ga" and (args.islands > 1 or args.population_dir
+                                   or args.coevolution > 0 or args.selection != "scalar"
+                                   or args.dedup != "off" or args.replace_duplicates
+                                   or args.diversity):
+        print("--islands, --population-dir, --coevolution, --selection, --dedup, "
+              "--replace-duplicates e --diversity valem só para --optimizer ga",
+              file=sys.stderr)
+        return 2
+    if args.sigma is not None and args.sigma <= 0:
+        print("--sigma deve ser > 0", file=sys.stderr)
+        return 2
+    if args.optimizer == "es" and args.population % 2:
+        print("--optimizer es usa pares antitéticos: --population deve ser par", file=sys.stderr)
+        return 2
+    if args.eval_nodes and (args.islands > 1 or args.workers > 1):
+        print("--eval-nodes não é suportado com --islands ou --workers", file=sys.stderr)
+        return 2
+    if args.trace and (args.islands > 1 or args.workers > 1 or args.eval_nodes):
+        print("--trace só registra partidas do processo principal: "
+              "use --workers 1, sem --islands e sem --eval-nodes", file=sys.stderr)
+        return 2
+    try:
+        from services.eval_cluster import parse_node
+        eval_nodes = [n for n in (args.eval_nodes or "").split(",") if n]
+        for n in eval_nodes:
+            parse_node(n)
+    except ValueError as e:
+        print(f"--eval-nodes inválido: {e}", file=sys.stderr)
+        return 2
+
+    if args.progress == "-":
+        out = sys.stdout
+    elif args.progress:
+        out = open(args.progress, "a", encoding="utf-8")
+    else:
+        out = None
+
+    def emit(event: str, **data) -> None:
+        if out is not None:
+            out.write(json.dumps({"event": event, **data}) + "\n")
+            out.flush()
+
+    trace = telemetry = None
+    try:
+        common = dict(
+            layer_sizes=topology.layer_sizes,
+            dtype=topology.dtype.name,
+            activations=topology.activations,
+            eval_mode=args.eval_mode,
+            racing_keep=args.racing_keep,
+            racing_z=args.racing_z,
+            engine=args.engine,
+            memo=args.memo,
+            schedule=args.schedule,
+        )
+        if args.optimizer == "ga":
+            ga_kwargs = dict(
+                common,
+                mut_rate=args.mut_rate,
+                mutation_start=args.mutation_start,
+                tournament_k=args.tournament_k,
+                selection=args.selection,
+                dedup=args.dedup,
+                dedup_tol=args.dedup_tol,
+                replace_duplicates=args.replace_duplicates,
+                track_diversity=args.diversity,
+                coevolution=args.coevolution,
+                hof_size=args.hof_size,
+            )
+        else:
+            ga_kwargs = dict(common, **({"sigma": args.sigma} if args.sigma is not None else {}),
+                             **({"lr": args.lr} if args.optimizer == "es" else {}))
+        try:
+            if args.islands > 1:
+                engine = IslandModel(
+                    n_islands=args.islands,
+                    population_size=args.population,
+                    generations=args.generations,
+                    n_games=args.games,
+                    migration_interval=args.migration_interval,
+                    n_migrants=args.migrants,
+                    topology=args.topology,
+                    seed=args.seed,
+                    out_path=args.out_dir,
+                    **ga_kwargs,
+                )
+            else:
+                engine = make_optimizer(
+                    args.optimizer,
+                    population_size=args.population,
+                    generations=args.generations,
+                    n_games=args.games,
+                    workers=args.workers,
+                    seed=args.seed,
+                    out_path=args.out_dir,
+                    checkpoint_path=args.checkpoint,
+                    checkpoint_every=args.checkpoint_every,
+                    eval_nodes=eval_nodes,
+                    **({"population_dir": args.population_dir} if args.population_dir else {}),
+                    **ga_kwargs,
+                )
+        except ValueError as e:  # valores que só o motor valida (população, sigma, ...)
+            print(f"parâmetros inválidos: {e}", file=sys.stderr)
+            return 2
+        emit("start", optimizer=args.optimizer, population=args.population, generations=args.generations,
+             games=args.games, workers=args.workers, seed=args.seed,
+             eval_mode=args.eval_mode, engine=args.engine, memo=args.memo,
+             schedule=make_schedule(args.schedule, mut_rate=args.mut_rate,
+                                    mutation_start=args.mutation_start).describe(),
+             islands=args.islands, eval_nodes=eval_nodes,
+             layers=list(topology.layer_sizes), dtype=topology.dtype.name,
+             activations=list(topology.activations))
+
+        if args.trace:
+            from services.game_trace import TraceLog
+            trace = engine.evaluator.trace = TraceLog(args.trace)
+
+        if args.telemetry:
+            from services.telemetry import Telemetry
+            telemetry = Telemetry(args.telemetry, args.telemetry_format,
+                                  max_bytes=int(args.telemetry_max_mb * 2 ** 20))
+
+        def on_generation(stats: dict) -> None:
+            emit("generation", **stats)
+            if telemetry is not None:
+                telemetry(stats)
+
+        if args.islands > 1:
+            best = engine.evolve(on_generation=on_generation)
+            emit("islands", best_island=engine.best_island,
+                 island_best=[score for _, _, score in engine.island_best])
+        else:
+            best = engine.evolve(on_generation=on_generation, resume=args.resume)
+        path = save_model(args.output, best, topology)
+        emit("done", output=str(path),
+             **({"trace": args.trace, "traced_games": trace.total} if trace else {}))
+    finally:
+        if trace is not None:
+            trace.flush()
+        if telemetry is not None:
+            telemetry.close()
+        if out is not None and out is not sys.stdout:
+            out.close()
+
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "train":
+        return run_train(args)
+    if args.command == "serve":
+        return run_serve(args)
+    if args.command == "eval-worker":
+        return run_eval_worker(args)
+    if args.command == "tournament":
+        return run_tournament(args)
+    if args.command == "trace":
+        return run_trace(args)
+    return 2
@@ -0,0 +1,69 @@
+"""
+Funções de ativação vetorizadas (operam em arrays de qualquer shape e
+preservam o dtype de entrada).
+
+Cada ativação é registrada com um nome em `ACTIVATIONS`; camadas e
+topologias se referem a ela só pelo nome, o que permite gravá-lo junto
+com o modelo.
+
+`monotonic` indica se a função é estritamente crescente: nesse caso a
+ativação da camada de saída não altera o argmax e pode ser pulada.
+"""
+from typing import Callable, NamedTuple
+import numpy as np
+
+DEFAULT_ACTIVATION = "sigmoid"
+
+
+class Activation(NamedTuple):
+    name: str
+    fn: Callable[[np.ndarray], np.ndarray]
+    monotonic: bool
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return self.fn(x)
+
+
+def sigmoid(x: np.ndarray) -> np.ndarray:
+    """Sigmoide estável: exp só de valores <= 0, sem overflow."""
+    x = np.asarray(x)
+    z = np.exp(-np.abs(x))
+    return np.where(x >= 0, 1 / (1 + z), z / (1 + z)).astype(x.dtype, copy=False)
+
+
+def tanh(x: np.ndarray) -> np.ndarray:
+    return np.tanh(x)
+
+
+def relu(x: np.ndarray) -> np.ndarray:
+    return np.maximum(x, 0)
+
+
+def hard_sigmoid(x: np.ndarray) -> np.ndarray:
+    """Aproximação linear por partes da sigmoide: clip(0.2·x + 0.5, 0, 1)."""
+    x = np.asarray(x)
+    return np.clip(x * x.dtype.type(0.2) + x.dtype.type(0.5), 0, 1)
+
+
+def identity(x: np.ndarray) -> np.ndarray:
+    return x
+
+
+ACTIVATIONS: dict[str, Activation] = {
+    a.name: a for a in (
+        Activation("sigmoid", sigmoid, True),
+        Activation("tanh", tanh, True),
+        Activation("relu", relu, False),
+        Activation("hard_sigmoid", hard_sigmoid, False),
+        Activation("identity", identity, True),
+    )
+}
+
+
+def get_activation(name: str) -> Activation:
+    try:
+        return ACTIVATIONS[name]
+    except KeyError:
+        raise ValueError(
+            f"ativação desconhecida: {name!r} (opções: {', '.join(ACTIVATIONS)})"
+        ) from None
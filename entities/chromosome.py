@@ -1,21 +1,74 @@
 from typing import Optional
+import threading
 import numpy as np
 
+class IdAllocator:
+    """
+    Distribui IDs únicos e crescentes dentro de [start, stop).
+
+    • Thread-safe (lock interno).
+    • Entre processos: o processo pai recorta blocos disjuntos com `reserve`
+      e entrega um a cada worker/ilha, que cria seu próprio alocador com
+      `IdAllocator(*bloco)`. Nenhuma comunicação é necessária depois disso.
+    • `next_id` vai para o checkpoint; `advance_to` o restaura, mantendo os
+      IDs monotônicos entre execuções.
+    """
+    def __init__(self, start: int = 0, stop: Optional[int] = None):
+        self._next = start
+        self._stop = stop
+        self._lock = threading.Lock()
+
+    @property
+    def next_id(self) -> int:
+        return self._next
+
+    def _take(self, n: int) -> int:
+        with self._lock:
+            first = self._next
+            if self._stop is not None and first + n > self._stop:
+                raise RuntimeError(f"bloco de IDs esgotado (limite {self._stop})")
+            self._next = first + n
+            return first
+
+    def allocate(self) -> int:
+        return self._take(1)
+
+    def reserve(self, n: int) -> tuple[int, int]:
+        """Recorta `n` IDs consecutivos e devolve o bloco (start, stop)."""
+        first = self._take(n)
+        return first, first + n
+
+    def advance_to(self, next_id: int) -> None:
+        """Garante que o próximo ID seja >= `next_id` (retomada de checkpoint)."""
+        with self._lock:
+            self._next = max(self._next, next_id)
+
+    # locks não são serializáveis: só o intervalo viaja entre processos
+    def __getstate__(self):
+        return {"_next": self._next, "_stop": self._stop}
+
+    def __setstate__(self, state):
+        self.__init__(state["_next"], state["_stop"])
+
+
 class Chromosome:
     """
     Armazena vetor de pesos, score e um ID único.
     O ID é atribuído automaticamente, mas pode ser
     reaproveitado se desejado (p.ex. clonagem fiel).
+
+    Usa `__slots__`: sem `__dict__` por instância, o que pesa em
+    populações grandes. Os IDs vêm de `Chromosome.allocator`.
     """
-    _next_id: int = 0
+    __slots__ = ("id", "weights_vector", "score")
+
+    allocator: IdAllocator = IdAllocator()
 
     def __init__(self,
                  weights_vector: np.ndarray,
                  uid: Optional[int] = None):
         self.id: int = (uid if uid is not None
-                        else Chromosome._next_id)
-        if uid is None:
-            Chromosome._next_id += 1
+                        else Chromosome.allocator.allocate())
 
         self.weights_vector: np.ndarray = weights_vector
         self.score: float = 0.0
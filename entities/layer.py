@@ -1,3 +1,4 @@
+from entities.activation import DEFAULT_ACTIVATION, get_activation
 from entities.neuron import Neuron
 import numpy as np
 
@@ -5,22 +6,45 @@ class Layer:
     """
     Camada de neurônios.
     Responsabilidade única: agrupar neurônios e encaminhar forward.
+
+    Os pesos dos neurônios também ficam empilhados em uma matriz
+    (n_neurônios, n_entradas + 1), de modo que o forward é um único
+    produto matriz-vetor (ou matriz-matriz, em lote) seguido da ativação
+    vetorizada da camada.
     """
-    def __init__(self, neurons: list[Neuron]):
+    def __init__(self, neurons: list[Neuron], activation: str = DEFAULT_ACTIVATION):
         self.neurons = neurons
+        self.activation = get_activation(activation)
+        self.dtype = neurons[0].weights.dtype if neurons else np.dtype(float)
+        self.weights = (np.stack([n.weights for n in neurons]) if neurons
+                        else np.empty((0, 1), dtype=self.dtype))
 
     @classmethod
-    def from_weights_matrix(cls, weight_matrix: np.ndarray):
+    def from_weights_matrix(cls, weight_matrix: np.ndarray,
+                            activation: str = DEFAULT_ACTIVATION):
         """
         Constrói camada a partir de matriz de pesos.
         :param weight_matrix: shape (n_neurons, n_inputs + 1)
         """
-        return cls([Neuron(w.copy()) for w in weight_matrix])
+        return cls([Neuron(w.copy(), activation) for w in weight_matrix], activation)
+
+    def pre_activation(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Somas ponderadas (com bias), antes da ativação.
+        :param inputs: array (n_inputs,) ou lote (N, n_inputs)
+        :return: array (n_neurons,) ou (N, n_neurons)
+        """
+        if inputs.shape[-1] + 1 != self.weights.shape[1]:
+            raise ValueError(
+                f"Input length {inputs.shape[-1]} incompatible with weights "
+                f"length {self.weights.shape[1]}"
+            )
+        return inputs @ self.weights[:, :-1].T + self.weights[:, -1]
 
     def forward(self, inputs: np.ndarray) -> np.ndarray:
         """
         Propaga inputs em todos os neurônios.
-        :param inputs: array (n_inputs,)
-        :return: array (n_neurons,)
+        :param inputs: array (n_inputs,) ou lote (N, n_inputs)
+        :return: array (n_neurons,) ou (N, n_neurons)
         """
-        return np.array([n.forward(inputs) for n in self.neurons])
+        return self.activation(self.pre_activation(inputs))
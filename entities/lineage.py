@@ -0,0 +1,97 @@
+from pathlib import Path
+import numpy as np
+
+class Lineage:
+    """
+    Genealogia compacta: uma linha por cromossomo criado, em arrays NumPy
+    (id, pai, mãe, geração de nascimento). -1 = sem pai (população inicial
+    ou imigrante vindo de outra ilha).
+
+    Os arrays crescem por duplicação; a consulta por ID usa busca binária,
+    já que os IDs de um mesmo alocador chegam em ordem crescente.
+    """
+    FIELDS = ("ids", "parent_a", "parent_b", "born")
+
+    def __init__(self, capacity: int = 1024):
+        self._n = 0
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.parent_a = np.empty(capacity, dtype=np.int64)
+        self.parent_b = np.empty(capacity, dtype=np.int64)
+        self.born = np.empty(capacity, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _grow(self, needed: int) -> None:
+        cap = self.ids.size
+        if needed <= cap:
+            return
+        new_cap = max(needed, cap * 2)
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            arr = np.empty(new_cap, dtype=old.dtype)
+            arr[:self._n] = old[:self._n]
+            setattr(self, name, arr)
+
+    def record(self, uid: int, parent_a: int, parent_b: int, generation: int) -> None:
+        self._grow(self._n + 1)
+        i = self._n
+        self.ids[i] = uid
+        self.parent_a[i] = parent_a
+        self.parent_b[i] = parent_b
+        self.born[i] = generation
+        self._n += 1
+
+    def update(self, uid: int, parent_a: int, parent_b: int, generation: int) -> None:
+        """Reescreve a linha de `uid` (filho substituído que mantém o ID)."""
+        i = self._row(uid)
+        self.parent_a[i] = parent_a
+        self.parent_b[i] = parent_b
+        self.born[i] = generation
+
+    def _row(self, uid: int) -> int:
+        ids = self.ids[:self._n]
+        i = int(np.searchsorted(ids, uid))
+        if i == self._n or ids[i] != uid:
+            raise KeyError(uid)
+        return i
+
+    def parents(self, uid: int) -> tuple[int, int]:
+        i = self._row(uid)
+        return int(self.parent_a[i]), int(self.parent_b[i])
+
+    def generation_born(self, uid: int) -> int:
+        return int(self.born[self._row(uid)])
+
+    def ancestors(self, uid: int, depth: int = 3) -> set[int]:
+        """IDs dos ancestrais de `uid` até `depth` gerações acima."""
+        found: set[int] = set()
+        frontier = {uid}
+        for _ in range(depth):
+            nxt = set()
+            for u in frontier:
+                try:
+                    nxt.update(p for p in self.parents(u) if p >= 0)
+                except KeyError:  # imigrante / fora deste registro
+                    continue
+            nxt -= found
+            found |= nxt
+            frontier = nxt
+        return found
+
+    def arrays(self) -> dict:
+        return {name: getattr(self, name)[:self._n] for name in self.FIELDS}
+
+    def save(self, path: str | Path) -> None:
+        np.savez(path, **self.arrays())
+
+    @classmethod
+    def from_arrays(cls, ids, parent_a, parent_b, born) -> "Lineage":
+        lin = cls(max(1024, len(ids)))
+        n = len(ids)
+        lin.ids[:n] = ids
+        lin.parent_a[:n] = parent_a
+        lin.parent_b[:n] = parent_b
+        lin.born[:n] = born
+        lin._n = n
+        return lin
@@ -1,27 +1,42 @@
+from entities.topology import Topology
 from entities.layer import Layer
 import numpy as np
 
 class NeuralNetwork:
     """
-    MLP de duas camadas (oculta + saída).
+    MLP de duas camadas (oculta + saída) por padrão; qualquer número de
+    camadas ocultas (e ativações por camada) via `from_topology`.
     Constrói-se diretamente de um único vetor de pesos.
+
+    Como só o argmax da saída interessa, a ativação da última camada é
+    pulada quando é estritamente crescente (sigmoide, tanh, identidade).
     """
     def __init__(self, input_size: int, hidden_size: int,
-                 output_size: int, weights_vector: np.ndarray):
-        
-        expected_len = hidden_size * (input_size + 1) + output_size * (hidden_size + 1)
-        if weights_vector.size != expected_len:
-            raise ValueError(
-                f"weights_vector size={weights_vector.size} incompatible "
-                f"with network topology (expected {expected_len})"
-            )
-        
-        hidden_end = hidden_size * (input_size + 1)
-        hidden_w = weights_vector[:hidden_end].reshape(hidden_size, input_size + 1)
-        output_w = weights_vector[hidden_end:].reshape(output_size, hidden_size + 1)
-
-        self.hidden_layer = Layer.from_weights_matrix(hidden_w)
-        self.output_layer = Layer.from_weights_matrix(output_w)
+                 output_size: int, weights_vector: np.ndarray,
+                 dtype: str | None = None):
+        topology = Topology((input_size, hidden_size, output_size),
+                            dtype or _float_dtype(weights_vector))
+        self._build(topology, weights_vector)
+
+    @classmethod
+    def from_topology(cls, topology: Topology,
+                      weights_vector: np.ndarray) -> "NeuralNetwork":
+        net = cls.__new__(cls)
+        net._build(topology, weights_vector)
+        return net
+
+    def _build(self, topology: Topology, weights_vector: np.ndarray) -> None:
+        self.topology = topology
+        self.dtype = topology.dtype
+        weights_vector = np.asarray(weights_vector).astype(self.dtype, copy=False)
+        self.layers = [Layer.from_weights_matrix(w, act)
+                       for w, act in zip(topology.split(weights_vector),
+                                         topology.activations)]
+        self._skip_output_activation = self.layers[-1].activation.monotonic
+
+        # nomes históricos (rede 9-9-9)
+        self.hidden_layer = self.layers[0]
+        self.output_layer = self.layers[-1]
 
     def predict(self, board: np.ndarray, mask_invalid: bool = True) -> int:
         """
@@ -33,16 +48,46 @@ class NeuralNetwork:
             raise ValueError("board must have shape (9,)")
 
         # Propagação direta
-        h_out = self.hidden_layer.forward(board.astype(float))
-        o_out = self.output_layer.forward(h_out)
+        o_out = self._scores(board.astype(self.dtype))
 
         # Impede jogada em célula ocupada
         if mask_invalid:
             invalid = board != 0
-            o_out = o_out.copy()
             o_out[invalid] = -np.inf
             
             if np.all(np.isneginf(o_out)):
                 return -1
 
         return int(np.argmax(o_out))
+
+    def predict_batch(self, boards: np.ndarray, mask_invalid: bool = True) -> np.ndarray:
+        """
+        Versão em lote de `predict`: boards shape (N, 9) → jogadas (N,).
+        Tabuleiros cheios (com `mask_invalid`) recebem -1.
+        """
+        if boards.ndim != 2 or boards.shape[1] != 9:
+            raise ValueError("boards must have shape (N, 9)")
+
+        o_out = self._scores(boards.astype(self.dtype))
+        if not mask_invalid:
+            return np.argmax(o_out, axis=1)
+
+        invalid = boards != 0
+        o_out[invalid] = -np.inf
+        moves = np.argmax(o_out, axis=1)
+        moves[invalid.all(axis=1)] = -1
+        return moves
+
+    def _scores(self, x: np.ndarray) -> np.ndarray:
+        """Saída da rede para (9,) ou (N, 9), possivelmente sem a ativação final."""
+        for layer in self.layers[:-1]:
+            x = layer.forward(x)
+        last = self.layers[-1]
+        return (last.pre_activation(x) if self._skip_output_activation
+                else last.forward(x))
+
+
+def _float_dtype(weights_vector: np.ndarray) -> str:
+    """dtype de ponto flutuante a usar para `weights_vector` (float64 se não for float)."""
+    name = weights_vector.dtype.name
+    return name if name in Topology.DTYPES else "float64"
@@ -1,25 +1,19 @@
-from math import exp
+from entities.activation import DEFAULT_ACTIVATION, get_activation
 import numpy as np
 
 class Neuron:
     """
     Neurônio com pesos reais (inclui bias).
-    Responsabilidade: soma ponderada + ativação logística.
+    Responsabilidade: soma ponderada + ativação (logística por padrão,
+    ver `entities.activation`).
     """
-    def __init__(self, weights: np.ndarray):
+    def __init__(self, weights: np.ndarray, activation: str = DEFAULT_ACTIVATION):
         if weights.ndim != 1:
             raise ValueError("weights must be a 1-D vector")
-        self.weights = weights.astype(float, copy=True)
-
-    @staticmethod
-    def _safe_sigmoid(x: float) -> float:
-        """Sigmoide numéricamente estável."""
-        if x >= 0:
-            z = exp(-x)
-            return 1.0 / (1.0 + z)
-        else:
-            z = exp(x)
-            return z / (1.0 + z)
+        # preserva float32/float64; demais tipos viram float64
+        dtype = weights.dtype if weights.dtype in (np.float32, np.float64) else float
+        self.weights = weights.astype(dtype, copy=True)
+        self.activation = get_activation(activation)
 
     def forward(self, inputs: np.ndarray) -> float:
         """
@@ -36,5 +30,5 @@ class Neuron:
                 f"length {self.weights.size}"
             )
 
-        z = float(np.dot(self.weights[:-1], inputs) + self.weights[-1])  # bias
-        return self._safe_sigmoid(z)
+        z = np.dot(self.weights[:-1], inputs) + self.weights[-1]  # bias
+        return float(self.activation(z))
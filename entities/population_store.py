@@ -0,0 +1,109 @@
+"""
+Matrizes de pesos da população atual e da próxima (buffer duplo).
+
+Os cromossomos guardam views das linhas da matriz atual, e a reprodução
+escreve os filhos direto nas linhas da próxima; `swap` troca os papéis
+a cada geração, sem realocar nada. Com `path`, as duas matrizes são
+arquivos mapeados em memória (`population_0.bin`, `population_1.bin`):
+a memória residente fica limitada às páginas em uso e o sistema
+operacional cuida do resto.
+
+Workers de um pool recebem `RowRef` (caminho + linha) em vez de cópias
+dos pesos e leem a linha do mesmo mapa, sem copiar.
+"""
+from pathlib import Path
+import numpy as np
+
+_MAPS: dict[tuple, np.memmap] = {}  # mapas abertos neste processo (workers)
+
+
+class RowRef:
+    """Linha de um arquivo de população; vira array com `np.asarray`."""
+    __slots__ = ("path", "shape", "dtype", "index")
+
+    def __init__(self, path: str, shape: tuple[int, int], dtype: str, index: int):
+        self.path = path
+        self.shape = shape
+        self.dtype = dtype
+        self.index = index
+
+    def __array__(self, dtype=None, copy=None):
+        key = (self.path, self.shape, self.dtype)
+        rows = _MAPS.get(key)
+        if rows is None:
+            rows = _MAPS[key] = np.memmap(self.path, dtype=self.dtype, mode="r",
+                                          shape=self.shape)
+        row = rows[self.index]
+        return row if dtype is None else row.astype(dtype, copy=False)
+
+    def __getstate__(self):
+        return (self.path, self.shape, self.dtype, self.index)
+
+    def __setstate__(self, state):
+        self.path, self.shape, self.dtype, self.index = state
+
+
+class PopulationStore:
+    """
+    Buffer duplo (size, vector_len) de pesos, em RAM ou, com `path`, em
+    arquivos mapeados nesse diretório.
+    """
+    def __init__(self, size: int, vector_len: int, dtype, path: str | Path | None = None):
+        self.shape = (size, vector_len)
+        self.dtype = np.dtype(dtype)
+        self.path = Path(path) if path else None
+        if self.path is None:
+            self._buffers = [np.empty(self.shape, self.dtype) for _ in range(2)]
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._buffers = [np.memmap(self.path / f"population_{k}.bin", dtype=self.dtype,
+                                       mode="w+", shape=self.shape) for k in range(2)]
+        self._cur = 0
+
+    @property
+    def current(self) -> np.ndarray:
+        return self._buffers[self._cur]
+
+    @property
+    def next(self) -> np.ndarray:
+        return self._buffers[1 - self._cur]
+
+    def swap(self) -> None:
+        """A próxima população passa a ser a atual."""
+        self._cur = 1 - self._cur
+
+    def flush(self) -> None:
+        for buf in self._buffers:
+            if isinstance(buf, np.memmap):
+                buf.flush()
+
+    def _locate(self, vector: np.ndarray) -> tuple[int, int] | None:
+        """(buffer, linha) de um view de linha deste store; None se não for."""
+        if (not isinstance(vector, np.ndarray) or vector.base is None
+                or vector.shape != (self.shape[1],) or vector.dtype != self.dtype):
+            return None
+        row_bytes = self.shape[1] * self.dtype.itemsize
+        addr = vector.__array_interface__["data"][0]
+        for k, buf in enumerate(self._buffers):
+            offset = addr - buf.__array_interface__["data"][0]
+            if 0 <= offset < buf.nbytes and offset % row_bytes == 0:
+                return k, offset // row_bytes
+        return None
+
+    def refs(self, vectors) -> list:
+        """
+        `RowRef` para cada vetor que é linha de um arquivo deste store;
+        os demais (ou todos, sem arquivos) seguem como estão.
+        """
+        if self.path is None:
+            return list(vectors)
+        out = []
+        for v in vectors:
+            where = self._locate(v)
+            if where is None:
+                out.append(v)
+            else:
+                k, row = where
+                out.append(RowRef(str(self.path / f"population_{k}.bin"), self.shape,
+                                  self.dtype.str, int(row)))
+        return out
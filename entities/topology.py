@@ -0,0 +1,101 @@
+from entities.activation import DEFAULT_ACTIVATION, get_activation
+from typing import Sequence
+import numpy as np
+
+class Topology:
+    """
+    Arquitetura do MLP: tamanhos das camadas (entrada → ocultas → saída),
+    tipo de ponto flutuante dos pesos e ativação de cada camada.
+    Responsabilidade: derivar o tamanho do vetor de pesos e fatiá-lo em
+    matrizes por camada, shape (n_neurônios, n_entradas + 1).
+    """
+    DTYPES = ("float32", "float64")
+    BOARD_CELLS = 9
+
+    def __init__(self, layer_sizes: Sequence[int] = (9, 9, 9),
+                 dtype: str = "float64",
+                 activations: str | Sequence[str] | None = None):
+        sizes = tuple(int(n) for n in layer_sizes)
+        if len(sizes) < 2 or any(n < 1 for n in sizes):
+            raise ValueError("layer_sizes precisa de ao menos 2 camadas positivas")
+        if sizes[0] != self.BOARD_CELLS or sizes[-1] != self.BOARD_CELLS:
+            raise ValueError("entrada e saída devem ter 9 neurônios (uma por casa)")
+        if np.dtype(dtype).name not in self.DTYPES:
+            raise ValueError(f"dtype deve ser um de {self.DTYPES}")
+
+        # uma ativação por camada de pesos; um nome só vale para todas
+        if activations is None or isinstance(activations, str):
+            activations = [activations or DEFAULT_ACTIVATION] * (len(sizes) - 1)
+        activations = tuple(get_activation(a).name for a in activations)
+        if len(activations) != len(sizes) - 1:
+            raise ValueError(f"são necessárias {len(sizes) - 1} ativações "
+                             f"(uma por camada de pesos), recebidas {len(activations)}")
+
+        self.layer_sizes = sizes
+        self.dtype = np.dtype(dtype)
+        self.activations = activations
+
+    @classmethod
+    def parse(cls, text: str, dtype: str = "float64",
+              activations: str | None = None) -> "Topology":
+        """
+        Constrói a partir de texto como '9,18,9'; `activations` é um nome
+        (todas as camadas) ou um por camada, como 'tanh,sigmoid'.
+        """
+        if activations and "," in activations:
+            activations = activations.split(",")
+        return cls([int(n) for n in text.split(",")], dtype, activations or None)
+
+    def arrays(self) -> dict:
+        """Campos para gravar em .npz (modelos e checkpoints)."""
+        return {"layer_sizes": np.array(self.layer_sizes, dtype=np.int64),
+                "dtype": np.array(self.dtype.name),
+                "activations": np.array(self.activations)}
+
+    @classmethod
+    def from_arrays(cls, data) -> "Topology":
+        """Inverso de `arrays`; arquivos sem `activations` usam a sigmoide."""
+        activations = data["activations"].tolist() if "activations" in data else None
+        return cls(data["layer_sizes"].tolist(), str(data["dtype"]), activations)
+
+    @property
+    def layer_shapes(self) -> list[tuple[int, int]]:
+        return [(n_out, n_in + 1)
+                for n_in, n_out in zip(self.layer_sizes, self.layer_sizes[1:])]
+
+    @property
+    def vector_len(self) -> int:
+        return sum(r * c for r, c in self.layer_shapes)
+
+    def split(self, weights_vector: np.ndarray) -> list[np.ndarray]:
+        """Fatia o vetor de pesos em uma matriz por camada (views)."""
+        if weights_vector.size != self.vector_len:
+            raise ValueError(
+                f"weights_vector size={weights_vector.size} incompatible "
+                f"with network topology (expected {self.vector_len})"
+            )
+        mats, start = [], 0
+        for rows, cols in self.layer_shapes:
+            end = start + rows * cols
+            mats.append(weights_vector[start:end].reshape(rows, cols))
+            start = end
+        return mats
+
+    def random_weights(self, rng, low: float = -1.0, high: float = 1.0) -> np.ndarray:
+        """Vetor U(low, high) no dtype da topologia (`rng`: RandomState)."""
+        return rng.uniform(low, high, self.vector_len).astype(self.dtype)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Topology)
+                and self.layer_sizes == other.layer_sizes
+                and self.dtype == other.dtype
+                and self.activations == other.activations)
+
+    def __hash__(self) -> int:
+        return hash((self.layer_sizes, self.dtype.name, self.activations))
+
+    def __repr__(self) -> str:
+        acts = ""
+        if any(a != DEFAULT_ACTIVATION for a in self.activations):
+            acts = ", " + ",".join(self.activations)
+        return f"Topology({'-'.join(map(str, self.layer_sizes))}, {self.dtype.name}{acts})"
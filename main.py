@@ -1,6 +1,11 @@
-from cli import TicTacToeCLI
-from ui.gui import MainWindow
+import sys
+
 if __name__ == "__main__":
+    # Com argumentos → modo não interativo (ex.: `python main.py train ...`)
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main(sys.argv[1:]))
+
     choice = None
     while choice not in ["1", "2"]:
         choice = input("""
@@ -10,9 +15,12 @@ Escolha:
 """)
         if choice not in ["1", "2"]:
             print("Opção inválida! Por favor, escolha 1 ou 2.")
-    
+
     if choice == "1":
+        from cli import TicTacToeCLI
         TicTacToeCLI().start()
     elif choice == "2":
+        # tkinter/matplotlib só são carregados quando a GUI é escolhida
+        from ui.gui import MainWindow
         app = MainWindow()
-        app.mainloop()
\ No newline at end of file
+        app.mainloop()
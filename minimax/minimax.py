@@ -1,7 +1,31 @@
+from minimax.solution_table import load_solution_table
+from utils.board_codes import encode
 from math import inf
 
+# Memo tabuleiro → melhor jogada; criado só na primeira chamada a `minimax_search`.
+_solutions: dict | None = None
+
 def minimax(current_board):
+    """
+    Melhor posicao (linha, coluna) para o +1 jogar, lida da tabela de
+    soluções persistente (mesma resposta de `minimax_search`).
+    """
+    move = int(load_solution_table()[encode(current_board)])
+    if move < 0:
+        return -1, -1
+    return divmod(move, 3)
+
+def minimax_search(current_board):
     """Algoritmo minimax que recebe um board e retorna a melhor posicao para o +1 jogar"""
+    global _solutions
+    if _solutions is None:
+        _solutions = {}
+
+    key = tuple(v for row in current_board for v in row)
+    cached = _solutions.get(key)
+    if cached is not None:
+        return cached
+
     AI, HUMAN = +1, -1
 
     def check_winner(board, player):
@@ -58,5 +82,6 @@ def minimax(current_board):
                     worst_score, worst_move = sc, (i, j)
             return worst_move[0], worst_move[1], worst_score
 
-    row, col, _ = _minimax([r.copy() for r in current_board], AI, depth=0)
-    return row, col
\ No newline at end of file
+    row, col, _ = _minimax([list(r) for r in current_board], AI, depth=0)
+    _solutions[key] = (row, col)
+    return row, col
@@ -0,0 +1,149 @@
+"""
+Tabela persistente de soluções do Minimax.
+
+Para cada um dos 3**9 tabuleiros (código em `utils.board_codes`) guarda a
+jogada que `minimax` devolveria para o +1: índice 0-8, ou -1 quando o jogo
+já terminou. O arquivo é gerado uma única vez, versionado no nome, e
+aberto com `mmap_mode="r"`: todos os processos (CLI, GUI, workers do
+treino) compartilham as mesmas páginas, sem recalcular e sem cópias.
+
+    python -m minimax.solution_table [--force]
+
+Caminho padrão ao lado deste módulo; pode ser trocado pela variável de
+ambiente TTT_MINIMAX_TABLE.
+"""
+from utils.board_codes import N_CODES, POW3
+from pathlib import Path
+import numpy as np
+import os
+
+SOLUTION_VERSION = 1
+DEFAULT_PATH = Path(__file__).with_name(f"minimax_solutions_v{SOLUTION_VERSION}.npy")
+
+_LINES = ((0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6),
+          (1, 4, 7), (2, 5, 8), (0, 4, 8), (6, 4, 2))
+
+# Tabela mapeada, aberta na primeira consulta.
+_table: np.ndarray | None = None
+
+
+def table_path() -> Path:
+    return Path(os.environ.get("TTT_MINIMAX_TABLE", DEFAULT_PATH))
+
+
+def build_solution_table() -> np.ndarray:
+    """
+    Resolve todos os tabuleiros com a mesma regra de `minimax`: casas em
+    ordem linha-a-linha, primeira jogada de melhor score, vitória valendo
+    10 - profundidade. Valores são memoizados relativos à profundidade do
+    nó (o deslocamento de profundidade preserva a ordem entre irmãos),
+    então cada (tabuleiro, jogador) é resolvido uma vez só.
+    """
+    pow3 = [int(p) for p in POW3]
+    memo: dict[tuple[int, int], int] = {}
+    best = np.full(N_CODES, -1, dtype=np.int8)
+
+    def winner(cells) -> int:
+        # mesma precedência do minimax: vitória do +1 é checada primeiro
+        for a, b, c in _LINES:
+            if cells[a] == cells[b] == cells[c] == 1:
+                return 1
+        for a, b, c in _LINES:
+            if cells[a] == cells[b] == cells[c] == -1:
+                return -1
+        return 0
+
+    def solve(cells, code, player) -> tuple[int, int]:
+        """(valor relativo ao nó, melhor casa) para `player` a jogar."""
+        key = (code, player)
+        if key in memo:
+            return memo[key], -1
+
+        w = winner(cells)
+        moves = [i for i in range(9) if cells[i] == 0]
+        if w or not moves:
+            value, move = 10 * w, -1
+        else:
+            move = -1
+            value = None
+            digit = 1 if player == 1 else 2
+            for i in moves:
+                cells[i] = player
+                sc, _ = solve(cells, code + digit * pow3[i], -player)
+                cells[i] = 0
+                sc -= (sc > 0) - (sc < 0)  # um nível mais fundo
+                if value is None or (sc > value if player == 1 else sc < value):
+                    value, move = sc, i
+
+        memo[key] = value
+        if player == 1:
+            best[code] = move
+        return value, move
+
+    for code in range(N_CODES):
+        if (code, 1) not in memo:
+            cells = [(0, 1, -1)[(code // pow3[i]) % 3] for i in range(9)]
+            solve(cells, code, 1)
+
+    return best
+
+
+def save_solution_table(table: np.ndarray, path: Path | None = None) -> Path:
+    """Grava de forma atômica (arquivo temporário + rename)."""
+    path = Path(path or table_path())
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            np.save(f, table)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def load_solution_table(path: Path | None = None) -> np.ndarray:
+    """
+    Abre a tabela (somente leitura, mapeada em memória) uma vez por
+    processo, gerando o arquivo se ele ainda não existir ou for inválido.
+    Se o arquivo não puder ser gravado, usa a tabela recém-gerada em memória.
+    """
+    global _table
+    if _table is not None and path is None:
+        return _table
+
+    path = Path(path or table_path())
+    table = None
+    if path.is_file():
+        table = np.load(path, mmap_mode="r")
+        if table.shape != (N_CODES,) or table.dtype != np.int8:
+            table = None
+    if table is None:
+        built = build_solution_table()
+        try:
+            save_solution_table(built, path)
+        except OSError:  # instalação somente leitura: fica em memória neste processo
+            built.setflags(write=False)
+            table = built
+        else:
+            table = np.load(path, mmap_mode="r")
+
+    if path == table_path():
+        _table = table
+    return table
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Gera a tabela de soluções do Minimax.")
+    parser.add_argument("--force", action="store_true", help="regera mesmo se já existir")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    if args.force or not table_path().is_file():
+        save_solution_table(build_solution_table())
+    table = load_solution_table()
+    print(f"{(table >= 0).sum()} posições com jogada em "
+          f"{time.perf_counter() - t0:.1f}s → {table_path()}")
@@ -0,0 +1,281 @@
+"""
+Avaliação distribuída: um coordenador e workers em outros nós (TCP).
+
+O coordenador (`EvalCluster`) substitui o `Pool.starmap` do AG: divide
+os pedidos de uma chamada em shards, manda cada shard a um worker como
+um bloco de pesos (matriz shard × pesos) e junta as respostas na ordem
+original. As conexões ficam abertas entre chamadas; a função avaliada
+(o `ScoreEvaluator.run_games` da geração, com plano e cenários) só é
+reenviada quando muda.
+
+Mensagens (pickle com prefixo de 8 bytes de tamanho):
+
+    → ("setup", key, fn_pickle)               fn para os próximos shards
+    → ("shard", sid, key, pesos, jogos, seeds)
+    ← ("result", sid, [fn(w, jogos, seed) ...])
+    ← ("error", sid, traceback)
+
+Um worker que cai ou passa de `timeout` segundos sem responder tem a
+conexão fechada e o shard volta para a fila dos demais; na chamada
+seguinte o coordenador tenta reconectar. Erros dentro da avaliação não
+são repetidos: viram `RuntimeError` no coordenador.
+
+Pickle executa código ao carregar: use só em rede confiável (o worker
+escuta em 127.0.0.1 por padrão).
+
+    python main.py eval-worker --host 0.0.0.0 --port 7000   # em cada nó
+    python main.py train --eval-nodes nodeA:7000,nodeB:7000
+"""
+from collections import deque
+from multiprocessing import Pipe, Process
+from typing import Callable, Sequence
+import numpy as np
+import socketserver
+import traceback
+import threading
+import hashlib
+import pickle
+import socket
+import struct
+import math
+
+_HEADER = struct.Struct("!Q")
+
+
+def send_msg(sock: socket.socket, obj) -> None:
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytearray:
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:])
+        if k == 0:
+            raise EOFError("conexão encerrada")
+        got += k
+    return buf
+
+
+def recv_msg(sock: socket.socket):
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return pickle.loads(_recv_exact(sock, size))
+
+
+def parse_node(node: str | tuple[str, int]) -> tuple[str, int]:
+    """'host:porta' (ou tupla) → (host, porta)."""
+    if isinstance(node, tuple):
+        return node[0], int(node[1])
+    host, sep, port = node.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"nó inválido (esperado host:porta): {node!r}")
+    return host or "127.0.0.1", int(port)
+
+
+# ---------------------------------------------------------------------- #
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    """Atende um coordenador até ele desconectar."""
+
+    def handle(self) -> None:
+        sock = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        key, fn = None, None
+        while True:
+            try:
+                msg = recv_msg(sock)
+            except (EOFError, OSError):
+                return
+            if msg[0] == "setup":
+                _, key, blob = msg
+                fn = pickle.loads(blob)
+                continue
+
+            _, sid, want, block, games, seeds = msg
+            try:
+                if want != key:
+                    raise RuntimeError("shard chegou antes do setup da função")
+                per_row = games if isinstance(games, list) else [games] * len(seeds)
+                reply = ("result", sid, [fn(w, g, s)
+                                         for w, g, s in zip(block, per_row, seeds)])
+            except Exception:
+                reply = ("error", sid, traceback.format_exc())
+            try:
+                send_msg(sock, reply)
+            except OSError:  # coordenador desistiu (timeout) → próxima conexão
+                return
+
+
+def serve_worker(host: str = "127.0.0.1", port: int = 7000, ready=None) -> None:
+    """
+    Processo worker: atende um coordenador por vez, até ser interrompido.
+    `ready` (ponta de um Pipe) recebe a porta real (útil com `port=0`).
+    """
+    socketserver.TCPServer.allow_reuse_address = True
+    with socketserver.TCPServer((host, port), _WorkerHandler) as server:
+        if ready is not None:
+            ready.send(server.server_address[1])
+            ready.close()
+        server.serve_forever()
+
+
+def spawn_local_workers(n: int, host: str = "127.0.0.1") -> tuple[list[str], list[Process]]:
+    """Sobe `n` workers neste nó (portas livres); devolve endereços e processos."""
+    nodes, procs = [], []
+    for _ in range(n):
+        parent, child = Pipe(duplex=False)
+        proc = Process(target=serve_worker, args=(host, 0, child), daemon=True)
+        proc.start()
+        nodes.append(f"{host}:{parent.recv()}")
+        procs.append(proc)
+    return nodes, procs
+
+
+# ---------------------------------------------------------------------- #
+class _Node:
+    """Conexão persistente com um worker e a última função enviada a ele."""
+    __slots__ = ("addr", "sock", "key")
+
+    def __init__(self, addr: tuple[str, int]):
+        self.addr = addr
+        self.sock: socket.socket | None = None
+        self.key: str | None = None
+
+    def connect(self, timeout: float) -> bool:
+        if self.sock is not None:
+            return True
+        try:
+            self.sock = socket.create_connection(self.addr, timeout=timeout)
+        except OSError:
+            return False
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.key = None
+        return True
+
+    def drop(self) -> None:
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+        self.sock = None
+        self.key = None
+
+
+class EvalCluster:
+    """
+    Coordenador: `starmap(fn, args)` com a mesma semântica de
+    `Pool.starmap`, executado pelos workers em `nodes` ('host:porta').
+
+      • shard_size → pedidos por shard (default: ~4 shards por nó)
+      • timeout    → segundos de espera por shard antes de desistir do nó
+    """
+
+    def __init__(self, nodes: Sequence[str | tuple[str, int]],
+                 shard_size: int | None = None, timeout: float = 120.0,
+                 connect_timeout: float = 5.0):
+        if not nodes:
+            raise ValueError("nodes não pode ser vazio")
+        self.nodes = [_Node(parse_node(n)) for n in nodes]
+        self.shard_size = shard_size
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        # shards, reenvios e nós ativos da última chamada
+        self.last_stats: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def close(self) -> None:
+        for node in self.nodes:
+            node.drop()
+
+    def __enter__(self) -> "EvalCluster":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ #
+    def starmap(self, fn: Callable, args: Sequence[tuple],
+                chunksize: int | None = None) -> list:
+        args = list(args)
+        if not args:
+            return []
+        size = chunksize or self.shard_size or math.ceil(len(args) / (4 * len(self.nodes)))
+        shards = [args[i:i + size] for i in range(0, len(args), size)]
+        blob = pickle.dumps(fn, protocol=pickle.HIGHEST_PROTOCOL)
+        key = hashlib.sha1(blob).hexdigest()
+
+        results: list = [None] * len(shards)
+        pending = deque(range(len(shards)))
+        state = {"remaining": len(shards), "alive": 0, "requeued": 0, "error": None}
+        cond = threading.Condition()
+
+        def run(node: _Node) -> None:
+            while True:
+                with cond:
+                    while not pending and state["remaining"] and state["error"] is None:
+                        cond.wait()
+                    if not state["remaining"] or state["error"] is not None:
+                        return
+                    sid = pending.popleft()
+                try:
+                    reply = self._call(node, key, blob, sid, shards[sid])
+                except (OSError, EOFError, pickle.UnpicklingError):
+                    node.drop()
+                    with cond:  # nó morto ou lento: o shard volta para a fila
+                        pending.append(sid)
+                        state["requeued"] += 1
+                        state["alive"] -= 1
+                        cond.notify_all()
+                    return
+                with cond:
+                    if reply[0] == "error":
+                        state["error"] = reply[2]
+                    elif results[sid] is None:
+                        results[sid] = reply[2]
+                        state["remaining"] -= 1
+                    cond.notify_all()
+
+        threads = []
+        for node in self.nodes:
+            if node.connect(self.connect_timeout):
+                state["alive"] += 1
+                threads.append(threading.Thread(target=run, args=(node,), daemon=True))
+        for t in threads:
+            t.start()
+
+        with cond:
+            while state["remaining"] and state["alive"] and state["error"] is None:
+                cond.wait()
+        for t in threads:
+            t.join()
+
+        self.last_stats = {"cluster_shards": len(shards),
+                           "cluster_requeued": state["requeued"],
+                           "cluster_nodes": state["alive"]}
+        if state["error"] is not None:
+            raise RuntimeError(f"erro em um worker de avaliação:\n{state['error']}")
+        if state["remaining"]:
+            raise ConnectionError(f"nenhum worker de avaliação respondeu "
+                                  f"({state['remaining']} shards pendentes)")
+        return [r for shard in results for r in shard]
+
+    def _call(self, node: _Node, key: str, blob: bytes, sid: int, shard: list) -> tuple:
+        """Manda um shard (e a função, se o nó ainda não a tem) e espera a resposta."""
+        sock = node.sock
+        sock.settimeout(self.timeout)
+        if node.key != key:
+            send_msg(sock, ("setup", key, blob))
+            node.key = key
+        block = np.stack([np.asarray(w) for w, _, _ in shard])
+        games = [g for _, g, _ in shard]
+        if all(g is games[0] for g in games):  # mesmas partidas → envia uma vez
+            games = games[0]
+        send_msg(sock, ("shard", sid, key, block, games, [s for _, _, s in shard]))
+        reply = recv_msg(sock)
+        if reply[1] != sid:
+            raise EOFError(f"resposta fora de ordem: shard {reply[1]}, esperado {sid}")
+        return reply
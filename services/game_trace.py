@@ -0,0 +1,225 @@
+"""
+Registro compacto das partidas de avaliação (rede × Minimax).
+
+Cada partida vira um registro de 11 bytes (`TRACE_DTYPE`): as casas
+jogadas em ordem (int8, -1 depois do último lance), o desfecho (códigos
+de `services.tic_tac_toe_simulator`) e se a partida usou máscara de casas
+ocupadas. O Minimax começa, então os lances pares são dele e os ímpares
+da rede; numa derrota por jogada ilegal, o último lance é a casa ocupada
+que a rede tentou.
+
+Destinos:
+  • RingTrace → buffer circular em memória com as últimas `capacity` partidas
+  • TraceLog  → arquivo binário só de acréscimo, gravado em blocos e lido
+                 de volta como memmap (`load_traces`)
+
+O `ScoreEvaluator` só registra quando tem um destino (`evaluator.trace`);
+sem ele, o custo é um teste de `None` por partida.
+
+`analyze` percorre os registros em blocos — milhões de partidas cabem em
+memória constante — e devolve um `TraceReport`: desfechos, duração das
+partidas, posições em que a rede mais decide (onde vai o esforço da
+avaliação) e as posições/casas que mais levam a jogada ilegal ou derrota.
+"""
+from services.tic_tac_toe_simulator import OUTCOMES, LOSE, WRONG_PLACE
+from dataclasses import dataclass, field
+from pathlib import Path
+from utils.board_codes import N_CODES, board_key, decode_many, encode_many
+import numpy as np
+
+TRACE_DTYPE = np.dtype([("moves", np.int8, 9), ("outcome", np.int8), ("masked", np.uint8)])
+
+# desfechos cuja jogada decisiva da rede é analisada em `TraceReport.failures`
+FAILURES = {"wrong_place": WRONG_PLACE, "lose": LOSE}
+
+
+def make_records(moves: np.ndarray, outcome: np.ndarray, masked: np.ndarray) -> np.ndarray:
+    """Registros de G partidas a partir de lances (G, 9), desfechos e máscaras (G,)."""
+    rec = np.empty(len(outcome), dtype=TRACE_DTYPE)
+    rec["moves"] = moves
+    rec["outcome"] = outcome
+    rec["masked"] = masked
+    return rec
+
+
+class TraceRecorder:
+    """Destino de registros de partidas."""
+
+    def append(self, moves: np.ndarray, outcome: np.ndarray, masked: np.ndarray) -> None:
+        self.write(make_records(moves, outcome, masked))
+
+    def write(self, records: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+
+class RingTrace(TraceRecorder):
+    """As últimas `capacity` partidas, em memória (as mais antigas são sobrescritas)."""
+
+    def __init__(self, capacity: int = 1 << 16):
+        if capacity < 1:
+            raise ValueError("capacity deve ser >= 1")
+        self.buffer = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self.total = 0  # partidas registradas desde o início
+
+    def __len__(self) -> int:
+        return min(self.total, len(self.buffer))
+
+    def write(self, records: np.ndarray) -> None:
+        cap = len(self.buffer)
+        records = records[-cap:]
+        pos = (self.total + np.arange(len(records))) % cap
+        self.buffer[pos] = records
+        self.total += len(records)
+
+    def records(self) -> np.ndarray:
+        """Partidas guardadas, da mais antiga para a mais recente."""
+        cap = len(self.buffer)
+        if self.total <= cap:
+            return self.buffer[:self.total].copy()
+        return np.roll(self.buffer, -(self.total % cap))
+
+
+class TraceLog(TraceRecorder):
+    """
+    Arquivo de registros só de acréscimo. Os registros ficam em um bloco
+    em memória e vão para o disco a cada `buffer` partidas (e em `flush`).
+    """
+
+    def __init__(self, path: str | Path, buffer: int = 1 << 14):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._block = np.empty(max(1, buffer), dtype=TRACE_DTYPE)
+        self._used = 0
+        self.total = 0
+
+    def write(self, records: np.ndarray) -> None:
+        while len(records):
+            n = min(len(records), len(self._block) - self._used)
+            self._block[self._used:self._used + n] = records[:n]
+            self._used += n
+            self.total += n
+            records = records[n:]
+            if self._used == len(self._block):
+                self.flush()
+
+    def flush(self) -> None:
+        if self._used:
+            with open(self.path, "ab") as f:
+                f.write(self._block[:self._used].tobytes())
+            self._used = 0
+
+
+def load_traces(path: str | Path) -> np.ndarray:
+    """Registros gravados por `TraceLog`, mapeados do disco (somente leitura)."""
+    path = Path(path)
+    if path.stat().st_size == 0:
+        return np.zeros(0, dtype=TRACE_DTYPE)
+    return np.memmap(path, dtype=TRACE_DTYPE, mode="r")
+
+
+# ---------------------------------------------------------------------- #
+def replay(record) -> list[np.ndarray]:
+    """Tabuleiros (9,) depois de cada lance de uma partida, do ponto de vista da rede (+1)."""
+    board = np.zeros(9, dtype=np.int8)
+    boards = []
+    for ply, cell in enumerate(record["moves"]):
+        if cell < 0 or board[cell] != 0:  # fim da partida ou jogada ilegal
+            break
+        board[cell] = 1 if ply % 2 else -1
+        boards.append(board.copy())
+    return boards
+
+
+@dataclass
+class TraceReport:
+    """Agregados de `analyze`."""
+    games: int = 0
+    outcomes: np.ndarray = field(default_factory=lambda: np.zeros((2, len(OUTCOMES)), np.int64))
+    lengths: np.ndarray = field(default_factory=lambda: np.zeros(10, np.int64))
+    visits: np.ndarray = field(default_factory=lambda: np.zeros(N_CODES, np.int64))
+    failures: dict = field(default_factory=lambda: {
+        kind: np.zeros(N_CODES * 9, np.int64) for kind in FAILURES})
+
+    def summary(self) -> dict:
+        """Totais em formato JSON: desfechos (sem/com máscara), lances por partida."""
+        moves = int(self.lengths @ np.arange(10))
+        return {
+            "games": self.games,
+            "outcomes": dict(zip(OUTCOMES, self.outcomes.sum(axis=0).tolist())),
+            "outcomes_unmasked": dict(zip(OUTCOMES, self.outcomes[0].tolist())),
+            "mean_moves": round(moves / self.games, 3) if self.games else None,
+            "net_positions": int((self.visits > 0).sum()),
+        }
+
+    def top_positions(self, k: int = 10) -> list[dict]:
+        """As `k` posições em que a rede mais decidiu."""
+        idx = np.argsort(self.visits, kind="stable")[::-1][:k]
+        idx = idx[self.visits[idx] > 0]
+        return [{"board": _board_text(code), "count": int(self.visits[code])}
+                for code in idx]
+
+    def top_failures(self, kind: str = "wrong_place", k: int = 10) -> list[dict]:
+        """
+        As `k` combinações (posição, casa) que mais levaram ao desfecho
+        `kind`: a jogada ilegal em "wrong_place", o último lance da rede
+        antes da vitória do Minimax em "lose".
+        """
+        counts = self.failures[kind]
+        idx = np.argsort(counts, kind="stable")[::-1][:k]
+        idx = idx[counts[idx] > 0]
+        return [{"board": _board_text(i // 9), "cell": int(i % 9), "count": int(counts[i])}
+                for i in idx]
+
+
+def _board_text(code: int) -> str:
+    return board_key(decode_many(np.array([code]))[0].reshape(3, 3))
+
+
+def analyze(records: np.ndarray, chunk: int = 1 << 20,
+            report: TraceReport | None = None) -> TraceReport:
+    """
+    Agrega `records` (array ou memmap de `TRACE_DTYPE`) em blocos de
+    `chunk` partidas. Passar `report` acumula sobre um relatório existente.
+    """
+    report = report or TraceReport()
+    for start in range(0, len(records), chunk):
+        _accumulate(report, np.asarray(records[start:start + chunk]))
+    return report
+
+
+def _accumulate(report: TraceReport, rec: np.ndarray) -> None:
+    moves = rec["moves"].astype(np.int64)
+    outcome = rec["outcome"].astype(np.int64)
+    masked = (rec["masked"] != 0).astype(np.int64)
+    n = (moves >= 0).sum(axis=1)
+    rows = np.arange(len(rec))
+
+    report.games += len(rec)
+    np.add.at(report.outcomes, (masked, outcome), 1)
+    report.lengths += np.bincount(n, minlength=10)
+
+    # lance decisivo da rede: o ilegal (último) ou o anterior à vitória do Minimax
+    decisive = {kind: np.where(outcome == code, n - 1 if code == WRONG_PLACE else n - 2, -1)
+                for kind, code in FAILURES.items()}
+
+    boards = np.zeros((len(rec), 9), dtype=np.int8)
+    for ply in range(9):
+        active = ply < n
+        if not active.any():
+            break
+        if ply % 2:  # vez da rede: posição antes do lance
+            codes = encode_many(boards[active])
+            report.visits += np.bincount(codes, minlength=N_CODES)
+            for kind, at in decisive.items():
+                hit = at[active] == ply
+                if hit.any():
+                    cells = moves[active, ply][hit]
+                    report.failures[kind] += np.bincount(codes[hit] * 9 + cells,
+                                                         minlength=N_CODES * 9)
+        # jogada ilegal não entra no tabuleiro
+        legal = active.copy()
+        legal[active] = boards[rows[active], moves[active, ply]] == 0
+        boards[rows[legal], moves[legal, ply]] = 1 if ply % 2 else -1
@@ -0,0 +1,371 @@
+"""
+Servidor de partidas contra uma rede treinada (asyncio, JSON lines).
+
+Carrega o modelo uma vez e atende muitas partidas simultâneas, por TCP
+(`serve_tcp`) ou pela entrada/saída padrão (`serve_stdio`). Cada linha
+recebida é um pedido JSON; cada resposta repete o campo "id" do pedido,
+pois pedidos da mesma conexão são atendidos em paralelo e as respostas
+podem sair fora de ordem.
+
+    {"op": "new", "ai_first": false}        → {"session": 3, "board": "........."}
+    {"op": "move", "session": 3, "cell": 4} → {"board": "...", "ai_move": 0, "result": null}
+    {"op": "predict", "board": "X...O...."} → {"move": 8}
+    {"op": "close", "session": 3}
+    {"op": "stats"}                          → latências p50/p99, tamanho médio dos lotes
+
+A rede joga com +1 (X) e o cliente com -1 (O). Pedidos de jogada que
+chegam juntos são agrupados pelo `MicroBatcher` em um único
+`predict_batch`, executado em uma thread para não travar o loop.
+
+    python main.py serve --model rnn.npz --port 8765
+"""
+from entities.neural_network import NeuralNetwork
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from utils.board_codes import board_key, decode_many, encode
+from utils.model_io import load_model
+from utils.utils import check_winner
+import numpy as np
+import asyncio
+import json
+import sys
+import time
+
+_RESULTS = {+1: "x", -1: "o", 0: "draw"}
+
+
+def parse_board(text) -> np.ndarray:
+    """'X..O.....' ou lista de 9 inteiros → array (9,) int8."""
+    if isinstance(text, str):
+        if len(text) != 9 or set(text) - set("XO."):
+            raise ValueError("board deve ter 9 caracteres entre X, O e .")
+        return np.array([{"X": 1, "O": -1, ".": 0}[ch] for ch in text], dtype=np.int8)
+    board = np.asarray(text, dtype=np.int8)
+    if board.shape != (9,) or np.abs(board).max(initial=0) > 1:
+        raise ValueError("board deve ter 9 valores entre -1, 0 e 1")
+    return board
+
+
+class MicroBatcher:
+    """
+    Junta pedidos de `predict` concorrentes: o primeiro pedido abre um
+    lote, que fecha após `max_wait` segundos ou com `max_batch` pedidos, e
+    a rede responde a todos em uma única passada vetorizada.
+    """
+    def __init__(self, net: NeuralNetwork, max_batch: int = 256,
+                 max_wait: float = 0.002):
+        self.net = net
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    async def predict(self, board: np.ndarray) -> int:
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((board, fut))
+        return await fut
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            boards = np.stack([b for b, _ in batch])
+            try:
+                moves = await loop.run_in_executor(
+                    self._executor, self.net.predict_batch, boards)
+            except Exception as e:  # repassa o erro a quem pediu
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+            for (_, fut), move in zip(batch, moves):
+                if not fut.done():
+                    fut.set_result(int(move))
+
+
+class SessionTable:
+    """
+    Estado compacto das partidas: por sessão, o código do tabuleiro
+    (base 3, `utils.board_codes`) em int16 e um byte de flags. Sessões
+    encerradas liberam a posição para reaproveitamento.
+    """
+    ACTIVE = 1
+
+    def __init__(self, capacity: int = 1024):
+        self.codes = np.zeros(capacity, dtype=np.int16)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self._free: list[int] = []
+        self._next = 0
+
+    def __len__(self) -> int:
+        return int((self.flags & self.ACTIVE).astype(bool).sum())
+
+    def open(self) -> int:
+        if self._free:
+            sid = self._free.pop()
+        else:
+            sid = self._next
+            self._next += 1
+            if sid == self.codes.size:
+                self.codes = np.concatenate([self.codes, np.zeros_like(self.codes)])
+                self.flags = np.concatenate([self.flags, np.zeros_like(self.flags)])
+        self.codes[sid] = 0
+        self.flags[sid] = self.ACTIVE
+        return sid
+
+    def check(self, sid) -> int:
+        if not isinstance(sid, int) or not 0 <= sid < self._next \
+                or not self.flags[sid] & self.ACTIVE:
+            raise KeyError(f"sessão inexistente: {sid}")
+        return sid
+
+    def close(self, sid: int) -> None:
+        self.flags[self.check(sid)] = 0
+        self._free.append(sid)
+
+    def board(self, sid: int) -> np.ndarray:
+        return decode_many(self.codes[self.check(sid):sid + 1])[0]
+
+    def set_board(self, sid: int, board: np.ndarray) -> None:
+        self.codes[self.check(sid)] = encode(board)
+
+
+class PlayServer:
+    """Regras das partidas + medição de latência; independente do transporte."""
+
+    def __init__(self, net: NeuralNetwork, max_batch: int = 256,
+                 max_wait: float = 0.002, latency_window: int = 10_000):
+        self.batcher = MicroBatcher(net, max_batch, max_wait)
+        self.sessions = SessionTable()
+        self.latencies: deque[float] = deque(maxlen=latency_window)
+        self.requests = 0
+        self._busy: set[int] = set()  # sessões com jogada em andamento
+
+    @classmethod
+    def from_model(cls, path: str, **kwargs) -> "PlayServer":
+        weights, topology = load_model(path)
+        return cls(NeuralNetwork.from_topology(topology, weights), **kwargs)
+
+    async def start(self) -> None:
+        self.batcher.start()
+
+    async def stop(self) -> None:
+        await self.batcher.stop()
+
+    # ------------------------------------------------------------------ #
+    async def handle(self, request: dict) -> dict:
+        """Atende um pedido já decodificado e devolve a resposta."""
+        t0 = time.perf_counter()
+        self.requests += 1
+        reply = {"id": request.get("id")}
+        try:
+            op = request.get("op")
+            if op == "new":
+                reply.update(await self._new(bool(request.get("ai_first", False))))
+            elif op == "move":
+                reply.update(await self._move(request.get("session"), request.get("cell")))
+                self.latencies.append(time.perf_counter() - t0)
+            elif op == "predict":
+                move = await self.batcher.predict(parse_board(request.get("board")))
+                reply["move"] = move
+                self.latencies.append(time.perf_counter() - t0)
+            elif op == "close":
+                self._close(request.get("session"))
+            elif op == "stats":
+                reply.update(self.stats())
+            else:
+                raise ValueError(f"op desconhecida: {op!r}")
+            reply["ok"] = True
+        except (KeyError, ValueError, TypeError) as e:
+            reply.update(ok=False, error=str(e).strip("'\""))
+        except Exception as e:  # falha interna (ex.: na rede): responde mesmo assim
+            reply.update(ok=False, error=f"erro interno: {type(e).__name__}: {e}")
+        return reply
+
+    async def _new(self, ai_first: bool) -> dict:
+        sid = self.sessions.open()
+        board = self.sessions.board(sid)
+        ai_move = None
+        if ai_first:
+            self._busy.add(sid)
+            try:
+                ai_move = await self.batcher.predict(board)
+            finally:
+                self._busy.discard(sid)
+            board[ai_move] = 1
+            self.sessions.set_board(sid, board)
+        return {"session": sid, "board": board_key(board.reshape(3, 3)), "ai_move": ai_move}
+
+    def _close(self, sid) -> None:
+        # com jogada pendente, a posição poderia ser reaberta por um `new` e
+        # receber o tabuleiro da partida antiga quando a resposta chegasse
+        self.sessions.check(sid)
+        if sid in self._busy:
+            raise ValueError("jogada desta sessão ainda em andamento")
+        self.sessions.close(sid)
+
+    async def _move(self, sid, cell) -> dict:
+        board = self.sessions.board(sid)
+        if sid in self._busy:
+            raise ValueError("jogada anterior desta sessão ainda em andamento")
+        if check_winner(board.reshape(3, 3)) is not None:
+            raise ValueError("partida encerrada")
+        if not isinstance(cell, int) or not 0 <= cell < 9 or board[cell] != 0:
+            raise ValueError(f"casa inválida: {cell}")
+
+        board[cell] = -1
+        result = check_winner(board.reshape(3, 3))
+        ai_move = None
+        if result is None:
+            self._busy.add(sid)
+            try:
+                ai_move = await self.batcher.predict(board)
+            finally:
+                self._busy.discard(sid)
+            board[ai_move] = 1
+            result = check_winner(board.reshape(3, 3))
+        self.sessions.set_board(sid, board)
+        return {"board": board_key(board.reshape(3, 3)), "ai_move": ai_move,
+                "result": _RESULTS.get(result)}
+
+    def stats(self) -> dict:
+        lat = np.array(self.latencies) * 1000
+        b = self.batcher
+        return {
+            "requests": self.requests,
+            "sessions": len(self.sessions),
+            "p50_ms": float(np.percentile(lat, 50)) if lat.size else None,
+            "p99_ms": float(np.percentile(lat, 99)) if lat.size else None,
+            "batches": b.batches,
+            "mean_batch": b.items / b.batches if b.batches else None,
+        }
+
+    # ------------------------------------------------------------------ #
+    async def serve_stream(self, reader: asyncio.StreamReader, write) -> None:
+        """Lê pedidos linha a linha e responde cada um assim que fica pronto."""
+        pending: set[asyncio.Task] = set()
+
+        async def answer(line: bytes) -> None:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("pedido deve ser um objeto JSON")
+            except ValueError as e:
+                reply = {"id": None, "ok": False, "error": f"JSON inválido: {e}"}
+            else:
+                reply = await self.handle(request)
+            await write((json.dumps(reply) + "\n").encode())
+
+        while line := await reader.readline():
+            if line.strip():
+                task = asyncio.create_task(answer(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+
+
+async def serve_tcp(server: PlayServer, host: str = "127.0.0.1", port: int = 8765,
+                    ready: asyncio.Future | None = None) -> None:
+    """Aceita conexões TCP até ser cancelado; `ready` recebe a porta real."""
+    async def client(reader, writer):
+        async def write(data: bytes) -> None:
+            writer.write(data)
+            await writer.drain()
+        try:
+            await server.serve_stream(reader, write)
+        finally:
+            writer.close()
+
+    await server.start()
+    tcp = await asyncio.start_server(client, host, port)
+    if ready is not None:
+        ready.set_result(tcp.sockets[0].getsockname()[1])
+    try:
+        async with tcp:
+            await tcp.serve_forever()
+    finally:
+        await server.stop()
+
+
+async def serve_stdio(server: PlayServer) -> None:
+    """Um cliente pela entrada/saída padrão (ex.: processo filho de um bot)."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    async def write(data: bytes) -> None:
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+    await server.start()
+    try:
+        await server.serve_stream(reader, write)
+    finally:
+        await server.stop()
+
+
+class PlayClient:
+    """Cliente TCP assíncrono; vários pedidos podem estar em voo ao mesmo tempo."""
+
+    def __init__(self):
+        self._reader = self._writer = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._listener: asyncio.Task | None = None
+
+    async def connect(self, host: str = "127.0.0.1", port: int = 8765) -> "PlayClient":
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._listener = asyncio.create_task(self._listen())
+        return self
+
+    async def _listen(self) -> None:
+        while line := await self._reader.readline():
+            reply = json.loads(line)
+            fut = self._pending.pop(reply.get("id"), None)
+            if fut is not None and not fut.done():
+                fut.set_result(reply)
+
+    async def request(self, op: str, **fields) -> dict:
+        self._next_id += 1
+        rid = self._next_id
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[rid] = fut
+        self._writer.write((json.dumps({"id": rid, "op": op, **fields}) + "\n").encode())
+        await self._writer.drain()
+        return await fut
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        if self._listener is not None:
+            self._listener.cancel()
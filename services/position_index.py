@@ -0,0 +1,93 @@
+"""
+Índice das posições em que a rede decide e memória de jogadas por rede.
+
+Na avaliação o Minimax (-1) começa, então a rede (+1) só joga em
+tabuleiros com um O a mais que X, sem linha completa e com casa livre:
+são 2097 posições (`net_positions`). Durante uma avaliação a rede não
+muda, e as mesmas posições — as aberturas, sobretudo — se repetem ao
+longo das `n_games` partidas.
+
+`MoveMemo` embrulha a rede com a mesma interface (`predict`,
+`predict_batch`) e guarda a jogada de cada posição, por máscara:
+  • lazy    → calcula cada posição distinta na primeira vez que aparece
+  • upfront → `prefill` calcula todas as posições de uma vez, em uma
+               passada vetorizada; o resto da avaliação é só consulta
+"""
+from entities.neural_network import NeuralNetwork
+from services.tic_tac_toe_simulator import winners
+from utils.board_codes import N_CODES, all_boards, encode, encode_many
+import numpy as np
+
+_UNKNOWN = -2  # jogada ainda não calculada (-1 = tabuleiro cheio)
+
+_POSITIONS: tuple[np.ndarray, np.ndarray] | None = None
+
+
+def _positions() -> tuple[np.ndarray, np.ndarray]:
+    global _POSITIONS
+    if _POSITIONS is None:
+        b = all_boards()
+        x, o = (b == 1).sum(axis=1), (b == -1).sum(axis=1)
+        won = winners(b) != 0
+        codes = np.flatnonzero((o == x + 1) & ~won & (x + o < 9))
+        _POSITIONS = codes, b[codes]
+    return _POSITIONS
+
+
+def net_positions() -> np.ndarray:
+    """Códigos das posições em que a rede joga na avaliação, ordenados."""
+    return _positions()[0]
+
+
+def net_position_boards() -> np.ndarray:
+    """Tabuleiros (posições, 9) de `net_positions`, na mesma ordem."""
+    return _positions()[1]
+
+
+class MoveMemo:
+    """Rede + tabela de jogadas já calculadas, shape (2, 3**9): [máscara, código]."""
+
+    def __init__(self, net: NeuralNetwork):
+        self.net = net
+        self.table = np.full((2, N_CODES), _UNKNOWN, dtype=np.int8)
+        self.lookups = 0    # jogadas pedidas
+        self.misses = 0     # posições calculadas sob demanda (modo lazy)
+        self.forwarded = 0  # tabuleiros que passaram pela rede
+
+    @property
+    def hits(self) -> int:
+        """Consultas atendidas pela tabela (no upfront, todas)."""
+        return self.lookups - self.misses
+
+    def prefill(self, masks=(False, True)) -> "MoveMemo":
+        """Modo upfront: calcula todas as `net_positions` para cada máscara."""
+        codes, boards = _positions()
+        for mask in masks:
+            self.table[int(mask), codes] = self.net.predict_batch(boards, bool(mask))
+            self.forwarded += codes.size
+        return self
+
+    def predict(self, board: np.ndarray, mask_invalid: bool = True) -> int:
+        code = encode(board)
+        row = self.table[int(mask_invalid)]
+        self.lookups += 1
+        move = row[code]
+        if move == _UNKNOWN:
+            move = row[code] = self.net.predict(board, mask_invalid)
+            self.forwarded += 1
+            self.misses += 1
+        return int(move)
+
+    def predict_batch(self, boards: np.ndarray, mask_invalid: bool = True) -> np.ndarray:
+        codes = encode_many(boards)
+        row = self.table[int(mask_invalid)]
+        self.lookups += codes.size
+        moves = row[codes]
+        miss = moves == _UNKNOWN
+        if miss.any():
+            new, first = np.unique(codes[miss], return_index=True)
+            row[new] = self.net.predict_batch(np.asarray(boards)[miss][first], mask_invalid)
+            self.forwarded += new.size
+            self.misses += new.size
+            moves = row[codes]
+        return moves.astype(np.int64)
@@ -0,0 +1,90 @@
+"""
+Respostas especulativas da IA enquanto o humano pensa.
+
+Depois que a IA joga, uma thread calcula a resposta dela para CADA casa
+livre em que o humano pode jogar — pelo Minimax, uma posição por vez, ou
+pela rede, todas numa única passada em lote (`predict_batch`). Quando o
+clique chega, `take` devolve a resposta pronta; se aquela posição ainda
+não foi calculada, calcula na hora, como antes.
+
+Cada `speculate` (e `cancel`, no reset da partida) abre uma nova época:
+a thread anterior para no próximo tabuleiro e o que ela ainda entregar
+é descartado, então uma especulação velha nunca responde a outra partida.
+"""
+from typing import Any, Callable
+import numpy as np
+import threading
+
+
+class ReplySpeculator:
+    """
+    • reply_fn → tabuleiro (3, 3) depois do lance humano → resposta da IA
+    • batch_fn → opcional, tabuleiros (N, 9) → N respostas de uma vez
+    • human    → valor da peça do humano no tabuleiro (default -1, O)
+    """
+
+    def __init__(self, reply_fn: Callable[[np.ndarray], Any],
+                 batch_fn: Callable[[np.ndarray], Any] | None = None,
+                 human: int = -1):
+        self.reply_fn = reply_fn
+        self.batch_fn = batch_fn
+        self.human = human
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._replies: dict[bytes, Any] = {}
+
+    @staticmethod
+    def _key(board: np.ndarray) -> bytes:
+        return np.asarray(board, dtype=np.int8).tobytes()
+
+    def cancel(self) -> None:
+        """Descarta as respostas calculadas e interrompe a thread em curso."""
+        with self._lock:
+            self._epoch += 1
+            self._replies = {}
+
+    def speculate(self, board: np.ndarray) -> None:
+        """Começa a calcular as respostas a todos os lances humanos em `board`."""
+        board = np.array(board, dtype=int).reshape(3, 3)
+        self.cancel()
+        with self._lock:
+            epoch = self._epoch
+        threading.Thread(target=self._run, args=(board, epoch), daemon=True).start()
+
+    def _run(self, board: np.ndarray, epoch: int) -> None:
+        candidates = []
+        for cell in np.flatnonzero(board.ravel() == 0):
+            after = board.copy()
+            after.flat[cell] = self.human
+            candidates.append(after)
+        if not candidates:
+            return
+
+        if self.batch_fn is not None:
+            replies = self.batch_fn(np.stack([b.ravel() for b in candidates]))
+            self._store(epoch, zip(candidates, replies))
+            return
+        for after in candidates:
+            if self._epoch != epoch:  # partida reiniciada ou lance já feito
+                return
+            self._store(epoch, [(after, self.reply_fn(after))])
+
+    def _store(self, epoch: int, pairs) -> None:
+        with self._lock:
+            if self._epoch == epoch:
+                self._replies.update((self._key(b), r) for b, r in pairs)
+
+    def take(self, board: np.ndarray) -> Any:
+        """Resposta da IA ao tabuleiro `board` (já com o lance humano)."""
+        board = np.asarray(board).reshape(3, 3)
+        with self._lock:
+            reply = self._replies.get(self._key(board))
+            self._epoch += 1  # a especulação desta vez acabou
+            self._replies = {}
+        if reply is None:
+            self.misses += 1
+            return self.reply_fn(board.copy())
+        self.hits += 1
+        return reply
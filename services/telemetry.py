@@ -0,0 +1,172 @@
+"""
+Telemetria do treino em arquivos locais, para dashboards.
+
+`Telemetry` recebe o dicionário de estatísticas de cada geração (o mesmo
+de `on_generation`), acrescenta partidas por segundo e memória do
+processo, achata os campos numéricos (`outcomes.win`, `phase_seconds.
+evaluate`, `score_quantiles.p50`, ...) e grava em um de dois formatos:
+
+  • jsonl → uma linha JSON por geração; o arquivo gira ao passar de
+            `max_bytes` (`run.jsonl` → `run.jsonl.1` → ..., até `backups`)
+  • prom  → formato texto do Prometheus (node_exporter textfile
+            collector): o arquivo inteiro é reescrito, de forma atômica,
+            com o último valor de cada métrica
+
+As escritas são agrupadas: o buffer só vai para o disco a cada
+`flush_every` gerações ou `flush_seconds` segundos (e no `close`), então
+o custo no laço de treino é montar um dicionário.
+
+    python main.py train --telemetry runs/metrics.prom --telemetry-format prom
+"""
+from pathlib import Path
+import numbers
+import json
+import math
+import os
+import re
+import time
+
+FORMATS = ("jsonl", "prom")
+
+
+def flatten(stats: dict, prefix: str = "") -> dict[str, float]:
+    """Campos numéricos de `stats`, com dicionários aninhados unidos por '.'."""
+    out: dict[str, float] = {}
+    for key, value in stats.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            out.update(flatten(value, name + "."))
+        elif isinstance(value, bool):
+            out[name] = float(value)
+        elif isinstance(value, numbers.Real) and math.isfinite(value):
+            out[name] = value if isinstance(value, int) else float(value)
+    return out
+
+
+def rss_bytes() -> int | None:
+    """Memória residente do processo (Linux: atual; outros Unix: pico)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+class Telemetry:
+    """Coletor chamável: `telemetry(stats)` a cada geração, `close()` no fim."""
+
+    def __init__(self, path: str | Path, fmt: str = "jsonl",
+                 max_bytes: int = 50 * 2 ** 20, backups: int = 3,
+                 flush_every: int = 10, flush_seconds: float = 5.0,
+                 prefix: str = "tictactoe_"):
+        if fmt not in FORMATS:
+            raise ValueError(f"fmt deve ser um de {FORMATS}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_every = max(1, flush_every)
+        self.flush_seconds = flush_seconds
+        self.prefix = prefix
+        self.records = 0
+
+        self._lines: list[str] = []                        # jsonl pendente
+        self._latest: dict[tuple, float] = {}              # prom: (métrica, rótulos) → valor
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._last: dict[str | None, tuple[float, int]] = {}  # ilha → (elapsed, partidas)
+
+    def __call__(self, stats: dict) -> None:
+        self.record(stats)
+
+    # ------------------------------------------------------------------ #
+    def _derive(self, stats: dict) -> dict:
+        """Métricas que não vêm prontas nas estatísticas da geração."""
+        extra: dict = {"time": time.time()}
+        island = stats.get("island")
+        elapsed, played = stats.get("elapsed"), stats.get("games_played")
+        if elapsed is not None and played is not None:
+            prev_elapsed, _ = self._last.get(island, (0.0, 0))
+            dt = elapsed - prev_elapsed
+            extra["games_per_sec"] = played / dt if dt > 0 else None
+            self._last[island] = (elapsed, played)
+        extra["rss_bytes"] = rss_bytes()
+        return extra
+
+    def record(self, stats: dict) -> None:
+        metrics = flatten({**stats, **self._derive(stats)})
+        self.records += 1
+        if self.fmt == "jsonl":
+            self._lines.append(json.dumps(metrics))
+        else:
+            labels = (("island", str(stats["island"])),) if "island" in stats else ()
+            for name, value in metrics.items():
+                self._latest[(name, labels)] = value
+        self._pending += 1
+        if (self._pending >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    # ------------------------------------------------------------------ #
+    def flush(self) -> None:
+        if self.fmt == "jsonl":
+            self._flush_jsonl()
+        else:
+            self._flush_prom()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._pending:
+            self.flush()
+
+    def __enter__(self) -> "Telemetry":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _rotate(self) -> None:
+        for k in range(self.backups - 1, 0, -1):
+            src = self.path.with_name(f"{self.path.name}.{k}")
+            if src.exists():
+                os.replace(src, self.path.with_name(f"{self.path.name}.{k + 1}"))
+        if self.backups > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+    def _flush_jsonl(self) -> None:
+        if not self._lines:
+            return
+        data = "\n".join(self._lines) + "\n"
+        self._lines = []
+        if self.path.exists() and self.path.stat().st_size + len(data) > self.max_bytes:
+            self._rotate()
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(data)
+
+    def _metric_name(self, name: str) -> str:
+        return self.prefix + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+    def _flush_prom(self) -> None:
+        by_name: dict[str, list[str]] = {}
+        for (name, labels), value in self._latest.items():
+            metric = self._metric_name(name)
+            lbl = ",".join(f'{k}="{v}"' for k, v in labels)
+            by_name.setdefault(metric, []).append(
+                f"{metric}{{{lbl}}} {value!r}" if lbl else f"{metric} {value!r}")
+        lines = []
+        for metric in sorted(by_name):
+            lines.append(f"# TYPE {metric} gauge")
+            lines.extend(by_name[metric])
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
@@ -0,0 +1,179 @@
+"""
+Simulação em lote ("lockstep") de partidas rede × MinimaxTrainer.
+
+Todas as partidas avançam juntas, lance a lance: a cada passo, os
+tabuleiros ainda em jogo formam um array (G, 9); o adversário responde a
+todos com `MinimaxTrainer.move_batch` e cada rede decide para as suas
+partidas com `NeuralNetwork.predict_batch`. Assim uma população inteira
+joga com algumas dezenas de operações NumPy por lance, em vez de um laço
+Python por partida.
+
+As regras são as de `ScoreEvaluator._play_one`: o Minimax (-1) começa, a
+rede (+1) perde a partida ao jogar em casa ocupada, e a pontuação fica a
+cargo de quem chama — aqui só se contam lances válidos e o desfecho.
+
+`play_match` faz o mesmo entre duas políticas quaisquer (torneios).
+"""
+from adapters.minimax_trainer import MinimaxTrainer
+from entities.neural_network import NeuralNetwork
+from dataclasses import dataclass
+from typing import Sequence
+from utils.utils import WIN_LINES
+import numpy as np
+
+# desfechos de uma partida, do ponto de vista da rede
+WIN, DRAW, LOSE, WRONG_PLACE = 0, 1, 2, 3
+OUTCOMES = ("win", "draw", "lose", "wrong_place")
+
+# linhas vencedoras como índices no vetor de 9 casas, shape (8, 3)
+LINES = np.array([[r * 3 + c for r, c in line] for line in WIN_LINES])
+
+
+def winners(boards: np.ndarray) -> np.ndarray:
+    """
+    Vencedor de cada tabuleiro (N, 9): +1, -1 ou 0 (nenhuma linha
+    completa). Uma linha do +1 tem precedência, como em
+    `utils.check_winner`.
+    """
+    sums = np.asarray(boards)[:, LINES].sum(axis=2, dtype=np.int64)
+    return np.where((sums == 3).any(axis=1), 1,
+                    np.where((sums == -3).any(axis=1), -1, 0)).astype(np.int8)
+
+
+@dataclass
+class BatchResult:
+    """Resultado de G partidas: lances válidos da rede e desfecho (códigos acima)."""
+    valid_moves: np.ndarray  # (G,) int
+    outcome: np.ndarray      # (G,) int
+    moves: np.ndarray | None = None  # (G, 9) int8, casas em ordem (só com `record`)
+
+    def outcome_counts(self) -> np.ndarray:
+        """Quantas partidas terminaram em cada desfecho, shape (4,)."""
+        return np.bincount(self.outcome, minlength=len(OUTCOMES))
+
+
+def play_lockstep(
+    nets: Sequence[NeuralNetwork],
+    owner: np.ndarray,
+    p_minimax: np.ndarray,
+    mask_invalid: np.ndarray,
+    draws: np.ndarray | None = None,
+    rng: np.random.RandomState | None = None,
+    record: bool = False,
+) -> BatchResult:
+    """
+    Joga G partidas em paralelo.
+
+    • nets         → redes participantes
+    • owner        → (G,) índice em `nets` da rede de cada partida
+    • p_minimax    → (G,) probabilidade de lance ótimo do adversário
+    • mask_invalid → (G,) bool, máscara de casas ocupadas na rede
+    • draws        → (G, T, 2) sorteios (moeda, casa) de cada lance do
+                     adversário (cenários CRN); sem eles, vêm de `rng`
+    • record       → guarda as casas jogadas (ver `services.game_trace`)
+    """
+    owner = np.asarray(owner)
+    p_minimax = np.asarray(p_minimax, dtype=float)
+    mask_invalid = np.asarray(mask_invalid, dtype=bool)
+    n = owner.size
+    if rng is None:
+        rng = np.random
+
+    boards = np.zeros((n, 9), dtype=np.int8)
+    valid = np.zeros(n, dtype=np.int64)
+    outcome = np.full(n, -1, dtype=np.int64)
+    live = np.arange(n)
+    trace = np.full((n, 9), -1, dtype=np.int8) if record else None
+    opponent = MinimaxTrainer()
+
+    for step in range(10):
+        if live.size == 0:
+            break
+        b = boards[live]
+
+        if step % 2 == 0:                                   # ----- Minimax -----
+            t = step // 2
+            coins = draws[live, t, 0] if draws is not None else None
+            picks = draws[live, t, 1] if draws is not None else None
+            moves = opponent.move_batch(b, p_minimax[live], rng, coins, picks)
+
+            full = moves < 0                                # tabuleiro cheio → empate
+            outcome[live[full]] = DRAW
+            live, b, moves = live[~full], b[~full], moves[~full]
+            b[np.arange(live.size), moves] = -1
+            if trace is not None:
+                trace[live, step] = moves
+
+        else:                                               # ----- RN -----
+            moves = np.empty(live.size, dtype=np.int64)
+            for k in np.unique(owner[live]):
+                sel = owner[live] == k
+                for mask in (True, False):
+                    part = sel & (mask_invalid[live] == mask)
+                    if part.any():
+                        moves[part] = nets[k].predict_batch(b[part], mask)
+
+            full = moves < 0                                # predict devolveu -1
+            outcome[live[full]] = DRAW
+            if trace is not None:                           # inclui a jogada ilegal
+                trace[live[~full], step] = moves[~full]
+            occupied = ~full
+            occupied[~full] = b[~full, moves[~full]] != 0
+            outcome[live[occupied]] = WRONG_PLACE
+
+            ok = ~(full | occupied)
+            live, b, moves = live[ok], b[ok], moves[ok]
+            b[np.arange(live.size), moves] = 1
+            valid[live] += 1
+
+        boards[live] = b
+
+        # ----- término: só quem acabou de jogar pode ter vencido -----
+        won = winners(b) != 0
+        drawn = ~won & (b != 0).all(axis=1)
+        outcome[live[won]] = WIN if step % 2 else LOSE
+        outcome[live[drawn]] = DRAW
+        live = live[~(won | drawn)]
+
+    return BatchResult(valid, outcome, trace)
+
+
+def play_match(policy_x, policy_o, n_games: int,
+               rng: np.random.RandomState | None = None) -> np.ndarray:
+    """
+    Joga `n_games` partidas entre duas políticas em lockstep; X começa.
+
+    Uma política é qualquer `fn(boards, rng) -> casas` que recebe os
+    tabuleiros (M, 9) do ponto de vista de quem joga (+1 = ela mesma) e
+    devolve uma casa por tabuleiro. Jogar em casa ocupada (ou fora do
+    tabuleiro) perde a partida.
+
+    Devolve o vencedor de cada partida: +1 (X), -1 (O) ou 0 (empate).
+    """
+    if rng is None:
+        rng = np.random
+    boards = np.zeros((n_games, 9), dtype=np.int8)
+    winner = np.zeros(n_games, dtype=np.int8)
+    live = np.arange(n_games)
+
+    for step in range(9):
+        if live.size == 0:
+            break
+        side = 1 if step % 2 == 0 else -1
+        policy = policy_x if side == 1 else policy_o
+        b = boards[live]
+        moves = np.asarray(policy(b * side, rng), dtype=np.int64)
+
+        bad = (moves < 0) | (moves > 8)
+        bad[~bad] = b[~bad, moves[~bad]] != 0
+        winner[live[bad]] = -side
+        live, b, moves = live[~bad], b[~bad], moves[~bad]
+
+        b[np.arange(live.size), moves] = side
+        boards[live] = b
+
+        won = winners(b) == side
+        winner[live[won]] = side
+        live = live[~won]
+
+    return winner
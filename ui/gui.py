@@ -1,17 +1,20 @@
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from usecases.genetic_algorithm import GeneticAlgorithm
 from adapters.minimax_trainer import MinimaxTrainer
 from entities.neural_network import NeuralNetwork
 from adapters.minimax_player import MinimaxPlayer
+from minimax.solution_table import load_solution_table
+from services.reply_speculator import ReplySpeculator
 from tkinter import ttk, messagebox
-from matplotlib.figure import Figure
+from utils.model_io import find_model, load_model, save_model
 from utils.utils import WIN_LINES
 import tkinter as tk
 import numpy as np
 import threading
 import hashlib
+import random
 import time
-import os
+
+# Rede salva pelo treino da GUI (pesos + topologia; aceita o .npy antigo)
+BEST_NETWORK = "best_network"
 
 class FrameJogarVsMinimax(tk.Frame):
     def __init__(self, master, voltar_callback):
@@ -21,6 +24,7 @@ class FrameJogarVsMinimax(tk.Frame):
         self.board = np.zeros((3, 3), dtype=int)
         self.buttons = [[None for _ in range(3)] for _ in range(3)]
         self.minimax = None
+        self.speculator = None  # respostas do Minimax calculadas durante a vez do humano
         self.dificuldade = None
         self.dificuldade_frame = None
         self.turno_var = tk.StringVar(value="")
@@ -28,6 +32,8 @@ class FrameJogarVsMinimax(tk.Frame):
         self.turno_label.pack(pady=4)
         self.create_widgets()
         self.create_dificuldade_buttons()
+        # tabela de soluções aberta antes do primeiro clique
+        load_solution_table()
 
     def create_widgets(self):
         self.turno_var.set("Turno: Humano (O)")
@@ -58,6 +64,11 @@ class FrameJogarVsMinimax(tk.Frame):
             self.minimax = MinimaxTrainer(p_minimax=0.5)
         else:
             self.minimax = MinimaxPlayer()
+        # só o Minimax puro é especulado: o MinimaxTrainer sorteia com um RNG
+        # que a thread e o Tk usariam ao mesmo tempo, e os sorteios vistos
+        # pelo jogador dependeriam da ordem entre as threads
+        self.speculator = (ReplySpeculator(lambda b: self.minimax.move(b.tolist()))
+                           if isinstance(self.minimax, MinimaxPlayer) else None)
         if self.dificuldade_frame:
             self.dificuldade_frame.destroy()
         self.btn_reiniciar.pack(pady=5)
@@ -75,18 +86,22 @@ class FrameJogarVsMinimax(tk.Frame):
         self.update_buttons()
         winner = self.check_winner()
         if winner is not None:
+            if self.speculator:
+                self.speculator.cancel()
             self.show_result(winner)
             return
         # Jogada do Minimax (X)
         if isinstance(self.minimax, MinimaxTrainer):
-            import random
             modo = "Aleatório"
             if random.random() <= self.minimax.p_minimax:
                 modo = "Minimax"
             self.turno_var.set(f"Turno: {modo} (X)")
         else:
             self.turno_var.set("Turno: Minimax (X)")
-        row, col = self.minimax.move(self.board.tolist())
+        if self.speculator:
+            row, col = self.speculator.take(self.board)  # pronta se já especulada
+        else:
+            row, col = self.minimax.move(self.board.tolist())
         if row == -1 or self.board[row, col] != 0:
             winner = self.check_winner()
             self.show_result(winner)
@@ -96,6 +111,8 @@ class FrameJogarVsMinimax(tk.Frame):
         winner = self.check_winner()
         if winner is not None:
             self.show_result(winner)
+        elif self.speculator:
+            self.speculator.speculate(self.board)
         self.turno_var.set("Turno: Humano (O)")
 
     def update_buttons(self):
@@ -135,6 +152,8 @@ class FrameJogarVsMinimax(tk.Frame):
     def reset_board(self):
         self.board = np.zeros((3, 3), dtype=int)
         self.update_buttons()
+        if self.speculator:  # descarta a especulação da partida anterior
+            self.speculator.speculate(self.board)
         self.turno_var.set("Turno: Humano (O)")
 
 class FrameTreinarRede(tk.Frame):
@@ -223,6 +242,8 @@ class FrameTreinarRede(tk.Frame):
         threading.Thread(target=self.run_treino, daemon=True).start()
 
     def run_treino(self):
+        from usecases.genetic_algorithm import GeneticAlgorithm
+
         try:
             pop = self.pop_var.get()
             gens = self.gen_var.get()
@@ -236,6 +257,8 @@ class FrameTreinarRede(tk.Frame):
             self.mean_fitness = []
             for g in range(1, gens + 1):
                 pop_list = ga._init_pop() if g == 1 else pop_list
+                plan = ga.schedule.plan(g, gens, games)
+                ga.evaluator.plan = plan
                 for c in pop_list:
                     c.score = ga.evaluator.evaluate(c.weights_vector)
                 pop_list.sort(key=lambda c: c.score, reverse=True)
@@ -255,14 +278,14 @@ class FrameTreinarRede(tk.Frame):
                     while p2 is p1:
                         p2 = ga._select_tournament(pop_list)
                     child = ga._crossover(p1, p2)
-                    if g > round(gens * 0.3):
-                        ga._mutate(child)
+                    if plan.mut_rate > 0:
+                        ga._mutate(child, rate=plan.mut_rate)
                     next_pop.append(child)
                 pop_list = next_pop
                 self.update_progress(g, gens)
-            np.save("best_network.npy", best_weights)
+            saved = save_model(BEST_NETWORK, best_weights, ga.topology)
             elapsed = time.time() - start_time
-            self.status_var.set("Treinamento concluído! Melhor rede salva em best_network.npy")
+            self.status_var.set(f"Treinamento concluído! Melhor rede salva em {saved}")
             self.plot_fitness()
             info = (
                 f"\nResumo do Treinamento:\n"
@@ -271,7 +294,7 @@ class FrameTreinarRede(tk.Frame):
                 f"- Shape dos pesos: {best_weights.shape}\n"
                 f"- Tempo total: {elapsed:.1f} segundos\n"
                 f"- Parâmetros: População={pop}, Gerações={gens}, Partidas/Indivíduo={games}\n"
-                f"\nArquivo salvo: best_network.npy"
+                f"\nArquivo salvo: {saved}"
             )
             self.info_var.set(info)
             self.btn_jogar.config(state="normal")
@@ -293,6 +316,10 @@ class FrameTreinarRede(tk.Frame):
         self.clear_canvas()
         if not self.fitness_history:
             return
+        # matplotlib só é carregado quando há gráfico para desenhar
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
         fig = Figure(figsize=(3.5,2.5), dpi=100)
         ax = fig.add_subplot(111)
         # Scatter de todos os fitness (ruim)
@@ -314,14 +341,12 @@ class FrameTreinarRede(tk.Frame):
 
     def testar_acuracia(self, modo):
         try:
-            weights = np.load("best_network.npy")
-            nn = NeuralNetwork(9, 9, 9, weights)
+            weights, topology = load_model(BEST_NETWORK)
+            nn = NeuralNetwork.from_topology(topology, weights)
             if modo == 'difícil':
-                from adapters.minimax_player import MinimaxPlayer
                 adversario = MinimaxPlayer()
                 adversario_nome = "Minimax Difícil"
             else:
-                from adapters.minimax_trainer import MinimaxTrainer
                 adversario = MinimaxTrainer(p_minimax=0.5)
                 adversario_nome = "Minimax Médio"
             total = 100
@@ -359,7 +384,6 @@ class FrameTreinarRede(tk.Frame):
             taxa_vit = vitorias/total*100
             taxa_emp = empates/total*100
             taxa_der = derrotas/total*100
-            import hashlib
             sha = hashlib.sha256(weights.tobytes()).hexdigest()[:12]
             preview = ", ".join(f"{v:.3f}" for v in weights[:5])
             resumo = (
@@ -383,8 +407,8 @@ class FrameTreinarRede(tk.Frame):
     def show(self):
         self.pack(expand=True)
         if hasattr(self, 'btn_testar_dificil') and self.btn_testar_dificil:
-            self.btn_testar_dificil.config(state="normal" if os.path.exists("best_network.npy") else "disabled")
-            self.btn_testar_medio.config(state="normal" if os.path.exists("best_network.npy") else "disabled")
+            self.btn_testar_dificil.config(state="normal" if find_model(BEST_NETWORK) else "disabled")
+            self.btn_testar_medio.config(state="normal" if find_model(BEST_NETWORK) else "disabled")
 
 class FrameJogarVsRedeTreinada(tk.Frame):
     def __init__(self, master, voltar_callback):
@@ -394,6 +418,7 @@ class FrameJogarVsRedeTreinada(tk.Frame):
         self.board = np.zeros((3, 3), dtype=int)
         self.buttons = [[None for _ in range(3)] for _ in range(3)]
         self.nn = None
+        self.speculator = None  # respostas da rede calculadas durante a vez do humano
         self.humano_comeca = True
         self.turno_var = tk.StringVar(value="")
         self.turno_label = tk.Label(self, textvariable=self.turno_var, font=("Arial", 12, "bold"), fg="#333")
@@ -432,18 +457,21 @@ class FrameJogarVsRedeTreinada(tk.Frame):
 
     def load_network(self):
         try:
-            if not os.path.exists("best_network.npy"):
-                messagebox.showerror("Erro", "Arquivo best_network.npy não encontrado!\nTreine a rede antes de jogar contra ela.")
+            if not find_model(BEST_NETWORK):
+                messagebox.showerror("Erro", "Arquivo best_network.npz não encontrado!\nTreine a rede antes de jogar contra ela.")
                 self.voltar_callback()
                 return False
-            weights = np.load("best_network.npy")
-            self.nn = NeuralNetwork(9, 9, 9, weights)
+            weights, topology = load_model(BEST_NETWORK)
+            self.nn = NeuralNetwork.from_topology(topology, weights)
+            self.speculator = ReplySpeculator(
+                lambda b: self.nn.predict(b.flatten()),
+                batch_fn=lambda boards: self.nn.predict_batch(boards).tolist())
             # Exibir resumo da rede carregada
             sha = hashlib.sha256(weights.tobytes()).hexdigest()[:12]
             preview = ", ".join(f"{v:.3f}" for v in weights[:5])
             info = (
                 f"Rede carregada:\n"
-                f"- Shape: {weights.shape}\n"
+                f"- Topologia: {topology}\n"
                 f"- Primeiros valores: {preview}...\n"
                 f"- Hash SHA256: {sha}"
             )
@@ -464,6 +492,7 @@ class FrameJogarVsRedeTreinada(tk.Frame):
         self.update_buttons()
         winner = self.check_winner()
         if winner is not None:
+            self.speculator.cancel()
             self.show_result(winner)
             return
         self.turno_var.set("Turno: Rede Treinada (X)")
@@ -472,7 +501,7 @@ class FrameJogarVsRedeTreinada(tk.Frame):
     def rede_move(self):
         if not self.nn:
             return
-        idx = self.nn.predict(self.board.flatten())
+        idx = self.speculator.take(self.board)  # pronta se já especulada
         if idx == -1:
             winner = self.check_winner()
             self.show_result(winner)
@@ -485,6 +514,7 @@ class FrameJogarVsRedeTreinada(tk.Frame):
             if winner is not None:
                 self.show_result(winner)
                 return
+            self.speculator.speculate(self.board)
             self.turno_var.set("Turno: Humano (O)")
 
     def update_buttons(self):
@@ -524,10 +554,14 @@ class FrameJogarVsRedeTreinada(tk.Frame):
     def reset_board(self):
         self.board = np.zeros((3, 3), dtype=int)
         self.update_buttons()
+        if self.speculator:  # descarta a especulação da partida anterior
+            self.speculator.cancel()
         if not self.humano_comeca and self.nn:
             self.turno_var.set("Turno: Rede Treinada (X)")
             self.rede_move()
         else:
+            if self.speculator:
+                self.speculator.speculate(self.board)
             self.turno_var.set("Turno: Humano (O)")
 
 class MainWindow(tk.Tk):
@@ -573,8 +607,8 @@ class MainWindow(tk.Tk):
         frame.pack(expand=True)
         self.current_frame = frame
         if hasattr(frame, 'btn_testar_dificil') and frame.btn_testar_dificil:
-            frame.btn_testar_dificil.config(state="normal" if os.path.exists("best_network.npy") else "disabled")
-            frame.btn_testar_medio.config(state="normal" if os.path.exists("best_network.npy") else "disabled")
+            frame.btn_testar_dificil.config(state="normal" if find_model(BEST_NETWORK) else "disabled")
+            frame.btn_testar_medio.config(state="normal" if find_model(BEST_NETWORK) else "disabled")
 
     def show_rede_frame(self):
         if self.current_frame:
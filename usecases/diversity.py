@@ -0,0 +1,76 @@
+"""
+Diversidade da população e detecção de duplicatas, vetorizadas.
+
+  • mean_pairwise_distance → distância euclidiana média entre todos os
+    pares de vetores de pesos, pela matriz de Gram: ‖a-b‖² = ‖a‖² + ‖b‖²
+    - 2·a·b. Um produto de matrizes por bloco de linhas, sem laço sobre
+    pares.
+  • signatures → uma linha por indivíduo que identifica duplicatas:
+      - exact    → os próprios pesos
+      - near     → pesos quantizados em passos de `tol` (vizinhos que
+                   caem na mesma célula da grade)
+      - behavior → a jogada da rede em cada posição em que ela decide na
+                   avaliação (`services.position_index`), com e sem
+                   máscara: mesma assinatura ⇒ mesmas partidas
+  • duplicate_index → índice de hash das assinaturas: para cada
+    indivíduo, o primeiro com a mesma assinatura.
+"""
+from entities.neural_network import NeuralNetwork
+from entities.topology import Topology
+from services.position_index import net_position_boards
+import numpy as np
+
+SIGNATURES = ("exact", "near", "behavior")
+
+
+def mean_pairwise_distance(weights: np.ndarray, block: int = 1024) -> float:
+    """Média de ‖wᵢ - wⱼ‖ sobre os pares i < j; memória O(block · n)."""
+    W = np.asarray(weights, dtype=np.float64)
+    n = W.shape[0]
+    if n < 2:
+        return 0.0
+    sq = np.einsum("ij,ij->i", W, W)
+    total = 0.0
+    for start in range(0, n, block):
+        rows = W[start:start + block]
+        d2 = sq[start:start + block, None] + sq[None, :] - 2.0 * rows @ W.T
+        k = np.arange(rows.shape[0])
+        d2[k, start + k] = 0.0  # diagonal: zero exato, sem erro de arredondamento
+        total += np.sqrt(np.maximum(d2, 0.0)).sum()
+    return total / (n * (n - 1))  # cada par contou duas vezes
+
+
+def behavior_matrix(topology: Topology, weights: np.ndarray) -> np.ndarray:
+    """Jogadas (n, 2·posições) int8 de cada rede nas posições da avaliação."""
+    boards = net_position_boards()
+    out = np.empty((len(weights), 2 * len(boards)), dtype=np.int8)
+    for i, w in enumerate(weights):
+        net = NeuralNetwork.from_topology(topology, w)
+        out[i, :len(boards)] = net.predict_batch(boards, False)
+        out[i, len(boards):] = net.predict_batch(boards, True)
+    return out
+
+
+def signatures(weights: np.ndarray, kind: str = "exact", tol: float = 1e-3,
+               topology: Topology | None = None) -> np.ndarray:
+    """Matriz de assinaturas (uma linha por indivíduo) para `duplicate_index`."""
+    W = np.asarray(weights)
+    if kind == "exact":
+        return np.ascontiguousarray(W)
+    if kind == "near":
+        return np.floor(W / tol).astype(np.int64)
+    if kind == "behavior":
+        if topology is None:
+            raise ValueError("behavior precisa da topologia")
+        return behavior_matrix(topology, W)
+    raise ValueError(f"kind deve ser um de {SIGNATURES}")
+
+
+def duplicate_index(sig: np.ndarray) -> np.ndarray:
+    """rep[i] = primeiro j com a mesma assinatura que i (rep[i] == i → único)."""
+    sig = np.ascontiguousarray(sig)
+    first: dict[bytes, int] = {}
+    rep = np.empty(sig.shape[0], dtype=np.int64)
+    for i, row in enumerate(sig):
+        rep[i] = first.setdefault(row.tobytes(), i)
+    return rep
@@ -0,0 +1,228 @@
+"""
+Estratégias evolutivas sobre o vetor de pesos da rede.
+
+Em vez de uma população de cromossomos, mantêm uma distribuição de
+busca (média + passo, e no CMA-ES a covariância) e, a cada geração,
+sorteiam `population_size` candidatos como uma matriz (λ, vector_len),
+avaliam-nos com o mesmo `ScoreEvaluator`/backend do AG e atualizam a
+distribuição com operações vetorizadas.
+
+  • OpenAIES → gradiente estimado com perturbações antitéticas, scores
+               transformados em ranks centrados e passo Adam
+               (Salimans et al., 2017)
+  • CMAES    → adaptação da matriz de covariância com caminho de
+               evolução e controle do passo por CSA (Hansen, 2016);
+               covariância completa, decomposta a cada geração
+"""
+from usecases.optimizer import Optimizer
+from typing import Callable
+import numpy as np
+import time
+
+
+class _SearchDistribution(Optimizer):
+    """Laço comum: sortear → avaliar → atualizar, com checkpoint do estado."""
+
+    STATE: tuple[str, ...] = ()  # atributos (arrays) gravados no checkpoint
+
+    def __init__(self, population_size: int, generations: int, n_games: int,
+                 sigma: float = 0.1, **kwargs):
+        if population_size < 2:
+            raise ValueError("population_size deve ser >= 2")
+        if sigma <= 0:
+            raise ValueError("sigma deve ser > 0")
+        super().__init__(generations, n_games, **kwargs)
+        self.pop_size = population_size
+        self.sigma = float(sigma)
+        self.mean = self.topology.random_weights(self.np_rng).astype(float)
+
+    def ask(self) -> np.ndarray:
+        """Candidatos da geração, shape (pop_size, vector_len)."""
+        raise NotImplementedError
+
+    def tell(self, candidates: np.ndarray, scores: np.ndarray) -> None:
+        """Atualiza a distribuição com os scores (maiores são melhores)."""
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------ #
+    def _save_checkpoint(self, generation: int, best: np.ndarray, best_score: float) -> None:
+        self._write_checkpoint(
+            generation,
+            best_weights=best, best_score=best_score,
+            **{k: np.asarray(getattr(self, k)) for k in self.STATE},
+        )
+
+    def _load_checkpoint(self) -> tuple[np.ndarray, float, int]:
+        data, start = self._read_checkpoint()
+        for k in self.STATE:
+            value = data[k]
+            setattr(self, k, value if value.ndim else value.item())
+        return data["best_weights"].copy(), float(data["best_score"]), start
+
+    def evolve(self, verbose: bool = False,
+               on_generation: Callable[[dict], None] | None = None,
+               resume: bool = False) -> np.ndarray:
+        start = 1
+        best, best_score = None, -np.inf
+        if resume and self.checkpoint_path and self.checkpoint_path.exists():
+            best, best_score, start = self._load_checkpoint()
+
+        t0 = time.perf_counter()
+        pool = self._open_backend()
+        try:
+            for g in range(start, self.generations + 1):
+                self._start_generation(g)
+                with self._phase("ask"):
+                    candidates = self.ask()
+                    vectors = list(candidates.astype(self.topology.dtype))
+                with self._phase("evaluate"):
+                    scores = np.asarray(self._evaluate_vectors(vectors, pool))
+
+                top = int(np.argmax(scores))
+                if scores[top] > best_score:
+                    best, best_score = vectors[top].copy(), float(scores[top])
+                with self._phase("tell"):
+                    self.tell(candidates, scores)
+
+                stats = {
+                    "generation": g,
+                    "generations": self.generations,
+                    "best": float(scores[top]),
+                    "mean": float(scores.mean()),
+                    "best_ever": best_score,
+                    "sigma": self.sigma,
+                    **self._population_stats(scores, candidates),
+                    **self._common_stats(g, t0),
+                }
+                self.schedule.observe(stats)
+
+                if verbose:
+                    print(f"Gen {g:>3}/{self.generations} | "
+                          f"Best(gen) {scores[top]:7.2f} | "
+                          f"Best(ever) {best_score:7.2f} | "
+                          f"sigma {self.sigma:.4f}")
+
+                if on_generation is not None:
+                    on_generation(stats)
+
+                if self.checkpoint_path and g % self.checkpoint_every == 0:
+                    with self._phase("checkpoint"):
+                        self._save_checkpoint(g, best, best_score)
+        finally:
+            self._close_backend(pool)
+
+        if verbose:
+            print("\nTreinamento concluído.\n")
+
+        return best
+
+
+def centered_ranks(scores: np.ndarray) -> np.ndarray:
+    """Scores → ranks em [-0.5, 0.5]; insensível à escala e a outliers."""
+    ranks = np.empty(scores.size)
+    ranks[np.argsort(scores, kind="stable")] = np.arange(scores.size)
+    return ranks / max(scores.size - 1, 1) - 0.5
+
+
+class OpenAIES(_SearchDistribution):
+    """
+    ES com gradiente estimado: θ ± σ·ε para `population_size / 2` pares de
+    ruídos, gradiente Σ rank·ε / (λσ) e passo Adam com taxa `lr`.
+    """
+    name = "es"
+    STATE = ("mean", "sigma", "_m", "_v", "_t")
+
+    def __init__(self, population_size: int, generations: int, n_games: int,
+                 sigma: float = 0.1, lr: float = 0.05, **kwargs):
+        if population_size % 2:
+            raise ValueError("population_size deve ser par (pares antitéticos)")
+        super().__init__(population_size, generations, n_games, sigma=sigma, **kwargs)
+        self.lr = lr
+        self._m = np.zeros(self.vector_len)
+        self._v = np.zeros(self.vector_len)
+        self._t = 0
+        self._eps: np.ndarray | None = None
+
+    def ask(self) -> np.ndarray:
+        half = self.np_rng.standard_normal((self.pop_size // 2, self.vector_len))
+        self._eps = np.concatenate([half, -half])
+        return self.mean + self.sigma * self._eps
+
+    def tell(self, candidates: np.ndarray, scores: np.ndarray) -> None:
+        grad = centered_ranks(scores) @ self._eps / (self.pop_size * self.sigma)
+        b1, b2 = 0.9, 0.999
+        self._t += 1
+        self._m = b1 * self._m + (1 - b1) * grad
+        self._v = b2 * self._v + (1 - b2) * grad ** 2
+        m_hat = self._m / (1 - b1 ** self._t)
+        v_hat = self._v / (1 - b2 ** self._t)
+        self.mean = self.mean + self.lr * m_hat / (np.sqrt(v_hat) + 1e-8)
+
+
+class CMAES(_SearchDistribution):
+    """
+    CMA-ES (μ/μ_w, λ) com covariância completa. `population_size` é λ;
+    os μ = λ/2 melhores recombinam com pesos logarítmicos.
+    """
+    name = "cmaes"
+    STATE = ("mean", "sigma", "C", "pc", "ps", "_t")
+
+    def __init__(self, population_size: int, generations: int, n_games: int,
+                 sigma: float = 0.3, **kwargs):
+        super().__init__(population_size, generations, n_games, sigma=sigma, **kwargs)
+        n, lam = self.vector_len, self.pop_size
+        self.mu = lam // 2
+        w = np.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = w / w.sum()
+        self.mueff = 1.0 / np.square(self.weights).sum()
+
+        mueff = self.mueff
+        self.cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+        self.cs = (mueff + 2) / (n + mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + mueff)
+        self.cmu = min(1 - self.c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2) ** 2 + mueff))
+        self.damps = 1 + 2 * max(0.0, np.sqrt((mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+        self.C = np.eye(n)
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+        self._t = 0
+        self._y: np.ndarray | None = None
+        self._BD: tuple[np.ndarray, np.ndarray] | None = None  # autodecomposição do `ask`
+
+    def _eigen(self) -> tuple[np.ndarray, np.ndarray]:
+        """(B, D): C = B·diag(D²)·Bᵀ."""
+        self.C = np.triu(self.C) + np.triu(self.C, 1).T  # simetria numérica
+        d2, B = np.linalg.eigh(self.C)
+        return B, np.sqrt(np.maximum(d2, 1e-20))
+
+    def ask(self) -> np.ndarray:
+        B, D = self._BD = self._eigen()
+        z = self.np_rng.standard_normal((self.pop_size, self.vector_len))
+        self._y = (z * D) @ B.T  # ~ N(0, C)
+        return self.mean + self.sigma * self._y
+
+    def tell(self, candidates: np.ndarray, scores: np.ndarray) -> None:
+        n = self.vector_len
+        best = np.argsort(-scores, kind="stable")[:self.mu]
+        y_sel = self._y[best]
+        y_w = self.weights @ y_sel
+        self.mean = self.mean + self.sigma * y_w
+        self._t += 1
+
+        # caminhos de evolução (C^-1/2 · y_w para o passo; C não mudou desde o `ask`)
+        B, D = self._BD
+        c_inv_sqrt_y = B @ ((B.T @ y_w) / D)
+        self.ps = (1 - self.cs) * self.ps + np.sqrt(self.cs * (2 - self.cs) * self.mueff) * c_inv_sqrt_y
+        ps_norm = np.linalg.norm(self.ps)
+        hsig = (ps_norm / np.sqrt(1 - (1 - self.cs) ** (2 * self._t)) / self.chi_n
+                < 1.4 + 2 / (n + 1))
+        self.pc = (1 - self.cc) * self.pc + hsig * np.sqrt(self.cc * (2 - self.cc) * self.mueff) * y_w
+
+        # rank-1 + rank-μ
+        rank_mu = (y_sel.T * self.weights) @ y_sel
+        decay = 1 - self.c1 - self.cmu + (1 - hsig) * self.c1 * self.cc * (2 - self.cc)
+        self.C = decay * self.C + self.c1 * np.outer(self.pc, self.pc) + self.cmu * rank_mu
+
+        self.sigma *= float(np.exp((self.cs / self.damps) * (ps_norm / self.chi_n - 1)))
@@ -1,62 +1,166 @@
-from usecases.score_evaluator import ScoreEvaluator
+from usecases.optimizer import Optimizer
+from usecases.schedule import Schedule, make_schedule
+from usecases.hall_of_fame import HallOfFame, policy_table, table_key
+from usecases.pareto import nsga2_order
+from usecases.diversity import (SIGNATURES, duplicate_index, mean_pairwise_distance,
+                                signatures)
+from entities.neural_network import NeuralNetwork
 from entities.chromosome import Chromosome
+from entities.lineage import Lineage
+from entities.population_store import PopulationStore
+from services.eval_cluster import EvalCluster
 from pathlib import Path
-from typing import List
+from typing import Callable, List, Optional, Sequence
 import numpy as np
-import random
+import time
 import csv
-import os
 
-class GeneticAlgorithm:
+class GeneticAlgorithm(Optimizer):
     """
     Algoritmo Genético:
 
-      • Avaliação por n_games (80 % p=0.5, 20 % p=1.0)
+      • Avaliação por n_games conforme o currículo (`schedule`; padrão
+        80 % p=0.5, 20 % p=1.0, máscara em 10 %, mutação após 30 %)
       • Parada por número de gerações
       • Elitismo (melhor indivíduo segue intacto)
       • Uniform Crossover real-coded
       • Mutação Gaussiana + “burst” adicional
       • CSV por geração no formato IA,Score
+      • Avaliação paralela opcional (`workers` > 1)
+      • Checkpoint opcional da população ao fim de cada geração
+      • Modos de avaliação do ScoreEvaluator (standard, crn, racing)
+        e motor escalar ou em lote (`engine`), com memória de jogadas
+        por rede (`memo`)
+      • Genealogia (pais e geração de nascimento) em `lineage.npz`
+      • Coevolução opcional: parte do fitness vem de partidas contra um
+        hall da fama com os melhores de gerações anteriores
+      • Pesos da população atual e da próxima em buffer duplo, opcionalmente
+        em arquivos mapeados em memória (`population_dir`)
+      • Seleção escalar (score) ou multiobjetivo no estilo NSGA-II sobre
+        as taxas de desfecho (`selection="nsga2"`, ver `usecases.pareto`)
+      • Duplicatas (pesos iguais, quase iguais ou mesmo comportamento)
+        avaliadas uma só vez e, opcionalmente, trocadas por vetores novos;
+        diversidade da população nas estatísticas (`usecases.diversity`)
+      • Avaliação distribuída opcional em outros nós (`eval_nodes`, ver
+        `services.eval_cluster`)
     """
 
+    name = "ga"
+    SELECTIONS = ("scalar", "nsga2")
+
     def __init__(
         self,
         population_size: int,
         generations: int,
         n_games: int,
+        layer_sizes: Sequence[int] = (9, 9, 9),
+        dtype: str = "float64",
+        activations: str | Sequence[str] | None = None,
+        mut_rate: float = 0.20,
+        mutation_start: float = 0.30,
+        tournament_k: int = 2,
+        selection: str = "scalar",
+        dedup: str = "off",
+        dedup_tol: float = 1e-3,
+        replace_duplicates: bool = False,
+        track_diversity: bool = False,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        out_path: str | Path = "populations",
+        eval_mode: str = "standard",
+        racing_keep: float = 0.5,
+        racing_z: float = 2.0,
+        engine: str = "scalar",
+        memo: str = "auto",
+        schedule: str | Schedule = "fixed",
+        coevolution: float = 0.0,
+        hof_size: int = 10,
+        checkpoint_path: str | Path | None = None,
+        checkpoint_every: int = 1,
+        population_dir: str | Path | None = None,
+        eval_nodes: Sequence[str] | None = None,
     ):
-        # ----- Hiperparâmetros principais -----
-        self.pop_size = population_size
-        self.generations = generations
-        self.n_games = n_games
+        if population_size < 2:
+            raise ValueError("population_size deve ser >= 2")
+        if selection not in self.SELECTIONS:
+            raise ValueError(f"selection deve ser um de {self.SELECTIONS}")
+        if dedup not in ("off",) + SIGNATURES:
+            raise ValueError(f"dedup deve ser 'off' ou um de {SIGNATURES}")
 
-        # Arquitetura fixa 9-9-9 → 180 pesos
-        self.in_size = self.h_size = self.o_size = 9
-        self.vector_len = 180
+        # Avaliador, currículo (que também decide a mutação), execução e checkpoint
+        super().__init__(
+            generations, n_games, layer_sizes=layer_sizes, dtype=dtype,
+            activations=activations, workers=workers, seed=seed, out_path=out_path,
+            eval_mode=eval_mode, racing_keep=racing_keep, racing_z=racing_z,
+            engine=engine, memo=memo,
+            schedule=(schedule if isinstance(schedule, Schedule)
+                      else make_schedule(schedule, mut_rate=mut_rate,
+                                         mutation_start=mutation_start)),
+            checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every,
+            eval_nodes=eval_nodes,
+        )
+        self.pop_size = population_size
 
         # Taxas do GA
-        self.mut_rate = 0.20
+        self.mut_rate = mut_rate
+        self.mutation_start = mutation_start  # fração das gerações sem mutação
+        self.tournament_k = tournament_k
 
-        self.out_path = Path("populations")
-        self.out_path.mkdir(parents=True, exist_ok=True)
+        # NSGA-II: objetivos da última avaliação e (frente, aglomeração) por ID
+        self.selection = selection
+        self._objectives: np.ndarray | None = None
+        self._fronts: dict[int, tuple[int, float]] = {}
 
-        # Avaliador de fitness
-        self.evaluator = ScoreEvaluator(
-            self.in_size, self.h_size, self.o_size, n_games
-        )
+        # Duplicatas e diversidade
+        self.dedup = dedup
+        self.dedup_tol = dedup_tol
+        self.replace_duplicates = replace_duplicates
+        self.track_diversity = track_diversity
+        self._dedup_stats: dict = {}  # duplicatas avaliadas/trocadas desde as últimas estatísticas
+
+        # Pesos em arquivos mapeados (atual + próxima geração); None = RAM
+        self.store = (PopulationStore(population_size, self.vector_len,
+                                      self.topology.dtype, population_dir)
+                      if population_dir else None)
+
+        # Genealogia de todos os cromossomos criados por este AG
+        self.lineage = Lineage()
+
+        # Coevolução: fitness = (1 - w)·Minimax + w·hall da fama
+        if not 0.0 <= coevolution <= 1.0:
+            raise ValueError("coevolution deve estar entre 0.0 e 1.0")
+        self.coevolution = coevolution
+        self.hall = HallOfFame(hof_size) if coevolution > 0 else None
+        self._tables: dict[int, tuple[str, np.ndarray]] = {}  # id → política em tabela
 
     def _init_pop(self) -> List[Chromosome]:
-        return [Chromosome(np.random.uniform(-1, 1, self.vector_len))
-            for _ in range(self.pop_size)]
+        if self.store is None:
+            pop = [Chromosome(self.topology.random_weights(self.np_rng))
+                for _ in range(self.pop_size)]
+        else:
+            rows = self.store.current
+            for row in rows:
+                row[:] = self.topology.random_weights(self.np_rng)
+            pop = [Chromosome(row) for row in rows]
+        for c in pop:
+            self.lineage.record(c.id, -1, -1, 1)
+        return pop
 
-    def _select_tournament(self, pop: List[Chromosome], k: int = 2) -> Chromosome:
-        """Torneio de tamanho *k* (default = 2)."""
-        return max(random.sample(pop, k), key=lambda c: c.score)
+    def _select_tournament(self, pop: List[Chromosome], k: int | None = None) -> Chromosome:
+        """Torneio de tamanho *k* (default = `tournament_k`)."""
+        k = self.tournament_k if k is None else k
+        if self.selection == "nsga2":  # frente menor; empate → menos aglomerado
+            key = lambda c: (-self._fronts[c.id][0], self._fronts[c.id][1])
+        else:
+            key = lambda c: c.score
+        return max(self.rng.sample(pop, k), key=key)
 
-    def _crossover(self, dad: Chromosome, mom: Chromosome):
-        child_vec = np.zeros(self.vector_len)
-        for i in range(self.vector_len):
-            child_vec[i] = (dad.weights_vector[i] + mom.weights_vector[i]) / 2.0
+    def _crossover(self, dad: Chromosome, mom: Chromosome,
+                   out: np.ndarray | None = None):
+        """Média gene a gene dos pais; `out` recebe os pesos do filho (linha do store)."""
+        child_vec = np.empty(self.vector_len, dtype=self.topology.dtype) if out is None else out
+        np.add(dad.weights_vector, mom.weights_vector, out=child_vec)
+        child_vec /= 2.0
         return Chromosome(child_vec)
 
     def _save_population_csv(self, generation: int, pop: List[Chromosome]) -> None:
@@ -68,70 +172,301 @@ class GeneticAlgorithm:
             for chrom in pop:
                 writer.writerow([chrom.id, f"{chrom.score:.4f}"])
 
-    def _mutate(self, chrom: Chromosome, verbose: bool = False) -> None:
+    def _mutate(self, chrom: Chromosome, verbose: bool = False,
+                rate: float | None = None) -> None:
         """
         Mutação real-coded in-place ‒ versão simples:
 
-          • Cada gene tem prob. `mut_rate` de ser mutado.
+          • Cada gene tem prob. `rate` (default `mut_rate`) de ser mutado.
           • Genes mutados recebem NOVO valor U(-1, 1) — não é perturbação.
           • (Opcional) “burst” extra: 30 % de chance de ainda trocar 1–3 genes.
           • Após a troca, o vetor já está garantidamente dentro de [-1, 1].
         """
         # ---- mutação normal ------------------------------------------------
-        mask = np.random.rand(self.vector_len) < self.mut_rate
+        rate = self.mut_rate if rate is None else rate
+        mask = self.np_rng.rand(self.vector_len) < rate
         num_mut = mask.sum()
         if num_mut:
-            chrom.weights_vector[mask] = np.random.uniform(-1, 1, num_mut)
+            chrom.weights_vector[mask] = self.np_rng.uniform(-1, 1, num_mut)
 
         # ---- burst opcional ------------------------------------------------
-        if random.random() < 0.30:
-            extra = np.random.choice(
-                self.vector_len, size=random.randint(1, 3), replace=False
+        if self.rng.random() < 0.30:
+            extra = self.np_rng.choice(
+                self.vector_len, size=self.rng.randint(1, 3), replace=False
             )
-            chrom.weights_vector[extra] = np.random.uniform(-1, 1, extra.size)
+            chrom.weights_vector[extra] = self.np_rng.uniform(-1, 1, extra.size)
             num_mut += extra.size
 
         if verbose:
             print(f"Total genes mutated: {num_mut}")
 
+    # ------------------------------------------------------------------ #
+    def _evaluate_population(self, pop: List[Chromosome],
+                             pool=None) -> None:
+        """Atribui `score` a todos os indivíduos (ver `Optimizer._evaluate_vectors`)."""
+        vectors = [c.weights_vector for c in pop]
+        inverse = None
+        if self.dedup != "off":  # cada assinatura joga uma vez; as cópias herdam o score
+            rep = duplicate_index(self._signatures(vectors, self.dedup))
+            unique, inverse = np.unique(rep, return_inverse=True)
+            vectors = [vectors[i] for i in unique]
+            self._dedup_stats["duplicates"] = len(pop) - len(unique)
+        if self.store is not None and pool is not None and not isinstance(pool, EvalCluster):
+            vectors = self.store.refs(vectors)  # workers leem do mapa, sem cópia
+        scores = self._evaluate_vectors(vectors, pool)
+        if inverse is not None:
+            scores = [scores[k] for k in inverse]
+            self.evaluator.last_outcomes = self.evaluator.last_outcomes[inverse]
 
-    def evolve(self, verbose: bool = False) -> np.ndarray:
-        """Executa o GA e devolve o vetor de pesos do melhor cromossomo."""
-        pop = self._init_pop()
-        best_global: Chromosome | None = None
+        hof = None
+        if self.hall is not None and len(self.hall):
+            w = self.coevolution
+            keys, tables = zip(*(self._policy_table(c) for c in pop))
+            hof = self.hall.score(tables, keys)
+            scores = [(1 - w) * s + w * h for s, h in zip(scores, hof)]
 
-        for g in range(1, self.generations + 1):
-            for c in pop:
-                c.score = self.evaluator.evaluate(c.weights_vector)
+        if self.selection == "nsga2":  # o hall da fama entra como mais um objetivo
+            F = self.evaluator.objectives()
+            self._objectives = F if hof is None else np.column_stack([F, hof])
 
-            pop.sort(key=lambda c: c.score, reverse=True)
-            self._save_population_csv(g, pop)
+        for c, s in zip(pop, scores):
+            c.score = s
 
-            if best_global is None or pop[0].score > best_global.score:
-                best_global = pop[0].clone(keep_id=True)
+    def _signatures(self, vectors, kind: str) -> np.ndarray:
+        return signatures(np.stack([np.asarray(v) for v in vectors]), kind,
+                          self.dedup_tol, self.topology)
 
-            if verbose:
-                print(f"Gen {g:>3}/{self.generations} | "
-                    f"Best(gen) {pop[0].score:7.2f} | "
-                    f"Best(ever) {best_global.score:7.2f}")
+    def _replace_duplicates(self, pop: List[Chromosome], g: int) -> None:
+        """
+        Troca cada filho repetido (assinatura `dedup`; pesos idênticos se
+        desligado) por um vetor U(-1, 1) novo, sem pais. O substituto herda
+        o ID do filho descartado (e a linha dele na genealogia), então não
+        consome IDs além do bloco reservado para a população. O primeiro de
+        cada grupo fica — o elite, na posição 0, sempre.
+        """
+        kind = self.dedup if self.dedup != "off" else "exact"
+        rep = duplicate_index(self._signatures([c.weights_vector for c in pop], kind))
+        dup = np.flatnonzero(rep != np.arange(len(pop)))
+        for i in dup:
+            row = pop[i].weights_vector  # com store, a linha da próxima matriz
+            row[:] = self.topology.random_weights(self.np_rng)
+            pop[i] = Chromosome(row, uid=pop[i].id)
+            self.lineage.update(pop[i].id, -1, -1, g + 1)
+        self._dedup_stats["replaced"] = int(dup.size)
+
+    def _diversity_stats(self, weights: np.ndarray) -> dict:
+        """Distância média entre pares, fração de comportamentos e de pesos distintos."""
+        n = len(weights)
+        behaviors = duplicate_index(signatures(weights, "behavior", topology=self.topology))
+        exact = duplicate_index(signatures(weights, "exact"))
+        return {"diversity": {
+            "mean_distance": mean_pairwise_distance(weights),
+            "distinct_behaviors": int((behaviors == np.arange(n)).sum()) / n,
+            "distinct_weights": int((exact == np.arange(n)).sum()) / n,
+        }}
+
+    def _policy_table(self, chrom: Chromosome) -> tuple[str, np.ndarray]:
+        """(chave, tabela de política) do cromossomo, reaproveitada pelo ID."""
+        hit = self._tables.get(chrom.id)
+        if hit is None:
+            net = NeuralNetwork.from_topology(self.topology, chrom.weights_vector)
+            table = policy_table(net)
+            hit = self._tables[chrom.id] = (table_key(table), table)
+        return hit
 
-            # -------- Reprodução --------
-            next_pop: List[Chromosome] = [pop[0].clone(keep_id=True)]  # elitismo
+    def _reproduce(self, pop: List[Chromosome], g: int) -> List[Chromosome]:
+        """
+        Gera a próxima população a partir de `pop` já ordenada. Com store,
+        o indivíduo k é escrito na linha k da próxima matriz, que vira a
+        atual no fim.
+        """
+        rows = self.store.next if self.store is not None else None
+        if rows is None:
+            elite = pop[0].clone(keep_id=True)
+        else:
+            rows[0] = pop[0].weights_vector
+            elite = Chromosome(rows[0], uid=pop[0].id)
+            elite.score = pop[0].score
+        next_pop: List[Chromosome] = [elite]  # elitismo
 
-            while len(next_pop) < self.pop_size:
-                p1 = self._select_tournament(pop)
+        while len(next_pop) < self.pop_size:
+            p1 = self._select_tournament(pop)
+            p2 = self._select_tournament(pop)
+            while p2 is p1:
                 p2 = self._select_tournament(pop)
-                while p2 is p1:
-                    p2 = self._select_tournament(pop)
 
-                child = self._crossover(p1, p2)
+            child = self._crossover(p1, p2, None if rows is None else rows[len(next_pop)])
+            self.lineage.record(child.id, p1.id, p2.id, g + 1)
+
+            if self.plan.mut_rate > 0:  # o currículo decide se/quanto mutar
+                self._mutate(child, rate=self.plan.mut_rate)
+
+            next_pop.append(child)
+
+        if self.replace_duplicates:
+            self._replace_duplicates(next_pop, g)
+        if self.store is not None:
+            self.store.swap()
+        return next_pop
+
+    def _run_generation(self, pop: List[Chromosome], g: int,
+                        best_global: Chromosome | None,
+                        pool=None) -> Chromosome:
+        """
+        Avalia e ordena `pop` (in-place), grava o CSV da geração `g` e
+        devolve o melhor global atualizado. O plano do currículo para `g`
+        vale para a avaliação e para a reprodução que vem em seguida.
+        """
+        self._start_generation(g)
+        with self._phase("evaluate"):
+            self._evaluate_population(pop, pool)
+        with self._phase("rank"):
+            best_global = self._rank(pop, g, best_global)
+        return best_global
+
+    def _rank(self, pop: List[Chromosome], g: int,
+              best_global: Chromosome | None) -> Chromosome:
+        """Ordena `pop` já avaliada, grava o CSV e atualiza o melhor global."""
+        if self.selection == "nsga2":
+            # por frente de Pareto; dentro da frente, menos aglomerado primeiro
+            # (é o que os migrantes das ilhas levam); o elite, em pop[0], é o
+            # melhor score da primeira frente
+            order, rank, crowd = nsga2_order(self._objectives)
+            front = order[rank[order] == 0]
+            elite = front[np.argmax([pop[i].score for i in front])]
+            order = np.concatenate(([elite], order[order != elite]))
+            pop[:] = [pop[i] for i in order]
+            self._fronts = {c.id: (int(rank[i]), float(crowd[i]))
+                            for c, i in zip(pop, order)}
+        else:
+            pop.sort(key=lambda c: c.score, reverse=True)
+        self._save_population_csv(g, pop)
+
+        top = max(pop, key=lambda c: c.score)  # = pop[0] na seleção escalar
+        if best_global is None or top.score > best_global.score:
+            best_global = top.clone(keep_id=True)
+
+        if self.hall is not None:
+            self.hall.add(self._policy_table(pop[0])[1])
+            # só o elite sobrevive à reprodução com o mesmo ID
+            self._tables = {pop[0].id: self._tables[pop[0].id]}
+        return best_global
+
+    def _generation_stats(self, g: int, pop: List[Chromosome],
+                          best_global: Chromosome, t0: float) -> dict:
+        """Resumo da geração `g` (população já avaliada e ordenada)."""
+        # com store, a matriz segue a ordem das linhas, não a de `pop` (que
+        # `_rank` ordenou; pop[k] está em pop[k].weights_vector); as
+        # estatísticas abaixo não dependem da ordem
+        weights = (self.store.current if self.store is not None
+                   else np.stack([c.weights_vector for c in pop]))
+        dedup, self._dedup_stats = self._dedup_stats, {}
+        return {
+            "generation": g,
+            "generations": self.generations,
+            "best": pop[0].score,
+            "best_id": pop[0].id,
+            "mean": float(np.mean([c.score for c in pop])),
+            "best_ever": best_global.score,
+            "best_ever_id": best_global.id,
+            **self._population_stats([c.score for c in pop], weights),
+            **(self._diversity_stats(weights) if self.track_diversity else {}),
+            **dedup,
+            **self._common_stats(g, t0),
+            **(self.hall.last_stats if self.hall is not None else {}),
+            **({"pareto_front": sum(r == 0 for r, _ in self._fronts.values())}
+               if self.selection == "nsga2" else {}),
+        }
+
+    # ------------------------------------------------------------------ #
+    def _save_checkpoint(self, generation: int, pop: List[Chromosome],
+                         best_global: Chromosome) -> None:
+        """
+        Salva (de forma atômica) a população que será avaliada na geração
+        `generation + 1`, o melhor global e o estado dos geradores aleatórios.
+        """
+        self._write_checkpoint(
+            generation,
+            # com store, pop[k] é a linha k da matriz atual (ver `_reproduce`)
+            weights=(self.store.current if self.store is not None
+                     else np.stack([c.weights_vector for c in pop])),
+            ids=np.array([c.id for c in pop], dtype=np.int64),
+            best_weights=best_global.weights_vector,
+            best_score=best_global.score,
+            best_id=best_global.id,
+            next_id=Chromosome.allocator.next_id,
+            **{f"lineage_{k}": v for k, v in self.lineage.arrays().items()},
+            **(self.hall.arrays() if self.hall is not None else {}),
+        )
+
+    def _load_checkpoint(self):
+        """Restaura o estado gravado por `_save_checkpoint`."""
+        data, start = self._read_checkpoint()
+        if self.store is not None:
+            self.store.current[:] = data["weights"]
+            pop = [Chromosome(row, uid=int(i))
+                   for row, i in zip(self.store.current, data["ids"])]
+        else:
+            pop = [Chromosome(w.copy(), uid=int(i))
+                   for w, i in zip(data["weights"], data["ids"])]
+        best_global = Chromosome(data["best_weights"].copy(),
+                                 uid=int(data["best_id"]))
+        best_global.score = float(data["best_score"])
+        Chromosome.allocator.advance_to(int(data["next_id"]))
+        self.lineage = Lineage.from_arrays(
+            *(data[f"lineage_{k}"] for k in Lineage.FIELDS))
+        if self.hall is not None and "hof_tables" in data:
+            self.hall.restore(data["hof_tables"])
+
+        return pop, best_global, start
+
+    # ------------------------------------------------------------------ #
+    def evolve(self, verbose: bool = False,
+               on_generation: Callable[[dict], None] | None = None,
+               resume: bool = False) -> np.ndarray:
+        """
+        Executa o GA e devolve o vetor de pesos do melhor cromossomo.
+
+        • on_generation → chamado ao fim de cada geração com um dicionário
+          de estatísticas (geração, melhor, média, tempo decorrido).
+        • resume        → continua a partir de `checkpoint_path`, se existir.
+        """
+        start = 1
+        best_global: Chromosome | None = None
+        if resume and self.checkpoint_path and self.checkpoint_path.exists():
+            pop, best_global, start = self._load_checkpoint()
+        else:
+            pop = self._init_pop()
+
+        t0 = time.perf_counter()
+        pool = self._open_backend()
+        try:
+            for g in range(start, self.generations + 1):
+                best_global = self._run_generation(pop, g, best_global, pool)
+                stats = self._generation_stats(g, pop, best_global, t0)
+                self.schedule.observe(stats)
+
+                if verbose:
+                    print(f"Gen {g:>3}/{self.generations} | "
+                        f"Best(gen) {pop[0].score:7.2f} | "
+                        f"Best(ever) {best_global.score:7.2f} | "
+                        f"Jogos {stats['games_played']} "
+                        f"(-{stats['games_saved']})")
+
+                if on_generation is not None:
+                    on_generation(stats)
 
-                if g > int(self.generations * 0.30):  # mutação só após 30 % das gerações
-                    self._mutate(child)
+                # -------- Reprodução --------
+                with self._phase("reproduce"):
+                    pop = self._reproduce(pop, g)  # nova população
 
-                next_pop.append(child)
+                if self.checkpoint_path and g % self.checkpoint_every == 0:
+                    with self._phase("checkpoint"):
+                        self._save_checkpoint(g, pop, best_global)
+        finally:
+            self._close_backend(pool)
 
-            pop = next_pop  # nova população
+        self.lineage.save(self.out_path / "lineage.npz")
 
         if verbose:
             print("\nTreinamento concluído.\n")
@@ -0,0 +1,167 @@
+"""
+Hall da fama para coevolução.
+
+Os melhores de gerações passadas ficam guardados como tabelas de
+política: para cada um dos 3**9 tabuleiros (`utils.board_codes`), a casa
+que a rede escolhe jogando com +1 — um vetor int8 de ~19 KB por rede.
+Duas tabelas são políticas determinísticas, então o resultado entre elas
+é sempre o mesmo: as partidas indivíduo × hall ficam em memória por par
+de hashes e cada geração só joga as dos indivíduos novos.
+
+Pontos de uma partida contra o hall, do ponto de vista do indivíduo:
+vitória +WIN_POINTS, empate +DRAW_POINTS, derrota -LOSE_POINTS e jogada
+em casa ocupada (derrota imediata) -WRONG_PLACE, como no ScoreEvaluator.
+"""
+from entities.neural_network import NeuralNetwork
+from services.tic_tac_toe_simulator import winners
+from usecases.score_evaluator import ScoreEvaluator
+from typing import Sequence
+from utils.board_codes import all_boards, encode_many
+import numpy as np
+import hashlib
+
+_ALL_BOARDS: np.ndarray | None = None
+
+
+def policy_table(net: NeuralNetwork, mask_invalid: bool = False) -> np.ndarray:
+    """Jogada da rede para cada código de tabuleiro, shape (3**9,) int8."""
+    global _ALL_BOARDS
+    if _ALL_BOARDS is None:
+        _ALL_BOARDS = all_boards()
+    return net.predict_batch(_ALL_BOARDS, mask_invalid).astype(np.int8)
+
+
+def table_key(table: np.ndarray) -> str:
+    """Hash do comportamento: redes com a mesma política têm a mesma chave."""
+    return hashlib.sha1(np.ascontiguousarray(table).tobytes()).hexdigest()[:16]
+
+
+def play_tables(tables: np.ndarray, x: np.ndarray, o: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Partidas entre políticas em tabela, em lockstep: `x[g]` e `o[g]` são
+    índices em `tables` (K, 3**9). Devolve (vencedor, perdeu_por_jogada_ilegal)
+    por partida; vencedor +1 (X), -1 (O) ou 0.
+    """
+    n = x.size
+    boards = np.zeros((n, 9), dtype=np.int8)
+    winner = np.zeros(n, dtype=np.int8)
+    forfeit = np.zeros(n, dtype=bool)
+    live = np.arange(n)
+
+    for step in range(9):
+        if live.size == 0:
+            break
+        side = 1 if step % 2 == 0 else -1
+        b = boards[live]
+        who = (x if side == 1 else o)[live]
+        moves = tables[who, encode_many(b * side)].astype(np.int64)
+
+        bad = moves < 0
+        bad[~bad] = b[~bad, moves[~bad]] != 0
+        winner[live[bad]] = -side
+        forfeit[live[bad]] = True
+        live, b, moves = live[~bad], b[~bad], moves[~bad]
+
+        b[np.arange(live.size), moves] = side
+        boards[live] = b
+        won = winners(b) == side
+        winner[live[won]] = side
+        live = live[~won]
+
+    return winner, forfeit
+
+
+class HallOfFame:
+    """
+    Até `size` tabelas de política (as mais recentes ficam) e a memória de
+    resultados indivíduo × membro, podada a cada geração para os
+    indivíduos vivos.
+    """
+    def __init__(self, size: int = 10):
+        if size < 1:
+            raise ValueError("size deve ser >= 1")
+        self.size = size
+        self.tables: list[np.ndarray] = []
+        self.keys: list[str] = []
+        # (chave do indivíduo, chave do membro) → pontos (como X, como O)
+        self.memo: dict[tuple[str, str], tuple[float, float]] = {}
+        self.last_stats: dict = {"hof_size": 0, "hof_games": 0, "hof_cached": 0}
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    def add(self, table: np.ndarray) -> bool:
+        """Inclui a política (se for nova); a mais antiga sai se passar de `size`."""
+        key = table_key(table)
+        if key in self.keys:
+            return False
+        self.tables.append(table)
+        self.keys.append(key)
+        if len(self.tables) > self.size:
+            old = self.keys.pop(0)
+            self.tables.pop(0)
+            self.memo = {k: v for k, v in self.memo.items() if k[1] != old}
+        return True
+
+    @staticmethod
+    def _points(won: np.ndarray, lost: np.ndarray, forfeit: np.ndarray) -> np.ndarray:
+        e = ScoreEvaluator
+        return np.where(won, e.WIN_POINTS,
+                        np.where(lost, np.where(forfeit, -e.WRONG_PLACE, -e.LOSE_POINTS),
+                                 e.DRAW_POINTS)).astype(float)
+
+    def score(self, tables: Sequence[np.ndarray], keys: Sequence[str] | None = None) -> np.ndarray:
+        """
+        Pontos médios de cada política de `tables` contra todo o hall
+        (uma partida com cada cor por membro). Só joga os pares fora da memória.
+        """
+        if keys is None:
+            keys = [table_key(t) for t in tables]
+        n_hall = len(self.tables)
+        if n_hall == 0:
+            self.last_stats = {"hof_size": 0, "hof_games": 0, "hof_cached": 0}
+            return np.zeros(len(tables))
+
+        # pares indivíduo × membro ainda não jogados (chaves repetidas jogam uma vez)
+        todo: dict[tuple[str, str], tuple[int, int]] = {}
+        index: dict[str, int] = {}
+        for i, k in enumerate(keys):
+            for m, hk in enumerate(self.keys):
+                if (k, hk) not in self.memo and (k, hk) not in todo:
+                    index.setdefault(k, i)
+                    todo[k, hk] = (index[k], m)
+
+        cached = len(keys) * n_hall - len(todo)
+        if todo:
+            pairs = list(todo.values())
+            stack = np.stack([np.asarray(t) for t in tables] + self.tables)
+            ind = np.array([i for i, _ in pairs])
+            mem = np.array([len(tables) + m for _, m in pairs])
+            # indivíduo de X em metade das partidas, de O na outra
+            w, f = play_tables(stack, np.concatenate([ind, mem]), np.concatenate([mem, ind]))
+            k = len(pairs)
+            as_x = self._points(w[:k] == 1, w[:k] == -1, f[:k])
+            as_o = self._points(w[k:] == -1, w[k:] == 1, f[k:])
+            for pair, px, po in zip(todo, as_x, as_o):
+                self.memo[pair] = (float(px), float(po))
+
+        out = np.array([np.mean([sum(self.memo[k, hk]) / 2 for hk in self.keys])
+                        for k in keys])
+
+        alive = set(keys)
+        self.memo = {p: v for p, v in self.memo.items() if p[0] in alive}
+        self.last_stats = {"hof_size": n_hall, "hof_games": 2 * len(todo),
+                           "hof_cached": 2 * cached}
+        return out
+
+    # ------------------------------------------------------------------ #
+    def arrays(self) -> dict:
+        """Campos para o checkpoint do AG (a memória é refeita sob demanda)."""
+        tables = (np.stack(self.tables) if self.tables
+                  else np.empty((0, 0), dtype=np.int8))
+        return {"hof_tables": tables}
+
+    def restore(self, tables: np.ndarray) -> None:
+        self.tables, self.keys, self.memo = [], [], {}
+        for t in tables:
+            self.add(np.array(t, dtype=np.int8))
@@ -0,0 +1,232 @@
+from usecases.genetic_algorithm import GeneticAlgorithm
+from entities.chromosome import Chromosome, IdAllocator
+from minimax.solution_table import load_solution_table
+from multiprocessing import Pipe, Process
+from pathlib import Path
+from typing import Callable, List, Optional
+import numpy as np
+import traceback
+import random
+import time
+
+def _island_worker(conn, island: int, id_block: tuple[int, int],
+                   n_migrants: int, ga_kwargs: dict) -> None:
+    """
+    Processo de uma ilha. Protocolo (via `conn`):
+
+      ← ("run", n_gens, immigrants)  roda `n_gens` gerações; `immigrants`
+                                     é uma lista (id, pesos, score) que
+                                     substitui os últimos filhos da
+                                     população antes da primeira geração
+      → ("done", stats, emigrants, best)
+      ← ("stop",)
+
+    Se a ilha falhar, envia ("error", ilha, traceback) e encerra.
+    `id_block` é a faixa de IDs reservada a esta ilha pelo processo pai.
+    """
+    try:
+        _run_island(conn, island, id_block, n_migrants, ga_kwargs)
+    except Exception:
+        conn.send(("error", island, traceback.format_exc()))
+    conn.close()
+
+
+def _run_island(conn, island: int, id_block: tuple[int, int],
+                n_migrants: int, ga_kwargs: dict) -> None:
+    Chromosome.allocator = IdAllocator(*id_block)
+    ga = GeneticAlgorithm(**ga_kwargs)
+    pop = ga._init_pop()
+    best: Chromosome | None = None
+    g = 0
+    t0 = time.perf_counter()
+
+    while True:
+        msg = conn.recv()
+        if msg[0] == "stop":
+            ga.lineage.save(ga.out_path / "lineage.npz")
+            break
+
+        _, n_gens, immigrants = msg
+        # imigrantes entram no lugar dos últimos filhos (o elite, pop[0], fica)
+        for k, (uid, weights, score) in enumerate(immigrants, start=1):
+            imm = Chromosome(weights.copy(), uid=uid)
+            imm.score = score
+            pop[-k] = imm
+
+        stats = []
+        for _ in range(n_gens):
+            g += 1
+            best = ga._run_generation(pop, g, best)
+            stats.append({"island": island,
+                          **ga._generation_stats(g, pop, best, t0)})
+            ga.schedule.observe(stats[-1])
+            last_sorted = pop
+            pop = ga._reproduce(pop, g)
+
+        emigrants = [(c.id, c.weights_vector, c.score)
+                     for c in last_sorted[:n_migrants]]
+        conn.send(("done", stats, emigrants, (best.id, best.weights_vector, best.score)))
+
+
+class IslandModel:
+    """
+    Modelo de ilhas:
+
+      • K sub-populações, cada uma evoluindo em seu próprio processo com o
+        GeneticAlgorithm (mesma seleção, crossover e mutação)
+      • A cada `migration_interval` gerações os `n_migrants` melhores de cada
+        ilha migram (topologia "ring": i → i+1; "random": ilha sorteada)
+      • Imigrantes substituem os últimos filhos da população de destino
+      • Estatísticas por ilha e melhor global combinado
+
+    As ilhas só se sincronizam na migração, então o custo escala quase
+    linearmente com o número de núcleos.
+    """
+
+    TOPOLOGIES = ("ring", "random")
+
+    def __init__(
+        self,
+        n_islands: int,
+        population_size: int,
+        generations: int,
+        n_games: int,
+        migration_interval: int = 5,
+        n_migrants: int = 2,
+        topology: str = "ring",
+        seed: Optional[int] = None,
+        out_path: str | Path = "populations",
+        **ga_kwargs,
+    ):
+        """
+        `population_size` é a população TOTAL, dividida entre as ilhas.
+        `ga_kwargs` segue para cada GeneticAlgorithm (mut_rate, eval_mode...).
+        """
+        if n_islands < 2:
+            raise ValueError("n_islands deve ser >= 2")
+        if topology not in self.TOPOLOGIES:
+            raise ValueError(f"topology deve ser um de {self.TOPOLOGIES}")
+
+        island_size = population_size // n_islands
+        if island_size < 2:
+            raise ValueError("population_size insuficiente para o número de ilhas")
+        if not 0 <= n_migrants < island_size:
+            raise ValueError("n_migrants deve ser menor que o tamanho de cada ilha")
+
+        self.n_islands = n_islands
+        self.island_size = island_size
+        self.generations = generations
+        self.n_games = n_games
+        self.migration_interval = max(1, migration_interval)
+        self.n_migrants = n_migrants
+        self.topology = topology
+        self.rng = random.Random(seed)
+        self.out_path = Path(out_path)
+        self.ga_kwargs = ga_kwargs
+
+        # melhor de cada ilha e melhor global (preenchidos em `evolve`)
+        self.island_best: List[tuple] = []
+        self.best_island: int | None = None
+
+    def _island_kwargs(self, island: int) -> dict:
+        return {
+            **self.ga_kwargs,
+            "population_size": self.island_size,
+            "generations": self.generations,
+            "n_games": self.n_games,
+            "seed": self.rng.randrange(2 ** 32),
+            "out_path": self.out_path / f"island{island}",
+            "workers": 1,
+        }
+
+    @staticmethod
+    def _receive(island: int, conn) -> tuple:
+        """Resposta de uma ilha; erro (com o traceback da ilha) se ela falhou."""
+        try:
+            reply = conn.recv()
+        except EOFError:
+            raise RuntimeError(f"ilha {island} encerrou sem responder") from None
+        if reply[0] == "error":
+            raise RuntimeError(f"ilha {reply[1]} falhou:\n{reply[2]}")
+        return reply
+
+    def _destinations(self) -> List[int]:
+        """Ilha de destino dos emigrantes de cada ilha."""
+        k = self.n_islands
+        if self.topology == "ring":
+            return [(i + 1) % k for i in range(k)]
+        return [self.rng.choice([j for j in range(k) if j != i]) for i in range(k)]
+
+    def evolve(self, verbose: bool = False,
+               on_generation: Callable[[dict], None] | None = None) -> np.ndarray:
+        """
+        Executa todas as ilhas e devolve o vetor de pesos do melhor global.
+        `on_generation` recebe as estatísticas de cada ilha/geração
+        (mesmo formato do GeneticAlgorithm, com a chave "island").
+        """
+        load_solution_table()  # uma geração só, antes de criar as ilhas
+        conns, procs = [], []
+        for i in range(self.n_islands):
+            parent, child = Pipe()
+            # pop inicial + filhos de cada geração (o elite mantém o ID)
+            id_block = Chromosome.allocator.reserve(
+                self.island_size * (self.generations + 1))
+            proc = Process(target=_island_worker,
+                           args=(child, i, id_block, self.n_migrants,
+                                 self._island_kwargs(i)),
+                           daemon=True)
+            proc.start()
+            child.close()
+            conns.append(parent)
+            procs.append(proc)
+
+        immigrants: List[list] = [[] for _ in range(self.n_islands)]
+        best = [None] * self.n_islands
+        done = 0
+        try:
+            while done < self.generations:
+                n_gens = min(self.migration_interval, self.generations - done)
+                for i, conn in enumerate(conns):
+                    conn.send(("run", n_gens, immigrants[i]))
+
+                replies = [self._receive(i, conn) for i, conn in enumerate(conns)]
+                done += n_gens
+
+                for i, (_, stats, _, island_best) in enumerate(replies):
+                    best[i] = island_best
+                    for st in stats:
+                        if verbose:
+                            print(f"Ilha {i} | Gen {st['generation']:>3}/{self.generations} | "
+                                  f"Best(gen) {st['best']:7.2f} | "
+                                  f"Best(ever) {st['best_ever']:7.2f}")
+                        if on_generation is not None:
+                            on_generation(st)
+
+                # -------- Migração --------
+                immigrants = [[] for _ in range(self.n_islands)]
+                if done < self.generations:
+                    for src, dst in enumerate(self._destinations()):
+                        immigrants[dst].extend(replies[src][2])
+                    for dst in range(self.n_islands):
+                        immigrants[dst] = immigrants[dst][:self.island_size - 1]
+
+            for conn in conns:
+                conn.send(("stop",))
+        except BaseException:  # uma ilha falhou: não espera pelas outras
+            for proc in procs:
+                proc.terminate()
+            raise
+        finally:
+            for proc in procs:
+                proc.join(timeout=5)
+                if proc.is_alive():
+                    proc.terminate()
+
+        self.island_best = best
+        self.best_island = max(range(self.n_islands), key=lambda i: best[i][2])
+        _, weights, score = best[self.best_island]
+
+        if verbose:
+            print(f"\nMelhor global: ilha {self.best_island} ({score:.2f})\n")
+
+        return weights
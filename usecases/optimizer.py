@@ -0,0 +1,237 @@
+"""
+Interface comum dos motores de treino.
+
+Um `Optimizer` busca um vetor de pesos para a topologia configurada e
+devolve o melhor encontrado em `evolve`. A base cuida do que todos
+compartilham: o `ScoreEvaluator` e o currículo (`schedule`), o backend
+de avaliação (processo atual, `Pool` local ou `EvalCluster` em outros
+nós), as sementes de cada avaliação e o checkpoint atômico com
+topologia, geradores aleatórios e estado do currículo.
+
+Motores disponíveis (`make_optimizer`):
+
+  • ga    → `usecases.genetic_algorithm.GeneticAlgorithm`
+  • cmaes → `usecases.evolution_strategies.CMAES`
+  • es    → `usecases.evolution_strategies.OpenAIES`
+"""
+from usecases.score_evaluator import ScoreEvaluator
+from usecases.schedule import GenerationPlan, Schedule, make_schedule
+from entities.topology import Topology
+from minimax.solution_table import load_solution_table
+from services.eval_cluster import EvalCluster
+from multiprocessing import Pool
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+import numpy as np
+import random
+import pickle
+import time
+import os
+
+OPTIMIZERS = ("ga", "cmaes", "es")
+
+
+class Optimizer:
+    """Base: avaliador, currículo, backend paralelo e checkpoint."""
+    name = "base"
+
+    def __init__(
+        self,
+        generations: int,
+        n_games: int,
+        layer_sizes: Sequence[int] = (9, 9, 9),
+        dtype: str = "float64",
+        activations: str | Sequence[str] | None = None,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        out_path: str | Path = "populations",
+        eval_mode: str = "standard",
+        racing_keep: float = 0.5,
+        racing_z: float = 2.0,
+        engine: str = "scalar",
+        memo: str = "auto",
+        schedule: str | Schedule = "fixed",
+        checkpoint_path: str | Path | None = None,
+        checkpoint_every: int = 1,
+        eval_nodes: Sequence[str] | None = None,
+    ):
+        if workers < 1:
+            raise ValueError("workers deve ser >= 1")
+        if eval_nodes and workers > 1:
+            raise ValueError("use workers OU eval_nodes, não os dois")
+
+        self.generations = generations
+        self.n_games = n_games
+
+        # Arquitetura configurável (padrão 9-9-9 → 180 pesos)
+        self.topology = Topology(layer_sizes, dtype, activations)
+        self.vector_len = self.topology.vector_len
+
+        # Currículo: adversários/máscara por partida (e mutação, no AG)
+        self.schedule = (schedule if isinstance(schedule, Schedule)
+                         else make_schedule(schedule))
+        self.plan: GenerationPlan = self.schedule.plan(1, generations, n_games)
+
+        # Execução
+        self.workers = workers
+        self.eval_nodes = list(eval_nodes or [])
+        self.cluster: EvalCluster | None = None  # aberto em `evolve`
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.RandomState(seed)
+
+        self.out_path = Path(out_path)
+        self.out_path.mkdir(parents=True, exist_ok=True)
+
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.checkpoint_every = max(1, checkpoint_every)
+
+        # segundos por fase (avaliação, reprodução, ...) desde as últimas estatísticas
+        self.phase_times: dict[str, float] = {}
+
+        # Avaliador de fitness
+        self.evaluator = ScoreEvaluator(
+            self.topology, n_games, mode=eval_mode,
+            racing_keep=racing_keep, racing_z=racing_z, engine=engine, memo=memo,
+        )
+
+    # ------------------------------------------------------------------ #
+    def evolve(self, verbose: bool = False,
+               on_generation: Callable[[dict], None] | None = None,
+               resume: bool = False) -> np.ndarray:
+        """
+        Executa o treino e devolve o vetor de pesos do melhor indivíduo.
+
+        • on_generation → chamado ao fim de cada geração com um dicionário
+          de estatísticas (geração, melhor, média, tempo decorrido).
+        • resume        → continua a partir de `checkpoint_path`, se existir.
+        """
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------ #
+    def _open_backend(self):
+        """Pool local, `EvalCluster` ou None (processo atual)."""
+        # gera/abre a tabela do minimax antes do fork: os workers herdam o mapa
+        load_solution_table()
+        if self.eval_nodes:
+            self.cluster = EvalCluster(self.eval_nodes)
+            return self.cluster
+        return Pool(self.workers) if self.workers > 1 else None
+
+    def _close_backend(self, pool) -> None:
+        if self.cluster is not None:
+            self.cluster.close()
+            self.cluster = None
+        elif pool is not None:
+            pool.close()
+            pool.join()
+
+    def _start_generation(self, g: int) -> None:
+        """Plano do currículo para a geração `g`."""
+        self.plan = self.schedule.plan(g, self.generations, self.n_games)
+        self.evaluator.plan = self.plan
+
+    def _evaluate_vectors(self, vectors: Sequence, pool=None) -> list[float]:
+        """
+        Scores de `vectors`, na mesma ordem.
+        Cada avaliação recebe uma semente própria sorteada aqui, então o
+        resultado não depende de quantos processos participam. Cenários
+        compartilhados (modo `crn`) são preparados uma vez por geração e
+        seguem para os workers junto com o avaliador.
+        """
+        self.evaluator.prepare_generation(self.rng.randrange(2 ** 32))
+        seeds = [self.rng.randrange(2 ** 32) for _ in vectors]
+
+        def starmap(fn, args):
+            width = len(pool) if isinstance(pool, EvalCluster) else self.workers
+            chunk = max(1, len(args) // (width * 4))
+            return pool.starmap(fn, args, chunksize=chunk)
+
+        return self.evaluator.evaluate_population(
+            vectors, seeds, starmap if pool is not None else None)
+
+    @contextmanager
+    def _phase(self, name: str):
+        """Soma o tempo do bloco em `phase_times[name]`."""
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] = self.phase_times.get(name, 0.0) + time.perf_counter() - t
+
+    @staticmethod
+    def _population_stats(scores: Sequence[float], weights: np.ndarray) -> dict:
+        """Quartis do score e desvio-padrão médio dos genes da matriz (pop, pesos)."""
+        q = np.quantile(np.asarray(scores, dtype=float), [0.0, 0.25, 0.5, 0.75, 1.0])
+        return {
+            "score_quantiles": dict(zip(("p0", "p25", "p50", "p75", "p100"), q.tolist())),
+            "weight_std": float(np.asarray(weights).std(axis=0).mean()),
+        }
+
+    def _common_stats(self, g: int, t0: float) -> dict:
+        """
+        Campos de estatística que todo motor emite. `phase_seconds` cobre
+        o que rodou desde as estatísticas anteriores (no AG, a reprodução
+        e o checkpoint da geração anterior entram na seguinte).
+        """
+        phases, self.phase_times = self.phase_times, {}
+        return {
+            "elapsed": time.perf_counter() - t0,
+            "phase_seconds": {k: round(v, 6) for k, v in phases.items()},
+            **self.evaluator.last_stats,
+            "schedule": self.plan.summary(),
+            **(self.cluster.last_stats if self.cluster is not None else {}),
+        }
+
+    # ------------------------------------------------------------------ #
+    def _write_checkpoint(self, generation: int, **arrays) -> None:
+        """Grava `arrays` + estado comum em `checkpoint_path` (de forma atômica)."""
+        tmp = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez(
+                f,
+                optimizer=np.array(self.name),
+                generation=generation,
+                **arrays,
+                **self.topology.arrays(),
+                rng_state=np.frombuffer(pickle.dumps(
+                    (self.rng.getstate(), self.np_rng.get_state())), dtype=np.uint8),
+                schedule_state=np.frombuffer(pickle.dumps(self.schedule.state()),
+                                             dtype=np.uint8),
+            )
+        os.replace(tmp, self.checkpoint_path)
+
+    def _read_checkpoint(self) -> tuple[dict, int]:
+        """
+        Lê o checkpoint, confere motor e topologia e restaura geradores e
+        currículo. Devolve (arrays, próxima geração).
+        """
+        with np.load(self.checkpoint_path) as f:
+            data = dict(f)
+        saved_by = str(data["optimizer"]) if "optimizer" in data else "ga"
+        if saved_by != self.name:
+            raise ValueError(f"checkpoint é do otimizador {saved_by!r}, não {self.name!r}")
+        saved = Topology.from_arrays(data)
+        if saved != self.topology:
+            raise ValueError(f"checkpoint usa {saved}, o otimizador está configurado com {self.topology}")
+        rng_state, np_rng_state = pickle.loads(data["rng_state"].tobytes())
+        self.rng.setstate(rng_state)
+        self.np_rng.set_state(np_rng_state)
+        if "schedule_state" in data:
+            self.schedule.restore(pickle.loads(data["schedule_state"].tobytes()))
+        return data, int(data["generation"]) + 1
+
+
+def make_optimizer(name: str, **kwargs) -> Optimizer:
+    """Instancia o motor `name` (um de OPTIMIZERS) com `kwargs`."""
+    if name == "ga":
+        from usecases.genetic_algorithm import GeneticAlgorithm
+        return GeneticAlgorithm(**kwargs)
+    if name == "cmaes":
+        from usecases.evolution_strategies import CMAES
+        return CMAES(**kwargs)
+    if name == "es":
+        from usecases.evolution_strategies import OpenAIES
+        return OpenAIES(**kwargs)
+    raise ValueError(f"otimizador deve ser um de {OPTIMIZERS}")
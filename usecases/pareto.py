@@ -0,0 +1,82 @@
+"""
+Seleção multiobjetivo no estilo NSGA-II, vetorizada.
+
+`F` é a matriz (n, m) de objetivos de uma população, todos a MAXIMIZAR
+(ex.: `ScoreEvaluator.objectives`: taxas de vitória, empate, -derrota e
+-jogada ilegal). Nada percorre pares de indivíduos em Python: a
+dominância sai de comparações (n, n) acumuladas objetivo a objetivo —
+O(m·n²) operações NumPy e O(n²) bytes de memória — e cada frente é
+retirada de uma vez.
+"""
+import numpy as np
+
+
+def dominance_matrix(F: np.ndarray) -> np.ndarray:
+    """D[i, j] = True se i domina j (>= em todos os objetivos, > em algum)."""
+    F = np.asarray(F, dtype=float)
+    n = F.shape[0]
+    ge = np.ones((n, n), dtype=bool)
+    gt = np.zeros((n, n), dtype=bool)
+    for col in F.T:  # um objetivo por vez: memória (n, n), não (n, n, m)
+        a, b = col[:, None], col[None, :]
+        ge &= a >= b
+        gt |= a > b
+    return ge & gt
+
+
+def non_dominated_sort(F: np.ndarray) -> np.ndarray:
+    """Frente de Pareto de cada indivíduo (0 = não dominado)."""
+    D = dominance_matrix(F)
+    n = D.shape[0]
+    dominated_by = D.sum(axis=0)  # quantos dominam cada j
+    rank = np.full(n, -1, dtype=np.int64)
+    front = np.flatnonzero(dominated_by == 0)
+    r = 0
+    while front.size:
+        rank[front] = r
+        dominated_by[front] = -1  # fora das próximas frentes
+        dominated_by -= D[front].sum(axis=0)
+        front = np.flatnonzero(dominated_by == 0)
+        r += 1
+    return rank
+
+
+def crowding_distance(F: np.ndarray, rank: np.ndarray) -> np.ndarray:
+    """
+    Distância de aglomeração dentro de cada frente: soma, por objetivo,
+    da distância normalizada entre os vizinhos. Extremos recebem inf.
+    """
+    F = np.asarray(F, dtype=float)
+    n, m = F.shape
+    dist = np.zeros(n)
+    # ordena por (frente, objetivo): vizinhos na ordem são vizinhos na frente
+    for k in range(m):
+        order = np.lexsort((F[:, k], rank))
+        fr, val = rank[order], F[order, k]
+        first = np.r_[True, fr[1:] != fr[:-1]]
+        last = np.r_[fr[1:] != fr[:-1], True]
+
+        lo = np.maximum.accumulate(np.where(first, np.arange(n), 0))
+        hi = np.minimum.accumulate(np.where(last, np.arange(n), n - 1)[::-1])[::-1]
+        span = val[hi] - val[lo]
+
+        gap = np.zeros(n)
+        inner = ~(first | last)
+        gap[inner] = val[2:][inner[1:-1]] - val[:-2][inner[1:-1]]
+        gap[inner] = np.divide(gap[inner], span[inner],
+                               out=np.zeros(int(inner.sum())), where=span[inner] > 0)
+        gap[first | last] = np.inf
+        dist[order] += gap
+    return dist
+
+
+def nsga2_order(F: np.ndarray, tiebreak: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (ordem, frente, aglomeração): `ordem` lista os índices por frente
+    crescente e, dentro da frente, por `tiebreak` decrescente (ex.: score
+    escalar) ou, sem ele, por aglomeração decrescente.
+    """
+    rank = non_dominated_sort(F)
+    crowd = crowding_distance(F, rank)
+    second = -(crowd if tiebreak is None else np.asarray(tiebreak, dtype=float))
+    return np.lexsort((second, rank)), rank, crowd
@@ -0,0 +1,169 @@
+"""
+Currículo de avaliação e mutação do AG.
+
+A cada geração o `Schedule` devolve um `GenerationPlan`: adversário de
+cada partida (p_minimax), quais partidas usam a máscara de casas
+ocupadas e a taxa de mutação dos filhos. Ao fim da geração, `observe`
+recebe as estatísticas (melhor score, taxa de jogadas ilegais, ...) e o
+próximo plano pode reagir ao progresso.
+
+  • fixed    → a regra histórica: 80 % das partidas com p=0.5, 10 % com
+               máscara, mutação só depois de 30 % das gerações.
+  • adaptive → enquanto a população ainda joga em casas ocupadas, mantém
+               as partidas baratas (aleatórias e com máscara); conforme a
+               taxa de jogadas ilegais cai, troca-as por partidas contra o
+               Minimax perfeito, que são as que ainda separam o ranking.
+               A mutação começa mais cedo se o melhor score estagnar e
+               cresce enquanto a estagnação durar.
+"""
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass
+class GenerationPlan:
+    """O que vale para as `n_games` partidas e a reprodução de uma geração."""
+    p_minimax: np.ndarray     # (n_games,) prob. de lance ótimo do adversário
+    mask_invalid: np.ndarray  # (n_games,) bool
+    mut_rate: float           # 0.0 → filhos sem mutação
+
+    def summary(self) -> dict:
+        return {
+            "random_games": int((self.p_minimax < 1.0).sum()),
+            "masked_games": int(self.mask_invalid.sum()),
+            "mut_rate": round(float(self.mut_rate), 4),
+        }
+
+
+def _split_plan(n_games: int, random_frac: float, mask_frac: float,
+                p_random: float, mut_rate: float) -> GenerationPlan:
+    """Primeiras partidas contra o adversário aleatório, primeiras com máscara."""
+    g = np.arange(n_games)
+    return GenerationPlan(
+        p_minimax=np.where(g < int(n_games * random_frac), p_random, 1.0),
+        mask_invalid=g < int(n_games * mask_frac),
+        mut_rate=mut_rate,
+    )
+
+
+class Schedule:
+    """Interface: `plan` antes de cada geração, `observe` depois dela."""
+    name = "base"
+
+    def plan(self, generation: int, generations: int, n_games: int) -> GenerationPlan:
+        raise NotImplementedError
+
+    def observe(self, stats: dict) -> None:
+        """Recebe as estatísticas da geração (ver GeneticAlgorithm)."""
+
+    def describe(self) -> dict:
+        """Parâmetros para o log da execução."""
+        return {"name": self.name}
+
+    # estado mutável, para checkpoints
+    def state(self) -> dict:
+        return {}
+
+    def restore(self, state: dict) -> None:
+        pass
+
+
+class FixedSchedule(Schedule):
+    name = "fixed"
+
+    def __init__(self, random_frac: float = 0.80, mask_frac: float = 0.10,
+                 p_random: float = 0.5, mut_rate: float = 0.20,
+                 mutation_start: float = 0.30):
+        self.random_frac = random_frac
+        self.mask_frac = mask_frac
+        self.p_random = p_random
+        self.mut_rate = mut_rate
+        self.mutation_start = mutation_start
+
+    def plan(self, generation: int, generations: int, n_games: int) -> GenerationPlan:
+        mutate = generation > int(generations * self.mutation_start)
+        return _split_plan(n_games, self.random_frac, self.mask_frac,
+                           self.p_random, self.mut_rate if mutate else 0.0)
+
+    def describe(self) -> dict:
+        return {"name": self.name, "random_frac": self.random_frac,
+                "mask_frac": self.mask_frac, "p_random": self.p_random,
+                "mut_rate": self.mut_rate, "mutation_start": self.mutation_start}
+
+
+class AdaptiveSchedule(FixedSchedule):
+    """
+    • Fração de partidas aleatórias: `random_frac` enquanto a taxa de
+      jogadas ilegais (partidas sem máscara) for >= `illegal_high`, caindo
+      linearmente até `random_frac_min` quando chega a `illegal_target`.
+    • Máscara: `mask_frac` até a taxa atingir `illegal_target`, depois 0.
+    • Mutação: a partir de `mutation_start` ou após `patience` gerações sem
+      melhora do melhor global; a taxa é multiplicada por `boost` a cada
+      `patience` gerações de estagnação, até `max_mut_rate`.
+    """
+    name = "adaptive"
+
+    def __init__(self, random_frac: float = 0.80, random_frac_min: float = 0.40,
+                 mask_frac: float = 0.10, p_random: float = 0.5,
+                 illegal_target: float = 0.05, illegal_high: float = 0.50,
+                 mut_rate: float = 0.20, mutation_start: float = 0.30,
+                 patience: int = 3, boost: float = 1.5, max_mut_rate: float = 0.50):
+        super().__init__(random_frac, mask_frac, p_random, mut_rate, mutation_start)
+        self.random_frac_min = random_frac_min
+        self.illegal_target = illegal_target
+        self.illegal_high = illegal_high
+        self.patience = max(1, patience)
+        self.boost = boost
+        self.max_mut_rate = max_mut_rate
+
+        self.illegal_rate: float | None = None  # última geração observada
+        self.best: float | None = None
+        self.stall = 0
+
+    def plan(self, generation: int, generations: int, n_games: int) -> GenerationPlan:
+        ill = 1.0 if self.illegal_rate is None else self.illegal_rate
+        span = max(self.illegal_high - self.illegal_target, 1e-9)
+        t = min(max((ill - self.illegal_target) / span, 0.0), 1.0)
+        random_frac = self.random_frac_min + t * (self.random_frac - self.random_frac_min)
+        mask_frac = self.mask_frac if ill > self.illegal_target else 0.0
+
+        mut_rate = 0.0
+        if generation > int(generations * self.mutation_start) or self.stall >= self.patience:
+            mut_rate = min(self.max_mut_rate,
+                           self.mut_rate * self.boost ** (self.stall // self.patience))
+
+        return _split_plan(n_games, random_frac, mask_frac, self.p_random, mut_rate)
+
+    def observe(self, stats: dict) -> None:
+        if stats.get("illegal_rate") is not None:
+            self.illegal_rate = stats["illegal_rate"]
+        best = stats.get("best_ever")
+        if best is not None:
+            if self.best is None or best > self.best:
+                self.best, self.stall = best, 0
+            else:
+                self.stall += 1
+
+    def describe(self) -> dict:
+        return {**super().describe(), "random_frac_min": self.random_frac_min,
+                "illegal_target": self.illegal_target, "illegal_high": self.illegal_high,
+                "patience": self.patience, "boost": self.boost,
+                "max_mut_rate": self.max_mut_rate}
+
+    def state(self) -> dict:
+        return {"illegal_rate": self.illegal_rate, "best": self.best, "stall": self.stall}
+
+    def restore(self, state: dict) -> None:
+        self.illegal_rate = state.get("illegal_rate")
+        self.best = state.get("best")
+        self.stall = state.get("stall", 0)
+
+
+SCHEDULES = {s.name: s for s in (FixedSchedule, AdaptiveSchedule)}
+
+
+def make_schedule(name: str, **kwargs) -> Schedule:
+    """Instancia o currículo `name` (fixed ou adaptive)."""
+    if name not in SCHEDULES:
+        raise ValueError(f"schedule deve ser um de {tuple(SCHEDULES)}")
+    return SCHEDULES[name](**kwargs)
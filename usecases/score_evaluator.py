@@ -1,7 +1,35 @@
 from adapters.minimax_trainer import MinimaxTrainer
 from entities.neural_network import NeuralNetwork
+from entities.topology import Topology
+from services.tic_tac_toe_simulator import (OUTCOMES, WIN, DRAW, LOSE, WRONG_PLACE,
+                                           BatchResult, play_lockstep)
+from services.game_trace import TraceRecorder
+from services.position_index import MoveMemo
+from usecases.schedule import FixedSchedule, GenerationPlan
 from utils.utils import check_winner
+from typing import Callable, Sequence
 import numpy as np
+import random
+import math
+
+
+class _FixedDraws:
+    """
+    Sorteios pré-definidos de UM lance do adversário (modo CRN).
+    Imita a interface de `random` usada por `MinimaxTrainer`:
+    `random()` → moeda Minimax/aleatório, `choice()` → casa livre sorteada.
+    """
+    __slots__ = ("coin", "pick")
+
+    def __init__(self, coin: float, pick: float):
+        self.coin = coin
+        self.pick = pick
+
+    def random(self) -> float:
+        return self.coin
+
+    def choice(self, seq):
+        return seq[int(self.pick * len(seq))]
 
 
 class ScoreEvaluator:
@@ -13,8 +41,60 @@ class ScoreEvaluator:
       + Empate                   → +20
       - Jogada em célula ocupada → -15
       - Derrota                  → -25
+
+    Modos de avaliação (`mode`):
+      • standard → `n_games` partidas independentes por indivíduo
+      • crn      → common random numbers: a cada geração sorteia-se UM
+                   conjunto de cenários (moeda + casa de cada lance do
+                   adversário, por partida) e todos os indivíduos enfrentam
+                   exatamente esses cenários. A diferença de score passa a
+                   refletir a rede, não a sorte, e o ranking estabiliza com
+                   bem menos partidas.
+      • racing   → a população joga em rodadas (ordem de partidas embaralhada
+                   por geração). Após cada rodada, quem não alcança mais o
+                   limiar dos `racing_keep` melhores — média + z·desvio/√m
+                   abaixo do pior limite inferior entre eles — é descartado
+                   com a média parcial; os demais completam os `n_games`.
+
+    Motores (`engine`):
+      • scalar  → uma partida por vez (`_play_one`), sorteios de `random`
+      • batched → todas as partidas de uma avaliação — ou da população
+                   inteira, sem pool de processos — em lockstep
+                   (`services.tic_tac_toe_simulator`), sorteios NumPy.
+                   Mesmas regras e pontos; as sementes geram outra sequência.
+
+    Memória de jogadas (`memo`, ver `services.position_index`): a rede não
+    muda durante a avaliação, então cada posição distinta só passa por ela
+    uma vez.
+      • lazy    → calcula cada posição na primeira vez que aparece
+      • upfront → calcula as 2097 posições possíveis em uma passada
+                   vetorizada; o resto vira consulta à tabela
+      • auto    → upfront quando a chamada joga `UPFRONT_GAMES[engine]`
+                   partidas ou mais (no racing, decide rodada a rodada)
+      • off     → chama a rede a cada lance
+    Os lances são os mesmos em todos os modos.
+
+    Adversário e máscara de cada partida vêm de `plan` (ver
+    `usecases.schedule`); sem plano, vale a divisão fixa 80 % p=0.5 /
+    20 % p=1.0, com máscara nos primeiros 10 %.
+
+    Com `trace` (ver `services.game_trace`), cada partida jogada no
+    próprio processo é registrada (lances e desfecho); partidas de
+    workers de um pool não são.
     """
 
+    MODES = ("standard", "crn", "racing")
+    ENGINES = ("scalar", "batched")
+    MEMOS = ("auto", "lazy", "upfront", "off")
+
+    # partidas por chamada a partir das quais o upfront compensa: abaixo
+    # disso o lazy calcula menos posições (rede 9-9-9; redes maiores
+    # favorecem ainda mais o lazy)
+    UPFRONT_GAMES = {"scalar": 128, "batched": 4096}
+
+    MAX_OPP_TURNS = 5  # o adversário começa → no máximo 5 lances por partida
+    MAX_NET_TURNS = 4  # ... e a rede faz no máximo 4
+
     RIGHT_PLACE = 10
     WIN_POINTS  = 40
     DRAW_POINTS = 20
@@ -22,33 +102,325 @@ class ScoreEvaluator:
     WRONG_PLACE = 15
     LOSE_POINTS = 25
 
-    def __init__(self, input_size: int, hidden_size: int,
-                 output_size: int, n_games: int):
-        self.in_size = input_size
-        self.h_size = hidden_size
-        self.o_size = output_size
+    # faixa de pontos de UMA partida (limites do racing)
+    GAME_MAX = MAX_NET_TURNS * RIGHT_PLACE + WIN_POINTS
+    GAME_MIN = -max(WRONG_PLACE, LOSE_POINTS)
+
+    RACING_ROUNDS = 4
+
+    def __init__(self, topology: Topology, n_games: int, mode: str = "standard",
+                 racing_keep: float = 0.5, racing_z: float = 2.0,
+                 engine: str = "scalar", memo: str = "auto"):
+        if mode not in self.MODES:
+            raise ValueError(f"mode deve ser um de {self.MODES}")
+        if engine not in self.ENGINES:
+            raise ValueError(f"engine deve ser um de {self.ENGINES}")
+        if memo not in self.MEMOS:
+            raise ValueError(f"memo deve ser um de {self.MEMOS}")
+        if not 0.0 < racing_keep <= 1.0:
+            raise ValueError("racing_keep deve estar em (0, 1]")
+
+        self.topology = topology
         self.n_games = n_games
+        self.mode = mode
+        self.engine = engine
+        self.memo = memo
+        self.scenarios: list[list[_FixedDraws]] | None = None
+        self.scenario_draws: np.ndarray | None = None  # (n_games, MAX_OPP_TURNS, 2)
+
+        self.racing_keep = racing_keep
+        self.racing_z = racing_z
+        self.race_order: np.ndarray | None = None
+
+        self.plan: GenerationPlan = FixedSchedule().plan(1, 1, n_games)
+
+        # partidas jogadas/economizadas e desfechos da última `evaluate_population`
+        self.last_stats: dict = {}
+        self.last_outcomes: np.ndarray | None = None  # (n_pop, len(OUTCOMES))
+
+        # registro opcional das partidas (None = desligado)
+        self.trace: TraceRecorder | None = None
+
+        # consultas, acertos e tabuleiros calculados pela memória de jogadas
+        self._memo_counts = np.zeros(3, dtype=np.int64)
+
+    def __getstate__(self):  # o registro fica no processo principal
+        return {**self.__dict__, "trace": None}
 
     # ------------------------------------------------------------------ #
-    def evaluate(self, weights_vector: np.ndarray) -> float:
-        """Retorna a média de pontos em `n_games`."""
-        ai = NeuralNetwork(self.in_size, self.h_size, self.o_size, weights_vector)
-        total = 0.0
+    def prepare_generation(self, seed: int | None = None) -> None:
+        """
+        Chamado uma vez por geração, antes de avaliar a população.
+        No modo `crn` pré-sorteia os cenários compartilhados; no `racing`
+        sorteia a ordem das partidas (cada rodada mistura p=0.5, p=1.0 e
+        partidas com máscara); no `standard` não faz nada.
+        """
+        if self.mode == "crn":
+            draws = np.random.RandomState(seed).random_sample(
+                (self.n_games, self.MAX_OPP_TURNS, 2))
+            self.scenario_draws = draws
+            self.scenarios = [[_FixedDraws(float(c), float(p)) for c, p in game]
+                              for game in draws]
+        elif self.mode == "racing":
+            self.race_order = np.random.RandomState(seed).permutation(self.n_games)
+
+    # ------------------------------------------------------------------ #
+    def evaluate_population(
+        self,
+        vectors: Sequence[np.ndarray],
+        seeds: Sequence[int],
+        starmap: Callable | None = None,
+    ) -> list[float]:
+        """
+        Avalia uma população inteira e devolve os scores na mesma ordem.
+        `starmap(fn, args)` permite distribuir o trabalho (ex.: Pool.starmap);
+        por padrão roda no processo atual.
+        Preenche `last_stats` com partidas jogadas e economizadas, contagem
+        de desfechos e a taxa de jogadas ilegais nas partidas sem máscara;
+        `last_outcomes` guarda os desfechos por indivíduo.
+        Com o motor `batched` e sem `starmap`, a população inteira joga
+        junta em lockstep (mesmos scores que avaliar um a um).
+        """
+        distributed = starmap is not None
+        self._memo_counts[:] = 0
+        if starmap is None:
+            starmap = lambda fn, args: [fn(*a) for a in args]
+
+        n_pop = len(vectors)
+        outcomes = np.zeros((n_pop, len(OUTCOMES)), dtype=np.int64)
+        illegal = np.zeros(2, dtype=np.int64)  # (ilegais, partidas) sem máscara
+
+        def tally(i: int, games, res) -> None:
+            outcomes[i] += np.bincount(res, minlength=len(OUTCOMES))
+            free = ~self.plan.mask_invalid[games]
+            illegal[0] += int((res[free] == WRONG_PLACE).sum())
+            illegal[1] += int(free.sum())
 
-        for g in range(self.n_games):
-            p_minimax   = 0.5 if g < int(self.n_games * 0.80) else 1.0
-            mask_invalid = g < int(self.n_games * 0.10)  # “rodinhas” só no início
-            total += self._play_one(ai, p_minimax, mask_invalid)
+        all_games = np.arange(self.n_games)
+        if self.mode == "racing":
+            scores, played = self._race(vectors, seeds, starmap, tally)
+        else:
+            if self.engine == "batched" and not distributed:
+                results = self._run_lockstep(vectors, seeds)
+            else:
+                args = [(w, all_games, s) for w, s in zip(vectors, seeds)]
+                results = starmap(self.run_games, args)
+            scores = []
+            for i, (sc, res) in enumerate(results):
+                scores.append(float(sc.mean()))
+                tally(i, all_games, res)
+            played = n_pop * self.n_games
 
-        return total / self.n_games
+        budget = n_pop * self.n_games
+        self.last_outcomes = outcomes
+        self.last_stats = {
+            "games_played": played, "games_saved": budget - played,
+            "outcomes": dict(zip(OUTCOMES, outcomes.sum(axis=0).tolist())),
+            "illegal_rate": illegal[0] / illegal[1] if illegal[1] else None,
+            **self.memo_stats(),
+        }
+        return list(scores)
+
+    # sinal de cada desfecho como objetivo a maximizar (ordem de OUTCOMES)
+    OBJECTIVE_SIGNS = np.array([+1.0, +1.0, -1.0, -1.0])
+
+    def objectives(self, outcomes: np.ndarray | None = None) -> np.ndarray:
+        """
+        Desfechos por indivíduo (padrão: `last_outcomes`) como matriz
+        (n_pop, len(OUTCOMES)) de objetivos a maximizar: taxas de vitória
+        e empate, menos as de derrota e jogada ilegal. São taxas, não
+        contagens, porque no racing cada indivíduo joga um número diferente
+        de partidas.
+        """
+        counts = self.last_outcomes if outcomes is None else outcomes
+        games = np.maximum(counts.sum(axis=1, keepdims=True), 1)
+        return self.OBJECTIVE_SIGNS * (counts / games)
+
+    def _round_bounds(self) -> list[int]:
+        """Fim de cada rodada do racing: n/8, n/4, n/2, n (sem repetições)."""
+        return sorted({max(1, math.ceil(self.n_games / 2 ** k))
+                       for k in range(self.RACING_ROUNDS)})
+
+    def _race(self, vectors, seeds, starmap, tally) -> tuple[list[float], int]:
+        n_pop = len(vectors)
+        keep = min(n_pop, max(2, math.ceil(n_pop * self.racing_keep)))
+        if self.race_order is None:
+            self.prepare_generation(None)
+
+        sums = np.zeros(n_pop)
+        sq_sums = np.zeros(n_pop)
+        played = np.zeros(n_pop, dtype=int)
+        alive = np.arange(n_pop)
+        sd_floor = 0.05 * (self.GAME_MAX - self.GAME_MIN)
+
+        start = 0
+        for r, stop in enumerate(self._round_bounds()):
+            games = self.race_order[start:stop]
+            args = [(vectors[i], games, (seeds[i] + r) % 2 ** 32) for i in alive]
+            for i, (res, out) in zip(alive, starmap(self.run_games, args)):
+                sums[i] += res.sum()
+                sq_sums[i] += np.square(res).sum()
+                played[i] += res.size
+                tally(i, games, out)
+            start = stop
+
+            if stop == self.n_games or alive.size <= keep:
+                continue
+
+            # ------- eliminação: UB abaixo do keep-ésimo melhor LB -------
+            m = played[alive]
+            mean = sums[alive] / m
+            sd = np.sqrt(np.maximum(sq_sums[alive] / m - mean ** 2, 0.0))
+            margin = self.racing_z * np.maximum(sd, sd_floor) / np.sqrt(m)
+            threshold = np.sort(mean - margin)[-keep]
+            alive = alive[mean + margin >= threshold]
+
+        return (sums / played).tolist(), int(played.sum())
+
+    # ------------------------------------------------------------------ #
+    def _game_setup(self, g: int) -> tuple[float, bool]:
+        """(p_minimax, mask_invalid) da partida de índice `g`, conforme o plano."""
+        return float(self.plan.p_minimax[g]), bool(self.plan.mask_invalid[g])
+
+    # ------------------------------------------------------------------ #
+    def _draws(self, n: int, seed: int | None) -> np.ndarray:
+        """Sorteios (moeda, casa) dos lances do adversário em `n` partidas."""
+        return np.random.RandomState(seed).random_sample((n, self.MAX_OPP_TURNS, 2))
+
+    def _game_draws(self, seed: int | None) -> np.ndarray:
+        """Sorteios das `n_games` partidas de uma avaliação (cenários no `crn`)."""
+        if self.mode == "crn":
+            if self.scenario_draws is None:
+                self.prepare_generation(seed)
+            return self.scenario_draws
+        return self._draws(self.n_games, seed)
+
+    def _scores(self, result: BatchResult) -> np.ndarray:
+        """Pontos de cada partida simulada (mesma tabela de `_play_one`)."""
+        points = np.array([self.WIN_POINTS, self.DRAW_POINTS,
+                           -self.LOSE_POINTS, -self.WRONG_PLACE], dtype=float)
+        return self.RIGHT_PLACE * result.valid_moves + points[result.outcome]
+
+    def memo_mode(self, n_games: int) -> str:
+        """Modo efetivo da memória para uma chamada com `n_games` partidas."""
+        if self.memo != "auto":
+            return self.memo
+        return "upfront" if n_games >= self.UPFRONT_GAMES[self.engine] else "lazy"
+
+    def _player(self, weights_vector: np.ndarray,
+                games: np.ndarray) -> NeuralNetwork | MoveMemo:
+        """A rede, com memória de jogadas conforme `memo_mode`."""
+        net = NeuralNetwork.from_topology(self.topology, weights_vector)
+        mode = self.memo_mode(games.size)
+        if mode == "off":
+            return net
+        memo = MoveMemo(net)
+        if mode == "upfront":  # só as máscaras que as partidas usam
+            memo.prefill(np.unique(self.plan.mask_invalid[games]))
+        return memo
+
+    def _count_memo(self, players) -> None:
+        for p in players:
+            if isinstance(p, MoveMemo):
+                self._memo_counts += (p.lookups, p.hits, p.forwarded)
+
+    def memo_stats(self) -> dict:
+        """
+        Modo pedido, taxa de acerto da memória e tabuleiros que passaram
+        pela rede desde o início da última `evaluate_population` (só
+        partidas do próprio processo; com pool, a taxa fica None).
+        """
+        lookups, hits, forwarded = self._memo_counts.tolist()
+        return {"memo": self.memo,
+                "memo_hit_rate": round(hits / lookups, 4) if lookups else None,
+                "memo_forward": forwarded}
+
+    def _play_batch(self, nets: list[NeuralNetwork], owner: np.ndarray,
+                    games: np.ndarray, draws: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        masks = self.plan.mask_invalid[games]
+        result = play_lockstep(nets, owner, self.plan.p_minimax[games], masks, draws,
+                               record=self.trace is not None)
+        if self.trace is not None:
+            self.trace.append(result.moves, result.outcome, masks)
+        return self._scores(result), result.outcome
+
+    def _run_lockstep(self, vectors: Sequence[np.ndarray],
+                      seeds: Sequence[int]) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Motor `batched`: a população inteira em uma única simulação."""
+        all_games = np.arange(self.n_games)
+        nets = [self._player(w, all_games) for w in vectors]
+        games = np.tile(all_games, len(nets))
+        owner = np.repeat(np.arange(len(nets)), self.n_games)
+        draws = np.concatenate([self._game_draws(s) for s in seeds])
+        scores, outcome = self._play_batch(nets, owner, games, draws)
+        self._count_memo(nets)
+        shape = (len(nets), self.n_games)
+        return list(zip(scores.reshape(shape), outcome.reshape(shape)))
+
+    def run_games(self, weights_vector: np.ndarray, games: Sequence[int],
+                  seed: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Joga as partidas `games` (índices de 0 a n_games-1) e devolve
+        (pontos, desfecho) de cada uma; desfechos como em
+        `services.tic_tac_toe_simulator.OUTCOMES`.
+        Com `seed`, as jogadas aleatórias do adversário são reprodutíveis
+        (e independentes do processo que executa a avaliação).
+        No modo `crn` a semente é ignorada: valem os cenários da geração.
+        """
+        games = np.asarray(games, dtype=np.int64)
+        ai = self._player(weights_vector, games)
+        if self.engine == "batched":
+            draws = (self._game_draws(seed)[games] if self.mode == "crn"
+                     else self._draws(games.size, seed))
+            result = self._play_batch([ai], np.zeros(games.size, dtype=int), games, draws)
+            self._count_memo([ai])
+            return result
+
+        rng = random.Random(seed) if seed is not None else random
+        if self.mode == "crn" and self.scenarios is None:
+            self.prepare_generation(rng.randrange(2 ** 32))
+
+        scores = np.empty(games.size)
+        outcome = np.empty(games.size, dtype=np.int64)
+        moves = np.full((games.size, 9), -1, dtype=np.int8) if self.trace is not None else None
+        for k, g in enumerate(games):
+            p_minimax, mask_invalid = self._game_setup(g)
+            scenario = self.scenarios[g] if self.mode == "crn" else None
+            scores[k], outcome[k] = self._play_one(ai, p_minimax, mask_invalid, rng, scenario,
+                                                   None if moves is None else moves[k])
+        if moves is not None:
+            self.trace.append(moves, outcome, self.plan.mask_invalid[games])
+        self._count_memo([ai])
+        return scores, outcome
+
+    def evaluate_games(self, weights_vector: np.ndarray, games: Sequence[int],
+                       seed: int | None = None) -> np.ndarray:
+        """Pontos de cada partida em `games` (índices de 0 a n_games-1)."""
+        return self.run_games(weights_vector, games, seed)[0]
+
+    # ------------------------------------------------------------------ #
+    def evaluate(self, weights_vector: np.ndarray,
+                 seed: int | None = None) -> float:
+        """
+        Retorna a média de pontos em `n_games` (semente como em `run_games`).
+        """
+        scores, _ = self.run_games(weights_vector, range(self.n_games), seed)
+        return float(scores.mean())
 
     # ------------------------------------------------------------------ #
     def _play_one(self, ai: NeuralNetwork, p_minimax: float,
-                  mask_invalid: bool) -> float:
+                  mask_invalid: bool, rng=None,
+                  scenario: list[_FixedDraws] | None = None,
+                  moves: np.ndarray | None = None) -> tuple[float, int]:
+        """
+        Joga uma partida; devolve (pontos, desfecho). Com `moves` (9,),
+        anota nele as casas jogadas, em ordem (inclusive a jogada ilegal).
+        """
         board   = np.zeros((3, 3), dtype=int)
-        minimax = MinimaxTrainer(p_minimax)
+        minimax = MinimaxTrainer(p_minimax, rng)
         score   = 0.0
         turn    = -1  # Minimax (-1) começa
+        opp_turn = 0  # índice do lance do adversário (cenário CRN)
 
         while True:
             # ------------------ Lance do turno atual -------------------
@@ -57,37 +429,42 @@ class ScoreEvaluator:
 
                 # Tabuleiro cheio → predict devolve -1 (empate imediato)
                 if idx == -1:
-                    return score + self.DRAW_POINTS
+                    return score + self.DRAW_POINTS, DRAW
 
                 if not 0 <= idx < 9:               # índice fora do range
-                    return score - self.LOSE_POINTS
+                    return score - self.LOSE_POINTS, LOSE
 
                 r, c = divmod(idx, 3)
+                if moves is not None:
+                    moves[np.count_nonzero(board)] = idx
 
                 if board[r, c] != 0:               # célula ocupada
-                    return score - self.WRONG_PLACE
+                    return score - self.WRONG_PLACE, WRONG_PLACE
 
                 board[r, c] = +1
                 score += self.RIGHT_PLACE
 
             else:                                  # ----- Minimax -----
+                if scenario is not None:
+                    minimax.rng = scenario[opp_turn]
+                    opp_turn += 1
                 r, c = minimax.move(board.tolist())
 
                 # Minimax devolve (-1, -1) → tabuleiro cheio → empate
                 if (r, c) == (-1, -1):
-                    return score + self.DRAW_POINTS
+                    return score + self.DRAW_POINTS, DRAW
 
+                if moves is not None:
+                    moves[np.count_nonzero(board)] = 3 * r + c
                 board[r, c] = -1
 
             # ------------------ Checa término -------------------------
             outcome = check_winner(board)
             if outcome is not None:
                 if outcome == +1:
-                    score += self.WIN_POINTS
-                elif outcome == 0:
-                    score += self.DRAW_POINTS
-                else:
-                    score -= self.LOSE_POINTS
-                return score
+                    return score + self.WIN_POINTS, WIN
+                if outcome == 0:
+                    return score + self.DRAW_POINTS, DRAW
+                return score - self.LOSE_POINTS, LOSE
 
             turn *= -1  # alterna turno
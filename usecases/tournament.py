@@ -0,0 +1,249 @@
+"""
+Torneio todos-contra-todos entre redes salvas e variantes do Minimax.
+
+Cada par de jogadores disputa `n_games` partidas com cada cor, simuladas
+em lote (`services.tic_tac_toe_simulator.play_match`) e distribuídas
+entre processos. Resultados ficam em cache (JSON) por (hash, hash) dos
+jogadores, então acrescentar um modelo só custa as partidas dele. O
+ranking final usa Elo ajustado por máxima verossimilhança sobre todas
+as partidas (empate = meio ponto).
+"""
+from adapters.minimax_trainer import MinimaxTrainer
+from entities.neural_network import NeuralNetwork
+from minimax.solution_table import SOLUTION_VERSION, load_solution_table
+from services.tic_tac_toe_simulator import play_match
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Sequence
+from utils.board_codes import encode_many
+from utils.model_io import load_model
+import numpy as np
+import hashlib
+import json
+import math
+import os
+
+# muda quando as regras de simulação mudam (invalida o cache)
+TOURNAMENT_VERSION = 1
+
+
+class Player:
+    """Jogador de torneio: nome, hash estável e política em lote."""
+    kind = "base"
+
+    def __init__(self, name: str):
+        self.name = name
+
+    @property
+    def key(self) -> str:
+        raise NotImplementedError
+
+    def policy(self, boards: np.ndarray, rng) -> np.ndarray:
+        """Casas escolhidas para `boards` (M, 9), vistos como +1 = este jogador."""
+        raise NotImplementedError
+
+
+class NetworkPlayer(Player):
+    """Rede treinada (casas ocupadas mascaradas, como no jogo contra humanos)."""
+    kind = "network"
+
+    def __init__(self, name: str, weights: np.ndarray, topology):
+        super().__init__(name)
+        self.weights = weights
+        self.topology = topology
+        self._net: NeuralNetwork | None = None
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "NetworkPlayer":
+        weights, topology = load_model(path)
+        return cls(Path(path).stem, weights, topology)
+
+    @property
+    def key(self) -> str:
+        h = hashlib.sha1(repr(self.topology).encode())
+        h.update(np.ascontiguousarray(self.weights).tobytes())
+        return "net:" + h.hexdigest()[:16]
+
+    def policy(self, boards, rng):
+        if self._net is None:
+            self._net = NeuralNetwork.from_topology(self.topology, self.weights)
+        return self._net.predict_batch(boards)
+
+    def __getstate__(self):  # a rede é reconstruída no worker
+        return {**self.__dict__, "_net": None}
+
+
+class MinimaxPolicyPlayer(Player):
+    """Minimax perfeito (mesma jogada de `MinimaxPlayer`)."""
+    kind = "minimax"
+
+    def __init__(self, name: str = "minimax"):
+        super().__init__(name)
+
+    @property
+    def key(self) -> str:
+        return f"minimax:v{SOLUTION_VERSION}"
+
+    def policy(self, boards, rng):
+        return load_solution_table()[encode_many(boards)]
+
+
+class TrainerPlayer(Player):
+    """`MinimaxTrainer` com probabilidade `p` de lance ótimo (p=0 → aleatório)."""
+    kind = "trainer"
+
+    def __init__(self, p_minimax: float, name: str | None = None):
+        if not 0.0 <= p_minimax <= 1.0:
+            raise ValueError("p_minimax deve estar entre 0.0 e 1.0")
+        super().__init__(name or ("random" if p_minimax == 0 else f"trainer_p{p_minimax:g}"))
+        self.p_minimax = p_minimax
+
+    @property
+    def key(self) -> str:
+        return f"trainer:p={self.p_minimax:g}"
+
+    def policy(self, boards, rng):
+        # o MinimaxTrainer joga com -1: inverte a visão
+        return MinimaxTrainer(self.p_minimax).move_batch(-boards, rng=rng)
+
+
+def _pair_seed(seed: int, key_x: str, key_o: str) -> int:
+    """Semente estável por confronto: o cache vale entre execuções."""
+    digest = hashlib.sha1(f"{seed}|{key_x}|{key_o}".encode()).digest()
+    return int.from_bytes(digest[:4], "little")
+
+
+def _play_pair(x: Player, o: Player, n_games: int, seed: int) -> list[int]:
+    """[vitórias de X, empates, vitórias de O] em `n_games` partidas."""
+    winner = play_match(x.policy, o.policy, n_games, np.random.RandomState(seed))
+    return [int((winner == 1).sum()), int((winner == 0).sum()), int((winner == -1).sum())]
+
+
+def fit_elo(n_players: int, pairs: Sequence[tuple[int, int, float, int]],
+            iterations: int = 200, prior_games: float = 1.0) -> np.ndarray:
+    """
+    Elo por máxima verossimilhança. `pairs` = (i, j, pontos de i, partidas).
+    Cada jogador ganha `prior_games` empates virtuais contra um rival de
+    1500 — sem isso, quem nunca perde teria rating infinito.
+    """
+    scale = 400 / math.log(10)
+    r = np.zeros(n_players)
+    for _ in range(iterations):
+        grad = np.zeros(n_players)
+        hess = np.full(n_players, 1e-9)
+        for i, j, s, n in pairs:
+            e = 1 / (1 + math.exp(-(r[i] - r[j]) / scale))
+            grad[i] += s - n * e
+            grad[j] += (n - s) - n * (1 - e)
+            w = n * e * (1 - e)
+            hess[i] += w
+            hess[j] += w
+        e0 = 1 / (1 + np.exp(-r / scale))
+        grad += prior_games * (0.5 - e0)
+        hess += prior_games * e0 * (1 - e0)
+        step = scale * grad / hess
+        r += np.clip(step, -200, 200)
+        if np.abs(step).max() < 1e-6:
+            break
+    return r + 1500
+
+
+class Tournament:
+    """
+    Todos contra todos, ambas as cores.
+
+      • players  → jogadores (nomes únicos)
+      • n_games  → partidas por confronto e cor
+      • cache    → arquivo JSON de resultados por (hash X, hash O); None desliga
+    """
+    def __init__(self, players: Sequence[Player], n_games: int = 100,
+                 workers: int = 1, seed: int = 0,
+                 cache: str | Path | None = "tournament_cache.json"):
+        names = [p.name for p in players]
+        if len(set(names)) != len(names):
+            raise ValueError("nomes de jogadores repetidos")
+        self.players = list(players)
+        self.n_games = n_games
+        self.workers = max(1, workers)
+        self.seed = seed
+        self.cache_path = Path(cache) if cache else None
+        self.cache: dict[str, list[int]] = {}
+        if self.cache_path and self.cache_path.is_file():
+            self.cache = json.loads(self.cache_path.read_text())
+        self.results: dict[tuple[int, int], list[int]] = {}
+        self.games_played = 0
+
+    def _cache_key(self, x: Player, o: Player) -> str:
+        return f"v{TOURNAMENT_VERSION}|{x.key}|{o.key}|n={self.n_games}|s={self.seed}"
+
+    def _save_cache(self) -> None:
+        tmp = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.cache, indent=0, sort_keys=True))
+        os.replace(tmp, self.cache_path)
+
+    def run(self) -> list[dict]:
+        """Joga o que falta, atualiza o cache e devolve o ranking."""
+        todo = []
+        for i, x in enumerate(self.players):
+            for j, o in enumerate(self.players):
+                if i == j:
+                    continue
+                hit = self.cache.get(self._cache_key(x, o))
+                if hit is not None:
+                    self.results[i, j] = hit
+                else:
+                    todo.append((i, j))
+
+        if todo:
+            load_solution_table()  # antes do fork: workers herdam o mapa
+            args = [(self.players[i], self.players[j], self.n_games,
+                     _pair_seed(self.seed, self.players[i].key, self.players[j].key))
+                    for i, j in todo]
+            if self.workers > 1:
+                with Pool(self.workers) as pool:
+                    out = pool.starmap(_play_pair, args)
+            else:
+                out = [_play_pair(*a) for a in args]
+            for (i, j), res in zip(todo, out):
+                self.results[i, j] = res
+                self.cache[self._cache_key(self.players[i], self.players[j])] = res
+            self.games_played = len(todo) * self.n_games
+            if self.cache_path:
+                self._save_cache()
+
+        return self.ranking()
+
+    def ranking(self) -> list[dict]:
+        """Tabela (ordenada por Elo) com vitórias/empates/derrotas e % de pontos."""
+        n = len(self.players)
+        wins = np.zeros(n, dtype=int)
+        draws = np.zeros(n, dtype=int)
+        losses = np.zeros(n, dtype=int)
+        pairs = []
+        for (i, j), (xw, d, ow) in self.results.items():
+            wins[i] += xw; draws[i] += d; losses[i] += ow
+            wins[j] += ow; draws[j] += d; losses[j] += xw
+            pairs.append((i, j, xw + d / 2, xw + d + ow))
+        elo = fit_elo(n, pairs)
+
+        table = []
+        for i, p in enumerate(self.players):
+            games = wins[i] + draws[i] + losses[i]
+            table.append({
+                "name": p.name, "kind": p.kind, "key": p.key,
+                "elo": round(float(elo[i]), 1), "games": int(games),
+                "wins": int(wins[i]), "draws": int(draws[i]), "losses": int(losses[i]),
+                "score": round((wins[i] + draws[i] / 2) / games, 4) if games else None,
+            })
+        table.sort(key=lambda row: row["elo"], reverse=True)
+        return table
+
+
+def format_table(table: list[dict]) -> str:
+    """Ranking em texto, uma linha por jogador."""
+    lines = [f"{'#':>2}  {'jogador':<24} {'Elo':>7} {'V':>6} {'E':>6} {'D':>6} {'pts%':>6}"]
+    for k, row in enumerate(table, start=1):
+        score = "-" if row["score"] is None else f"{100 * row['score']:.1f}"
+        lines.append(f"{k:>2}  {row['name']:<24} {row['elo']:>7.1f} {row['wins']:>6} "
+                     f"{row['draws']:>6} {row['losses']:>6} {score:>6}")
+    return "\n".join(lines)
@@ -0,0 +1,51 @@
+"""
+Codificação compacta de tabuleiros.
+
+Cada tabuleiro vira um inteiro em base 3 (casa i tem peso 3**i;
+0 → vazio, 1 → +1/X, 2 → -1/O). São 3**9 = 19683 códigos, o que permite
+tabelas indexadas diretamente pelo código (solução do minimax, políticas
+de redes, etc.).
+"""
+import numpy as np
+
+N_CODES = 3 ** 9
+POW3 = 3 ** np.arange(9, dtype=np.int64)
+
+# valor da casa → dígito (índice -1 cai no último elemento)
+_DIGIT = np.array([0, 1, 2], dtype=np.int64)   # 0, +1, -1
+_VALUE = np.array([0, 1, -1], dtype=np.int8)   # dígito → valor
+
+_SYMBOLS = {+1: "X", -1: "O", 0: "."}
+
+
+def board_key(board) -> str:
+    """Chave textual do tabuleiro 3x3, ex.: 'X..O.....'."""
+    return "".join(_SYMBOLS[int(v)] for row in board for v in row)
+
+
+def encode(board) -> int:
+    """Código de um tabuleiro 3x3 (lista ou array) ou vetor de 9 casas."""
+    code = 0
+    p = 1
+    for row in np.asarray(board).reshape(9):
+        v = int(row)
+        code += p * (1 if v == 1 else 2 if v == -1 else 0)
+        p *= 3
+    return code
+
+
+def encode_many(boards: np.ndarray) -> np.ndarray:
+    """Códigos de um lote de tabuleiros, shape (N, 9) → (N,)."""
+    return _DIGIT[np.asarray(boards, dtype=np.int64)] @ POW3
+
+
+def decode_many(codes: np.ndarray) -> np.ndarray:
+    """Inverso de `encode_many`: (N,) → (N, 9) int8."""
+    codes = np.asarray(codes, dtype=np.int64)
+    digits = (codes[:, None] // POW3) % 3
+    return _VALUE[digits]
+
+
+def all_boards() -> np.ndarray:
+    """Todos os 19683 tabuleiros, na ordem do código, shape (19683, 9) int8."""
+    return decode_many(np.arange(N_CODES))
@@ -1,7 +1,7 @@
 from .utils import check_winner
 from adapters.minimax_player import MinimaxPlayer
-from usecases.genetic_algorithm import GeneticAlgorithm
 from entities.neural_network import NeuralNetwork
+from utils.model_io import load_model, save_model
 import numpy as np
 import os
 
@@ -40,6 +40,9 @@ def start_game_against_minimax():
 
 
 def start_train_network():
+    # import tardio: o AG traz multiprocessing/csv e só é usado aqui
+    from usecases.genetic_algorithm import GeneticAlgorithm
+
     gens = int(input("Quantas gerações deseja treinar? ").strip())
     games = int(input("Quantos jogos deseja jogar? ").strip())
     pop_size = int(input("Qual tamanho da populacao? ").strip())
@@ -47,15 +50,15 @@ def start_train_network():
 
     print("\nIniciando treinamento...\n")
     best = ga.evolve(verbose=True)
-    np.save("rnn.npy", best)
-    print("\nTreino concluído. Melhor weights_vector salvo em 'rnn.npy'.")
+    path = save_model("rnn.npz", best, ga.topology)
+    print(f"\nTreino concluído. Melhor rede salva em '{path}'.")
 
 
 def start_game_against_network():
-        path = input("Caminho do weights_vector [rnn.npy]: ").strip() or "rnn"
-        weights_vector = np.load(f"{path}.npy")
+        path = input("Caminho da rede [rnn.npz]: ").strip() or "rnn"
+        weights_vector, topology = load_model(path)
 
-        nn = NeuralNetwork(9, 9, 9, weights_vector)
+        nn = NeuralNetwork.from_topology(topology, weights_vector)
         board = np.zeros((3, 3), dtype=int)
 
         turn = -1  # Rede Neural começa como X (+1)
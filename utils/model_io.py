@@ -0,0 +1,56 @@
+"""
+Leitura/gravação de redes treinadas.
+
+O formato atual é `.npz` com o vetor de pesos E a topologia (tamanhos das
+camadas, dtype e ativações), então quem carrega não precisa adivinhar a arquitetura.
+Arquivos `.npy` antigos (só o vetor de 180 pesos) continuam aceitos como
+rede 9-9-9.
+"""
+from entities.topology import Topology
+from pathlib import Path
+import numpy as np
+
+LEGACY_TOPOLOGY = (9, 9, 9)
+
+
+def save_model(path: str | Path, weights: np.ndarray, topology: Topology) -> Path:
+    """Grava `weights` + topologia em `path` (sufixo .npz garantido)."""
+    path = Path(path)
+    if path.suffix != ".npz":
+        path = path.with_suffix(".npz")
+    topology.split(weights)  # valida o tamanho
+    np.savez(path, weights=weights.astype(topology.dtype, copy=False),
+             **topology.arrays())
+    return path
+
+
+def find_model(path: str | Path) -> Path | None:
+    """
+    Resolve `path` tentando, nesta ordem: o próprio caminho, `.npz` e `.npy`.
+    Devolve None se nenhum existir.
+    """
+    path = Path(path)
+    for cand in (path, path.with_suffix(".npz"), path.with_suffix(".npy")):
+        if cand.is_file():
+            return cand
+    return None
+
+
+def load_model(path: str | Path) -> tuple[np.ndarray, Topology]:
+    """Carrega (weights, topology) de um arquivo .npz ou .npy legado."""
+    found = find_model(path)
+    if found is None:
+        raise FileNotFoundError(f"modelo não encontrado: {path}")
+
+    if found.suffix == ".npz":
+        with np.load(found) as data:
+            topology = Topology.from_arrays(data)
+            weights = data["weights"].astype(topology.dtype, copy=False)
+    else:
+        weights = np.load(found)
+        topology = Topology(LEGACY_TOPOLOGY, weights.dtype.name
+                            if weights.dtype.name in Topology.DTYPES else "float64")
+        weights = weights.astype(topology.dtype, copy=False)
+
+    topology.split(weights)  # valida o tamanho
+    return weights, topology